@@ -1,10 +1,13 @@
 """Main entry point for the Speech Transcriber application."""
 
-import argparse
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools
 import os
 import signal
 import sys
-import time
+import threading
 
 from speech_transcriber.audio import AudioRecorder
 from speech_transcriber.clipboard import copy_to_clipboard
@@ -17,19 +20,58 @@ from speech_transcriber.sound import play_stop_sound
 from speech_transcriber.transcription import Transcriber
 
 
+@contextlib.contextmanager
+def _suppress_stderr():
+  """Redirect file descriptor 2 to /dev/null for the duration of the block."""
+  try:
+    sys.stderr.flush()
+    saved_stderr_fd = os.dup(2)
+  except (OSError, ValueError):
+    # No usable stderr to redirect; run the block unchanged
+    yield
+    return
+
+  devnull_fd = os.open(os.devnull, os.O_WRONLY)
+  try:
+    os.dup2(devnull_fd, 2)
+    yield
+  finally:
+    os.dup2(saved_stderr_fd, 2)
+    os.close(saved_stderr_fd)
+    os.close(devnull_fd)
+
+
 class SpeechTranscriber:
   """Main application class for the Speech Transcriber."""
 
+  # Seconds between warmups while recording. Kept well under the HTTP pool's
+  # keep-alive expiry, so the connection is still open after a long recording.
+  WARMUP_INTERVAL = 60.0
+
   def __init__(self, service=None):
     """Initialize the Speech Transcriber application with required components."""
-    self.audio_recorder = AudioRecorder()
-    self.transcriber = Transcriber(service=service)
+    # PortAudio and API client setup are independent, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+      audio_recorder = executor.submit(AudioRecorder)
+      transcriber = executor.submit(Transcriber, service=service)
+      self.audio_recorder = audio_recorder.result()
+      self.transcriber = transcriber.result()
+
     self.keyboard_listener = KeyboardListener(
       on_activate=self.start_recording,
       on_deactivate=self.stop_recording_and_transcribe,
     )
     self.running = False
     self._cleanup_in_progress = False
+    self._stop_event = threading.Event()
+    # Set when the current recording stops, which ends its warmup loop
+    self._recording_stopped = threading.Event()
+    # Runs notifications and sounds off the hotkey thread; one worker keeps them
+    # in the order they were issued
+    self._io_pool = ThreadPoolExecutor(max_workers=1)
+    # Runs transcriptions one at a time so results reach the clipboard in the
+    # order they were recorded
+    self._transcribe_pool = ThreadPoolExecutor(max_workers=1)
 
   def start(self) -> None:
     """Start the application."""
@@ -56,6 +98,9 @@ class SpeechTranscriber:
     signal.signal(signal.SIGINT, self.handle_signal)
     signal.signal(signal.SIGTERM, self.handle_signal)
 
+    # Connect to the transcription service before the first recording needs it
+    threading.Thread(target=self.transcriber.warmup, daemon=True).start()
+
     # Start the keyboard listener
     self.keyboard_listener.start()
 
@@ -65,10 +110,9 @@ class SpeechTranscriber:
     print('Double-press either Ctrl key again to stop recording and transcribe.')
     print('Press Ctrl+C to exit.')
 
-    # Keep the main thread alive
+    # Keep the main thread alive, sleeping until stop() sets the event
     try:
-      while self.running:
-        time.sleep(0.1)
+      self._stop_event.wait()
     except KeyboardInterrupt:
       self.stop()
 
@@ -80,6 +124,7 @@ class SpeechTranscriber:
 
     self._cleanup_in_progress = True
     self.running = False
+    self._stop_event.set()
 
     # First stop the listeners
     try:
@@ -87,23 +132,16 @@ class SpeechTranscriber:
     except Exception as e:
       print(f'Error stopping keyboard listener: {e}')
 
+    # Drop any queued work rather than delaying shutdown for it
+    self._transcribe_pool.shutdown(wait=False, cancel_futures=True)
+    self._io_pool.shutdown(wait=False, cancel_futures=True)
+
     # Suppress all logging during shutdown to avoid errors
     os.environ['ABSL_LOGGING_VERBOSITY'] = '0'
     os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
-    # Redirect stderr temporarily to suppress unwanted messages
-    original_stderr = sys.stderr
-    try:
-      # Create a no-op stream that discards writes
-      class NullWriter:
-        def write(self, s):
-          pass
-
-        def flush(self):
-          pass
-
-      sys.stderr = NullWriter()
-
+    # Silence stderr at the fd level so native gRPC/absl output is dropped too
+    with _suppress_stderr():
       # Clean up transcriber first
       if hasattr(self, 'transcriber'):
         try:
@@ -112,14 +150,6 @@ class SpeechTranscriber:
           # Just continue if there's an error
           pass
 
-      # Restore stderr
-      sys.stderr = original_stderr
-    except Exception as e:
-      # Ensure stderr is restored even if an error occurs
-      sys.stderr = original_stderr
-      # Log that we caught an error during cleanup but don't disrupt shutdown
-      print(f'Error during stderr redirection cleanup: {e}')
-
     # Then clean up audio recorder
     try:
       self.audio_recorder.cleanup()
@@ -137,50 +167,99 @@ class SpeechTranscriber:
     # Force a quick exit - don't let any lingering tasks delay shutdown
     os._exit(0)
 
+  def _notify(self, title: str, message: str) -> None:
+    """Show a notification without blocking the calling thread."""
+    self._io_pool.submit(show_notification, title, message)
+
   def start_recording(self) -> None:
     """Start recording audio."""
-    show_notification('Speech Transcriber', 'Recording started...')
+    self._notify('Speech Transcriber', 'Recording started...')
+    # NSSound plays the chime in the background, so capture starts while it
+    # is still playing. Only the afplay fallback blocks until it finishes.
     play_start_sound()
     print('Recording... (press hotkey again to stop)')
     self.audio_recorder.start_recording()
 
+    # Connect to the transcription service while the user is still speaking.
+    # Each recording gets its own event so a previous loop cannot be revived.
+    self._recording_stopped = threading.Event()
+    threading.Thread(
+      target=self._keep_connection_warm, args=(self._recording_stopped,), daemon=True
+    ).start()
+
+  def _keep_connection_warm(self, recording_stopped: threading.Event) -> None:
+    """Warm up the transcription service until the recording stops."""
+    while True:
+      self.transcriber.warmup()
+      if recording_stopped.wait(self.WARMUP_INTERVAL):
+        return
+
   def stop_recording_and_transcribe(self) -> None:
     """Stop recording and transcribe the audio."""
+    self._recording_stopped.set()
     print('Recording stopped. Transcribing...')
-    show_notification('Speech Transcriber', 'Transcribing...')
-    play_stop_sound()
+    self._notify('Speech Transcriber', 'Transcribing...')
+    self._io_pool.submit(play_stop_sound)
 
     # Stop recording and get the audio file path
     audio_file_path, duration = self.audio_recorder.stop_recording()
 
     if not audio_file_path or duration < 0.5:
       print('Recording too short or failed.')
-      show_notification('Speech Transcriber', 'Recording too short or failed.')
+      self._notify('Speech Transcriber', 'Recording too short or failed.')
       return
 
-    # Transcribe the audio
-    transcribed_text = self.transcriber.transcribe(audio_file_path)
+    # Transcribe in the background so the hotkey is free for the next recording
+    future = self._transcribe_pool.submit(
+      self.transcriber.transcribe, audio_file_path, duration
+    )
+    future.add_done_callback(
+      functools.partial(
+        self._on_transcribed, audio_file_path=audio_file_path, duration=duration
+      )
+    )
+
+  def _on_transcribed(
+    self, future: Future, audio_file_path: str, duration: float
+  ) -> None:
+    """Copy a finished transcription to the clipboard and report the result."""
+    try:
+      transcribed_text = future.result()
+    except Exception as e:
+      print(f'Error during transcription: {e}')
+      transcribed_text = None
+
+    # The recording has been uploaded, so its temporary file can go now
+    self.audio_recorder.release_file(audio_file_path)
+
+    # An empty transcript means the recording was skipped for having no speech
+    if transcribed_text == '':
+      print('No speech detected.')
+      self._notify('Speech Transcriber', 'No speech detected.')
+      return
 
     if not transcribed_text:
       print('Transcription failed.')
-      show_notification('Speech Transcriber', 'Transcription failed.')
+      self._notify('Speech Transcriber', 'Transcription failed.')
       return
 
     # Copy the transcribed text to the clipboard
     if copy_to_clipboard(transcribed_text):
       print(f'Transcribed ({duration:.1f}s): {transcribed_text}')
-      show_notification(
+      self._notify(
         'Transcription Complete',
         f'Text copied to clipboard ({len(transcribed_text)} chars)',
       )
     else:
       print(f'Transcribed but failed to copy: {transcribed_text}')
-      show_notification('Transcription Complete', 'Failed to copy to clipboard')
+      self._notify('Transcription Complete', 'Failed to copy to clipboard')
 
 
-def main() -> None:
-  """Main entry point for the application."""
-  # Parse command line arguments
+def _parse_args():
+  """Parse command line arguments."""
+  # Imported here so the no-argument launch path never loads argparse
+  import argparse
+
   parser = argparse.ArgumentParser(
     description='Speech Transcriber - Convert audio to text using AI services',
     formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -200,7 +279,18 @@ def main() -> None:
     help='List available transcription services and exit',
   )
 
-  args = parser.parse_args()
+  return parser.parse_args()
+
+
+def main() -> None:
+  """Main entry point for the application."""
+  # Fast path for the usual launch with no arguments
+  if len(sys.argv) == 1:
+    app = SpeechTranscriber(service=None)
+    app.start()
+    return
+
+  args = _parse_args()
 
   if args.list_services:
     print('Available transcription services:')
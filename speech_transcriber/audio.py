@@ -1,46 +1,135 @@
 """Audio recording functionality for the Speech Transcriber."""
 
 import logging
+import math
 import os
+import shutil
+import struct
 import tempfile
 import threading
-import time
 from typing import Tuple
-import wave
+import weakref
 
 import pyaudio
 
+from speech_transcriber.audio_compression import AudioCompressor
 from speech_transcriber.config import CHANNELS
-from speech_transcriber.config import CHUNK_SIZE
+from speech_transcriber.config import FRAMES_PER_BUFFER
 from speech_transcriber.config import MAX_RECORDING_TIME
 from speech_transcriber.config import SAMPLE_RATE
+from speech_transcriber.config import TRIM_SILENCE
+from speech_transcriber.ringbuffer import SPSCRing
+from speech_transcriber.vad import HAVE_WEBRTCVAD
+from speech_transcriber.vad import SilenceTrimmer
+
+logger = logging.getLogger(__name__)
+
+
+def _remove_file(path: str) -> None:
+  """Delete a file, ignoring it if it is already gone."""
+  try:
+    os.unlink(path)
+  except FileNotFoundError:
+    pass
+  except OSError as e:
+    logger.error(f'Failed to remove temporary file {path}: {e}')
 
 
 class AudioRecorder:
   """Records audio from the microphone and saves it to a file."""
 
+  # Bytes buffered between the audio callback and the writer thread (~32 s of
+  # 16 kHz mono int16), so a slow disk never stalls capture
+  RING_BUFFER_SIZE = 1 << 20
+  # Captured audio is written in batches of at least this many bytes (~2 s), so
+  # the writer makes one syscall per 16 callbacks rather than one per callback
+  WRITE_BATCH_SIZE = 64 * 1024
+  WAV_HEADER_SIZE = 44
+  # Recordings that grow past this many bytes (~8.7 min of 16 kHz mono int16)
+  # would need compressing before upload, so from then on they are also piped
+  # through an Opus encoder while recording continues
+  STREAM_ENCODE_THRESHOLD = 16 * 1024 * 1024
+  # Capture rate to try when the device cannot record at SAMPLE_RATE
+  FALLBACK_SAMPLE_RATE = 48000
+
   def __init__(self):
     """Initialize the audio recorder with default settings."""
     self.audio = pyaudio.PyAudio()
     self.stream = None
-    self.frames = []
     self.is_recording = False
-    self.recording_thread = None
     self.temp_file = None
+    # Removes each recording's temporary file once it is released, or when the
+    # recorder is garbage collected or the interpreter exits
+    self._file_finalizers = {}
+    self._wave_fd = None  # File descriptor that captured PCM is streamed into
+    self._data_size = 0  # Number of PCM bytes written after the WAV header
+    self._frame_count = 0  # Number of FRAMES_PER_BUFFER chunks captured so far
+    self._dropped_bytes = 0  # Captured bytes lost because the ring was full
+    self._overflow_count = 0  # Chunks PortAudio flagged as having lost input
+    self._writer_thread = None  # Drains the ring into the WAV file
+    self._encoder = None  # ffmpeg process encoding the recording as it is captured
+    self._encoded_path = None  # Ogg Opus file the encoder writes to
+    self._encode_pending = False  # Whether the encoder may still be started
+    self._trimmer = None  # Drops silence before it is buffered, if enabled
     self._max_time_reached = False  # Flag to track if max recording time was reached
 
+    # Allocate the ring once and reuse it for every recording
+    self._ring = SPSCRing(self.RING_BUFFER_SIZE)
+
+    # Query the sample format and input device once rather than on every recording
+    self._sample_width = self.audio.get_sample_size(pyaudio.paInt16)
+    self._configure_input_device()
+
+  def _configure_input_device(self) -> None:
+    """Pick the input device and rate and pre-open the stream for them."""
+    self._input_device_index = self._get_input_device_index(
+      self._get_available_input_devices()
+    )
+    self._sample_rate = self._negotiate_sample_rate()
+    # Number of chunks that make up MAX_RECORDING_TIME at the negotiated rate
+    self._max_chunks = math.ceil(
+      MAX_RECORDING_TIME * self._sample_rate / FRAMES_PER_BUFFER
+    )
+
+    # Open the input stream paused so starting a recording only has to start it
+    try:
+      self._open_audio_stream()
+    except OSError as e:
+      logger.warning(f'Could not pre-open audio stream, will retry on record: {e}')
+
+  def refresh_devices(self) -> None:
+    """Re-detect the input device, e.g. after a microphone is plugged in.
+
+    PortAudio only enumerates devices when it is initialized, so this restarts
+    it. Does nothing while a recording is in progress.
+    """
+    if self.is_recording:
+      return
+
+    if self.stream:
+      self.stream.close()
+      self.stream = None
+    self.audio.terminate()
+    self.audio = pyaudio.PyAudio()
+    self._configure_input_device()
+
   def start_recording(self) -> None:
     """Start recording audio."""
     if self.is_recording:
       return
 
+    if self.stream is None:
+      # The device may have been missing when the stream was last opened
+      self._configure_input_device()
+
     self._initialize_recording()
     self._setup_temp_file()
+    self._open_wave_file()
+    self._start_writer_thread()
 
     try:
       self._setup_audio_stream()
-      self._start_recording_thread()
-      logging.info('Recording started')
+      logger.info('Recording started')
     except OSError as e:
       self._handle_recording_error(e)
       raise
@@ -48,12 +137,61 @@ class AudioRecorder:
   def _initialize_recording(self) -> None:
     """Initialize recording state."""
     self.is_recording = True
-    self.frames = []
+    self._frame_count = 0
     self._max_time_reached = False
+    self._dropped_bytes = 0
+    self._overflow_count = 0
+    self._encode_pending = True
+    self._ring.reset()
+
+    # webrtcvad only handles mono audio at a few fixed rates
+    if (
+      TRIM_SILENCE
+      and HAVE_WEBRTCVAD
+      and CHANNELS == 1
+      and self._sample_rate in SilenceTrimmer.SUPPORTED_RATES
+    ):
+      self._trimmer = SilenceTrimmer(self._sample_rate, self._sample_width)
+    else:
+      self._trimmer = None
 
   def _setup_temp_file(self) -> None:
     """Create a temporary file for the recording."""
     self.temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+    self._track_file(self.temp_file.name)
+
+  def _track_file(self, path: str) -> None:
+    """Delete path once it is released or the recorder goes away."""
+    self._file_finalizers[path] = weakref.finalize(self, _remove_file, path)
+
+  def _build_wave_header(self, data_size: int) -> bytes:
+    """Build the 44-byte PCM WAV header for the given data size."""
+    block_align = CHANNELS * self._sample_width
+    return struct.pack(
+      '<4sI4s4sIHHIIHH4sI',
+      b'RIFF',
+      36 + data_size,
+      b'WAVE',
+      b'fmt ',
+      16,
+      1,  # PCM
+      CHANNELS,
+      self._sample_rate,
+      self._sample_rate * block_align,
+      block_align,
+      self._sample_width * 8,
+      b'data',
+      data_size,
+    )
+
+  def _open_wave_file(self) -> None:
+    """Open the WAV file that captured audio is streamed into."""
+    self._wave_fd = os.open(
+      self.temp_file.name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+    )
+    self._data_size = 0
+    # Sizes are left at zero here and patched in place once recording stops
+    os.write(self._wave_fd, self._build_wave_header(0))
 
   def _get_available_input_devices(self) -> list:
     """Get a list of available input devices."""
@@ -67,8 +205,8 @@ class AudioRecorder:
         devices.append((i, device_info.get('name')))
 
     # Log available devices for debugging
-    for device_id, name in devices:
-      logging.info(f'Input device {device_id}: {name}')
+    if logger.isEnabledFor(logging.DEBUG):
+      logger.debug('Input devices: %s', devices)
 
     return devices
 
@@ -80,45 +218,220 @@ class AudioRecorder:
       # If default device retrieval fails, use the first available input device
       return devices[0][0] if devices else 0
 
-  def _setup_audio_stream(self) -> None:
-    """Set up the audio stream for recording."""
-    devices = self._get_available_input_devices()
-    default_input_device_index = self._get_input_device_index(devices)
-
+  def _negotiate_sample_rate(self) -> int:
+    """Pick the capture rate, preferring SAMPLE_RATE.
+
+    Falls back to FALLBACK_SAMPLE_RATE, a common native rate that webrtcvad also
+    accepts, and only then to the input device's default rate. Audio is
+    recorded and uploaded at whichever rate is picked.
+    """
+    for sample_rate in (SAMPLE_RATE, self.FALLBACK_SAMPLE_RATE):
+      if self._supports_sample_rate(sample_rate):
+        break
+    else:
+      try:
+        device_info = self.audio.get_device_info_by_index(self._input_device_index)
+        sample_rate = int(device_info['defaultSampleRate'])
+      except OSError as e:
+        # No usable input device yet; recording or refreshing devices retries
+        logger.warning(f'Could not query input device: {e}')
+        return SAMPLE_RATE
+
+    if sample_rate != SAMPLE_RATE:
+      logger.warning(
+        f'Input device does not support {SAMPLE_RATE} Hz, recording at {sample_rate} Hz'
+      )
+    return sample_rate
+
+  def _supports_sample_rate(self, sample_rate: int) -> bool:
+    """Check whether the input device can capture at sample_rate."""
+    try:
+      self.audio.is_format_supported(
+        sample_rate,
+        input_device=self._input_device_index,
+        input_channels=CHANNELS,
+        input_format=pyaudio.paInt16,
+      )
+      return True
+    except ValueError:
+      return False
+
+  def _open_audio_stream(self) -> None:
+    """Open the input stream in a stopped state."""
     self.stream = self.audio.open(
       format=pyaudio.paInt16,
       channels=CHANNELS,
-      rate=SAMPLE_RATE,
+      rate=self._sample_rate,
       input=True,
-      frames_per_buffer=CHUNK_SIZE,
-      input_device_index=default_input_device_index,
+      frames_per_buffer=FRAMES_PER_BUFFER,
+      input_device_index=self._input_device_index,
+      stream_callback=self._pa_callback,
+      start=False,
     )
 
-  def _start_recording_thread(self) -> None:
-    """Start the recording thread."""
-    self.recording_thread = threading.Thread(target=self._record)
-    self.recording_thread.start()
+  def _setup_audio_stream(self) -> None:
+    """Set up the audio stream for recording."""
+    if self.stream is None:
+      self._open_audio_stream()
+    elif not self.stream.is_stopped():
+      # The callback completed the stream (e.g. max time) without it being stopped
+      self.stream.stop_stream()
+
+    self.stream.start_stream()
 
   def _handle_recording_error(self, error) -> None:
     """Handle errors during recording setup."""
     self.is_recording = False
-    logging.error(f'Failed to start recording: {error}')
+    self._stop_writer_thread()
+    self._abort_encoder()
+    self._close_wave_file()
+    logger.error(f'Failed to start recording: {error}')
+
+  def _pa_callback(self, in_data, frame_count, time_info, status) -> tuple:
+    """Receive a captured chunk from PortAudio's audio thread.
+
+    PortAudio invokes this once per FRAMES_PER_BUFFER frames for as long as the
+    stream is active. The chunk is only copied into the ring here; the writer
+    thread does the disk I/O.
+    """
+    if not self.is_recording:
+      return None, pyaudio.paComplete
 
-  def _record(self) -> None:
-    """Record audio data in a loop until stopped."""
-    start_time = time.time()
+    if status & pyaudio.paInputOverflow:
+      # PortAudio lost input before this chunk because the callback ran late
+      self._overflow_count += 1
 
     try:
-      while self.is_recording:
-        if time.time() - start_time > MAX_RECORDING_TIME:
-          self._handle_max_time_reached()
-          break
-
-        data = self.stream.read(CHUNK_SIZE, exception_on_overflow=False)
-        self.frames.append(data)
+      if self._trimmer is not None:
+        in_data = self._trimmer.process(in_data)
+      written = self._ring.write(in_data)
+      # Keep capturing if the writer falls behind, but account for the gap
+      self._dropped_bytes += len(in_data) - written
+      self._frame_count += 1
     except Exception as e:
-      logging.error(f'Error during recording: {e}')
+      logger.error(f'Error during recording: {e}')
       self.is_recording = False
+      return None, pyaudio.paAbort
+
+    if self._frame_count >= self._max_chunks:
+      self._handle_max_time_reached()
+      return None, pyaudio.paComplete
+
+    return None, pyaudio.paContinue
+
+  def _start_writer_thread(self) -> None:
+    """Start the thread that drains captured audio into the WAV file."""
+    self._writer_thread = threading.Thread(target=self._drain_ring, daemon=True)
+    self._writer_thread.start()
+
+  def _drain_ring(self) -> None:
+    """Write audio from the ring to the WAV file until the ring is closed."""
+    ring = self._ring
+    while True:
+      if len(ring) < self.WRITE_BATCH_SIZE and not ring.closed:
+        ring.wait(self.WRITE_BATCH_SIZE)
+        continue
+
+      segments = ring.peek()
+      if not segments:
+        return  # Closed and fully drained
+
+      try:
+        # Write raw frames without copying, both sides of a wrap in one syscall;
+        # a short write leaves the remainder in the ring for the next pass
+        written = os.writev(self._wave_fd, segments)
+      except OSError as e:
+        logger.error(f'Error writing recording to disk: {e}')
+        self.is_recording = False
+        return
+
+      if self._encoder is not None:
+        self._feed_encoder(segments, written)
+
+      ring.consume(written)
+      self._data_size += written
+
+      if self._encode_pending and self._data_size >= self.STREAM_ENCODE_THRESHOLD:
+        self._start_encoder()
+
+  def _start_encoder(self) -> None:
+    """Start encoding the recording to Opus alongside the WAV file.
+
+    Runs on the writer thread. The audio already written to the WAV file is
+    fed to the encoder first, after which the writer thread passes it each new
+    chunk as it is written.
+    """
+    self._encode_pending = False
+    compressor = AudioCompressor()
+    if not compressor.ffmpeg_available:
+      return
+
+    encoded_file = tempfile.NamedTemporaryFile(suffix='.ogg', delete=False)
+    encoded_file.close()
+    self._encoded_path = encoded_file.name
+    self._track_file(self._encoded_path)
+
+    try:
+      self._encoder = compressor.compress_stream(
+        self._encoded_path, self._sample_rate, CHANNELS
+      )
+      with open(self.temp_file.name, 'rb') as wave_file:
+        wave_file.seek(self.WAV_HEADER_SIZE)
+        shutil.copyfileobj(wave_file, self._encoder.stdin)
+    except OSError as e:
+      logger.warning(f'Could not start Opus encoder, keeping WAV only: {e}')
+      self._abort_encoder()
+      return
+
+    logger.info('Recording is long; encoding to Opus while recording')
+
+  def _feed_encoder(self, segments: list, count: int) -> None:
+    """Pass the first count bytes of the ring segments to the encoder."""
+    try:
+      for segment in segments:
+        chunk = segment[:count]
+        self._encoder.stdin.write(chunk)
+        count -= len(chunk)
+        if not count:
+          break
+    except OSError as e:
+      logger.warning(f'Opus encoder failed, keeping WAV only: {e}')
+      self._abort_encoder()
+
+  def _finish_encoder(self) -> str:
+    """Wait for the encoder to finish and return the encoded path, or '' on failure."""
+    if self._encoder is None:
+      return ''
+
+    encoder, self._encoder = self._encoder, None
+    if not AudioCompressor().finish_stream(encoder, self._encoded_path):
+      self._abort_encoder()
+      return ''
+
+    encoded_path, self._encoded_path = self._encoded_path, None
+    return encoded_path
+
+  def _abort_encoder(self) -> None:
+    """Stop the encoder, if any, and delete its partial output."""
+    if self._encoder is not None:
+      encoder, self._encoder = self._encoder, None
+      encoder.kill()
+      try:
+        encoder.stdin.close()
+      except OSError:
+        pass  # Unflushed input has nowhere to go once ffmpeg is gone
+      encoder.wait()
+
+    if self._encoded_path is not None:
+      self.release_file(self._encoded_path)
+      self._encoded_path = None
+
+  def _stop_writer_thread(self) -> None:
+    """Let the writer thread drain what is left in the ring and wait for it."""
+    if self._writer_thread is not None:
+      self._ring.close()
+      self._writer_thread.join()
+      self._writer_thread = None
 
   def _handle_max_time_reached(self) -> None:
     """Handle when maximum recording time is reached."""
@@ -128,62 +441,88 @@ class AudioRecorder:
   def stop_recording(self) -> Tuple[str, float]:
     """Stop recording and save the audio to a file."""
     if not self.is_recording:
+      # Recording already ended on its own (e.g. max time); release the writer
+      self._stop_writer_thread()
+      self._abort_encoder()
+      self._close_wave_file()
       return '', 0.0
 
     self.is_recording = False
-    self._wait_for_recording_thread()
-    self._close_audio_stream()
+    # Stopping the stream waits for any in-flight callback to return
+    self._stop_audio_stream()
+    self._stop_writer_thread()
 
-    # Calculate the duration of the recording
-    duration = len(self.frames) * CHUNK_SIZE / SAMPLE_RATE
+    if self._dropped_bytes:
+      logger.warning(f'Dropped {self._dropped_bytes} bytes of audio; disk too slow')
+    if self._overflow_count:
+      logger.warning(f'Audio input overflowed {self._overflow_count} times')
 
-    # Ensure we have a temp file to write to
-    self._ensure_temp_file_exists()
-    self._save_audio_to_file()
+    self._finalize_audio_file()
 
-    return self.temp_file.name, duration
+    # Calculate the duration of the audio kept, which excludes any trimmed silence
+    duration = self._data_size / (CHANNELS * self._sample_width * self._sample_rate)
 
-  def _wait_for_recording_thread(self) -> None:
-    """Wait for the recording thread to finish."""
-    # Check if this was called from the recording thread (auto-stop case)
-    called_from_recording_thread = threading.current_thread() is self.recording_thread
+    encoded_path = self._finish_encoder()
+    if encoded_path:
+      # The WAV was only kept in case encoding failed
+      self.release_file(self.temp_file.name)
+      return encoded_path, duration
 
-    # Wait for the recording thread to finish, but only if not called from the recording thread
-    if (
-      self.recording_thread
-      and self.recording_thread.is_alive()
-      and not called_from_recording_thread
-    ):
-      self.recording_thread.join()
+    return self.temp_file.name, duration
 
-  def _close_audio_stream(self) -> None:
-    """Close the audio stream if it exists."""
+  def _stop_audio_stream(self) -> None:
+    """Stop the audio stream, keeping it open for the next recording."""
     if self.stream:
       self.stream.stop_stream()
-      self.stream.close()
-      self.stream = None
 
   def _ensure_temp_file_exists(self) -> None:
     """Ensure that a temporary file exists for saving the recording."""
     if self.temp_file is None:
-      logging.warning('temp_file was None during stop_recording, creating a new one')
-      self.temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-
-  def _save_audio_to_file(self) -> None:
-    """Save the recorded audio frames to a WAV file."""
-    with wave.open(self.temp_file.name, 'wb') as wf:
-      wf.setnchannels(CHANNELS)
-      wf.setsampwidth(self.audio.get_sample_size(pyaudio.paInt16))
-      wf.setframerate(SAMPLE_RATE)
-      wf.writeframes(b''.join(self.frames))
+      logger.warning('temp_file was None during stop_recording, creating a new one')
+      self._setup_temp_file()
+
+  def _finalize_audio_file(self) -> None:
+    """Close the streamed WAV file so its header reflects the recorded length."""
+    if self._wave_fd is None:
+      # Recording never got as far as opening the writer; produce an empty WAV
+      self._ensure_temp_file_exists()
+      self._open_wave_file()
+
+    self._close_wave_file()
+
+  def _close_wave_file(self) -> None:
+    """Rewrite the header with the recorded size and close the WAV file."""
+    if self._wave_fd is not None:
+      try:
+        os.pwrite(self._wave_fd, self._build_wave_header(self._data_size), 0)
+      finally:
+        os.close(self._wave_fd)
+        self._wave_fd = None
+
+  def release_file(self, path: str) -> None:
+    """Delete a recording returned by stop_recording once it is no longer needed.
+
+    Args:
+        path: Path previously returned by stop_recording.
+    """
+    finalizer = self._file_finalizers.pop(path, None)
+    if finalizer is not None:
+      finalizer()
 
   def cleanup(self) -> None:
     """Clean up resources."""
     if self.stream:
       self.stream.close()
+      self.stream = None
+
+    self._stop_writer_thread()
+    self._abort_encoder()
+    self._close_wave_file()
 
     self.audio.terminate()
 
-    # Remove the temporary file if it exists
-    if self.temp_file and os.path.exists(self.temp_file.name):
-      os.unlink(self.temp_file.name)
+    # Remove recordings that were never released; os._exit skips atexit, so
+    # the finalizers cannot be left to run on their own at shutdown
+    for finalizer in list(self._file_finalizers.values()):
+      finalizer()
+    self._file_finalizers.clear()
@@ -1,5 +1,6 @@
 """Audio compression functionality for the Speech Transcriber."""
 
+import functools
 import logging
 import os
 import shutil
@@ -8,65 +9,93 @@ import tempfile
 from typing import Optional
 
 
+@functools.lru_cache(maxsize=1)
+def _find_ffmpeg() -> Optional[str]:
+  """Return the path of the ffmpeg binary, searching PATH only the first time."""
+  return shutil.which('ffmpeg')
+
+
 class AudioCompressor:
   """Compresses audio files to reduce size."""
 
+  # Opus at 16 kbps is transparent for mono speech and VBR adapts to the
+  # content, so even an hour of audio (~7 MB) stays under every API size limit
+  SPEECH_BITRATE = 16
+  MIN_BITRATE = 6  # Lowest bitrate libopus supports
+
   def __init__(self):
     """Initialize the audio compressor."""
     self._check_ffmpeg_available()
 
   def _check_ffmpeg_available(self) -> None:
     """Check if ffmpeg is installed and available."""
-    if shutil.which('ffmpeg') is None:
+    if _find_ffmpeg() is None:
       logging.warning('ffmpeg not found in PATH. Audio compression will not work.')
       self.ffmpeg_available = False
     else:
       self.ffmpeg_available = True
 
-  def compress_audio(self, input_file: str, max_size_mb: int = 19) -> Optional[str]:
+  def compress_audio(
+    self,
+    input_file: str,
+    max_size_mb: int = 19,
+    duration: Optional[float] = None,
+    skip_below_mb: Optional[float] = None,
+  ) -> Optional[str]:
     """Compress the audio file to reduce its size below the limit.
 
     Args:
         input_file: Path to the input audio file
         max_size_mb: Maximum target size in MB
+        duration: Length of the audio in seconds, if known. Recordings too long
+            to fit max_size_mb at SPEECH_BITRATE are encoded at a lower bitrate.
+        skip_below_mb: Files no larger than this are returned as they are.
+            Defaults to max_size_mb.
 
     Returns:
-        Path to the compressed audio file or None if compression failed
+        Path to the compressed audio file, input_file itself if it is no larger
+        than skip_below_mb, or None if compression failed
     """
     if not self.ffmpeg_available:
       logging.error('Cannot compress audio: ffmpeg not available')
       return None
 
-    if not os.path.exists(input_file):
+    try:
+      input_size_mb = os.stat(input_file).st_size / (1024 * 1024)
+    except FileNotFoundError:
       logging.error(f'Input file does not exist: {input_file}')
       return None
 
+    if skip_below_mb is None:
+      skip_below_mb = max_size_mb
+    if input_size_mb <= skip_below_mb:
+      logging.info(
+        f'Skipping compression: {input_size_mb:.2f}MB already under {skip_below_mb}MB'
+      )
+      return input_file
+
     # Create a temporary file for the compressed audio
-    compressed_file = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
+    compressed_file = tempfile.NamedTemporaryFile(suffix='.ogg', delete=False)
     compressed_file.close()
 
     try:
-      # Calculate appropriate bitrate based on file size
-      bitrate = self._calculate_bitrate(input_file, max_size_mb)
+      bitrate = self._calculate_bitrate(duration, max_size_mb)
 
       # Log compression details
-      input_size_mb = os.path.getsize(input_file) / (1024 * 1024)
       logging.info(
-        f'Compressing audio file from {input_size_mb:.2f}MB to target {max_size_mb}MB using {bitrate}k bitrate'
+        f'Compressing audio file from {input_size_mb:.2f}MB to target {max_size_mb}MB using {bitrate}k Opus'
       )
 
       # Run ffmpeg to compress the audio
       result = self._run_ffmpeg(input_file, compressed_file.name, bitrate)
 
       # Verify compression succeeded
-      if (
-        not os.path.exists(compressed_file.name)
-        or os.path.getsize(compressed_file.name) == 0
-      ):
+      compressed_size = self._file_size(compressed_file.name)
+      if compressed_size == 0:
         logging.error('Compression failed: output file is empty or does not exist')
         return None
 
-      compressed_size_mb = os.path.getsize(compressed_file.name) / (1024 * 1024)
+      compressed_size_mb = compressed_size / (1024 * 1024)
       logging.info(f'Compressed audio file to {compressed_size_mb:.2f}MB')
 
       return compressed_file.name
@@ -74,16 +103,116 @@ class AudioCompressor:
       self._handle_compression_error(e, compressed_file.name)
       return None
 
-  def _calculate_bitrate(self, input_file: str, max_size_mb: int) -> int:
-    """Calculate an appropriate bitrate for the compressed file."""
-    input_size_mb = os.path.getsize(input_file) / (1024 * 1024)
+  def compress_stream(
+    self,
+    output_file: str,
+    sample_rate: int,
+    channels: int,
+    bitrate: int = SPEECH_BITRATE,
+  ) -> subprocess.Popen:
+    """Start an ffmpeg process that encodes raw PCM piped to its stdin.
+
+    Write 16-bit little-endian PCM to the returned process's stdin, then pass
+    it to finish_stream() once all audio has been written.
+
+    Args:
+        output_file: Path to write the Ogg Opus file to
+        sample_rate: Sample rate of the PCM in Hz
+        channels: Number of interleaved channels in the PCM
+        bitrate: Target bitrate in kbps
+
+    Returns:
+        The running ffmpeg process
+
+    Raises:
+        OSError: If ffmpeg is not available or could not be started
+    """
+    if not self.ffmpeg_available:
+      raise FileNotFoundError('ffmpeg not available')
+
+    return subprocess.Popen(
+      [
+        'ffmpeg',
+        '-f',
+        's16le',
+        '-ar',
+        str(sample_rate),
+        '-ac',
+        str(channels),
+        '-i',
+        'pipe:0',
+        *self._opus_args(bitrate),
+        output_file,
+      ],
+      stdin=subprocess.PIPE,
+      # Nothing reads ffmpeg's output while it runs, so a pipe could fill up
+      stdout=subprocess.DEVNULL,
+      stderr=subprocess.DEVNULL,
+    )
 
-    # Calculate a bitrate that will result in a file under the max size
-    # Assuming compression ratio of ~10x for WAV to MP3 conversion
-    estimated_bitrate = int((max_size_mb * 8 * 1024) / (input_size_mb / 10))
+  def finish_stream(self, process: subprocess.Popen, output_file: str) -> bool:
+    """Close the input of a process from compress_stream() and wait for it.
 
-    # Clamp the bitrate to reasonable values
-    return max(16, min(128, estimated_bitrate))
+    Args:
+        process: Process returned by compress_stream()
+        output_file: Path the process was writing to
+
+    Returns:
+        True if the encoded file was written successfully
+    """
+    try:
+      process.stdin.close()
+    except OSError as e:
+      logging.error(f'Error finishing audio stream: {e}')
+    returncode = process.wait()
+
+    if returncode != 0:
+      logging.error(f'Compression failed: ffmpeg exited with status {returncode}')
+      return False
+    if self._file_size(output_file) == 0:
+      logging.error('Compression failed: output file is empty or does not exist')
+      return False
+    return True
+
+  @staticmethod
+  def _file_size(path: str) -> int:
+    """Return the size of path in bytes, or 0 if it does not exist."""
+    try:
+      return os.stat(path).st_size
+    except FileNotFoundError:
+      return 0
+
+  def _calculate_bitrate(self, duration: Optional[float], max_size_mb: int) -> int:
+    """Calculate a bitrate that fits duration seconds of audio in max_size_mb."""
+    if not duration:
+      return self.SPEECH_BITRATE
+
+    budget = int(max_size_mb * 8 * 1024 / duration)
+    return max(self.MIN_BITRATE, min(self.SPEECH_BITRATE, budget))
+
+  @staticmethod
+  def _opus_args(bitrate: int) -> list:
+    """Build the ffmpeg output options for Ogg Opus tuned for speech."""
+    return [
+      '-c:a',
+      'libopus',
+      '-b:a',
+      f'{bitrate}k',
+      '-vbr',
+      'on',
+      '-application',
+      'voip',  # Optimize for speech intelligibility
+      '-ac',
+      '1',  # Convert to mono
+      '-ar',
+      '16000',  # Speech needs no more, and the encoder does less work
+      '-vn',  # Drop any video stream or cover art from the input
+      '-f',
+      'ogg',
+      '-threads',
+      '1',  # Leave the other cores to capture and the rest of the system
+      '-y',  # Overwrite existing file
+    ]
 
   def _run_ffmpeg(
     self, input_file: str, output_file: str, bitrate: int
@@ -94,11 +223,7 @@ class AudioCompressor:
         'ffmpeg',
         '-i',
         input_file,
-        '-b:a',
-        f'{bitrate}k',
-        '-ac',
-        '1',  # Convert to mono
-        '-y',  # Overwrite existing file
+        *self._opus_args(bitrate),
         output_file,
       ],
       capture_output=True,
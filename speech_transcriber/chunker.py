@@ -0,0 +1,107 @@
+"""Splitting of long recordings into chunks that fit the services' size limits."""
+
+import os
+import re
+import tempfile
+import wave
+from typing import List
+from typing import Sequence
+
+OVERLAP_SECONDS = 2.0  # Audio repeated at the start of each chunk after the first
+MAX_OVERLAP_WORDS = 30  # Longest run of words searched for when merging chunks
+
+
+def split_wav(
+  audio_file_path: str, max_chunk_bytes: int, overlap_seconds: float = OVERLAP_SECONDS
+) -> List[str]:
+  """Split a WAV file into overlapping chunks written to temporary files.
+
+  Consecutive chunks share overlap_seconds of audio, so a word cut at a chunk
+  boundary is heard whole in at least one of them.
+
+  Args:
+      audio_file_path: Path to the WAV file to split
+      max_chunk_bytes: Maximum size of each chunk file, including its header
+      overlap_seconds: Seconds of audio shared by consecutive chunks
+
+  Returns:
+      Paths of the chunk files in order. The caller is responsible for
+      deleting them.
+
+  Raises:
+      wave.Error: If the file is not a PCM WAV file
+      ValueError: If max_chunk_bytes is too small to hold more than the overlap
+  """
+  chunk_paths = []
+  with wave.open(audio_file_path, 'rb') as source:
+    params = source.getparams()
+    frame_size = params.sampwidth * params.nchannels
+    # Leave room for the header that wave writes ahead of the samples
+    chunk_frames = (max_chunk_bytes - 44) // frame_size
+    overlap_frames = int(overlap_seconds * params.framerate)
+    if chunk_frames <= overlap_frames:
+      raise ValueError(f'Chunks of {max_chunk_bytes} bytes cannot hold the overlap')
+
+    start = 0
+    try:
+      while True:
+        source.setpos(start)
+        frames = source.readframes(chunk_frames)
+        chunk_paths.append(_write_chunk(params, frames))
+        if start + chunk_frames >= params.nframes:
+          break
+        start += chunk_frames - overlap_frames
+    except BaseException:
+      for chunk_path in chunk_paths:
+        os.unlink(chunk_path)
+      raise
+
+  return chunk_paths
+
+
+def _write_chunk(params: tuple, frames: bytes) -> str:
+  """Write frames to a new temporary WAV file and return its path."""
+  fd, chunk_path = tempfile.mkstemp(suffix='.wav')
+  with os.fdopen(fd, 'wb') as chunk_file:
+    with wave.open(chunk_file, 'wb') as chunk:
+      chunk.setparams(params)
+      chunk.writeframes(frames)
+  return chunk_path
+
+
+def merge_transcripts(texts: Sequence[str]) -> str:
+  """Join the transcripts of overlapping chunks, dropping repeated words.
+
+  Args:
+      texts: Transcripts of consecutive chunks from split_wav()
+
+  Returns:
+      The combined transcript
+  """
+  merged = ''
+  for text in texts:
+    text = text.strip()
+    if not merged:
+      merged = text
+    elif text:
+      words = text.split()
+      overlap = _find_overlap(merged.split(), words)
+      if overlap < len(words):
+        merged = f'{merged} {" ".join(words[overlap:])}'
+  return merged
+
+
+def _find_overlap(previous: List[str], following: List[str]) -> int:
+  """Return how many leading words of following repeat the end of previous."""
+  longest = min(len(previous), len(following), MAX_OVERLAP_WORDS)
+  tail = [_normalize(word) for word in previous[-longest:]]
+  head = [_normalize(word) for word in following[:longest]]
+  for size in range(longest, 0, -1):
+    if tail[len(tail) - size :] == head[:size]:
+      return size
+  return 0
+
+
+def _normalize(word: str) -> str:
+  """Return word lowercased and without punctuation, for comparing chunk edges."""
+  return re.sub(r'[^\w]', '', word.lower())
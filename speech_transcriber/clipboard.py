@@ -2,6 +2,15 @@
 
 import pyperclip
 
+try:
+  # Try to import PyObjC to use the macOS pasteboard without a subprocess
+  from AppKit import NSPasteboard
+  from AppKit import NSPasteboardTypeString
+
+  HAVE_PYOBJC = True
+except ImportError:
+  HAVE_PYOBJC = False
+
 
 def copy_to_clipboard(text: str) -> bool:
   """Copy text to the clipboard.
@@ -13,6 +22,12 @@ def copy_to_clipboard(text: str) -> bool:
       True if successful, False otherwise
   """
   try:
+    if HAVE_PYOBJC:
+      # Write to the pasteboard directly instead of spawning pbcopy
+      pasteboard = NSPasteboard.generalPasteboard()
+      pasteboard.clearContents()
+      return bool(pasteboard.setString_forType_(text, NSPasteboardTypeString))
+
     pyperclip.copy(text)
     return True
   except Exception as e:
@@ -27,6 +42,10 @@ def paste_from_clipboard() -> str:
       The text from the clipboard, or an empty string if failed
   """
   try:
+    if HAVE_PYOBJC:
+      text = NSPasteboard.generalPasteboard().stringForType_(NSPasteboardTypeString)
+      return text or ''
+
     return pyperclip.paste()
   except Exception as e:
     print(f'Error pasting from clipboard: {e}')
@@ -30,14 +30,34 @@ TRANSCRIPTION_SERVICE = os.environ.get('TRANSCRIPTION_SERVICE', 'openai').lower(
 # Audio Recording Configuration
 SAMPLE_RATE = 16000  # Hz (default rate for GPT-4o models)
 CHANNELS = 1  # Mono
-CHUNK_SIZE = 1024  # Frames per buffer
+CHUNK_SIZE = 2048  # Frames per buffer (128 ms at SAMPLE_RATE)
 FORMAT = 'wav'  # Audio format
 MAX_RECORDING_TIME = 3600  # Maximum recording time in seconds
+# Frames captured per PortAudio callback. The default of two chunks (256 ms)
+# halves the Python callbacks during capture; LOW_LATENCY=true uses one chunk
+# (128 ms), which also trims less audio off the end of a recording
+LOW_LATENCY = os.environ.get('LOW_LATENCY', 'false').lower() == 'true'
+FRAMES_PER_BUFFER = CHUNK_SIZE if LOW_LATENCY else CHUNK_SIZE * 2
+# Drop long pauses while recording (requires the optional webrtcvad package)
+TRIM_SILENCE = os.environ.get('TRIM_SILENCE', 'true').lower() == 'true'
 
 # OpenAI GPT-4o API Configuration
 OPENAI_MODEL = 'gpt-4o-transcribe'
 LANGUAGE = os.environ.get('LANGUAGE', 'en')  # Language code (optional)
 
+# Maximum number of files transcribed at once by Transcriber.transcribe_many
+MAX_CONCURRENT_TRANSCRIPTIONS = 5
+
+# Compress WAV recordings to Opus before uploading them (requires ffmpeg)
+COMPRESS_UPLOADS = os.environ.get('COMPRESS_UPLOADS', 'true').lower() == 'true'
+
+# Skip the API request for recordings with no speech (requires webrtcvad)
+SKIP_SILENCE = os.environ.get('SKIP_SILENCE', 'true').lower() == 'true'
+
+# Reuse transcripts of audio sent before. Off by default, since every recording
+# is a new file and hashing it only delays the upload.
+CACHE_TRANSCRIPTS = os.environ.get('CACHE_TRANSCRIPTS', 'false').lower() == 'true'
+
 # Gemini API Configuration
 GEMINI_MODEL = 'gemini-2.0-flash'  # Model for audio transcription
 
@@ -46,6 +66,3 @@ NOTIFICATION_ENABLED = True  # Show notifications during recording/transcription
 
 # Output settings
 OUTPUT_DIR = Path(__file__).parent.parent / 'transcripts'
-
-# Ensure output directory exists
-OUTPUT_DIR.mkdir(exist_ok=True)
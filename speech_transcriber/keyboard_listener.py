@@ -4,11 +4,33 @@ import time
 from typing import Any
 from typing import Callable
 from typing import Optional
-from typing import Set
 
 from pynput.keyboard import Key
 from pynput.keyboard import Listener
 
+# One bit per modifier family, so held modifiers fit in a single int
+CTRL_MASK = 1
+SHIFT_MASK = 2
+ALT_MASK = 4
+CMD_MASK = 8
+
+# Keys not in this map are not tracked, so ordinary typing only costs one lookup
+MODIFIER_BITS = {
+  Key.ctrl: CTRL_MASK,
+  Key.ctrl_l: CTRL_MASK,
+  Key.ctrl_r: CTRL_MASK,
+  Key.shift: SHIFT_MASK,
+  Key.shift_l: SHIFT_MASK,
+  Key.shift_r: SHIFT_MASK,
+  Key.alt: ALT_MASK,
+  Key.alt_l: ALT_MASK,
+  Key.alt_r: ALT_MASK,
+  Key.alt_gr: ALT_MASK,
+  Key.cmd: CMD_MASK,
+  Key.cmd_l: CMD_MASK,
+  Key.cmd_r: CMD_MASK,
+}
+
 
 class KeyboardListener:
   """Listens for keyboard events to detect double-press of Ctrl key."""
@@ -30,7 +52,7 @@ class KeyboardListener:
     self.on_activate = on_activate
     self.on_deactivate = on_deactivate
     self.listener = None
-    self.current_keys: Set[Any] = set()
+    self.held_modifiers = 0  # Bitwise OR of the *_MASK bits currently held down
     self.is_recording = False
 
     # State for tracking double-press (now for Ctrl)
@@ -52,7 +74,7 @@ class KeyboardListener:
 
     self.listener.stop()
     self.listener = None
-    self.current_keys.clear()
+    self.held_modifiers = 0
     self.is_recording = False
     # Reset Ctrl tracking state
     self.last_ctrl_press_time = None
@@ -60,16 +82,16 @@ class KeyboardListener:
 
   def _is_ctrl_key(self, key: Any) -> bool:
     """Check if a key is either left or right Ctrl."""
-    # Use Key.ctrl for generic Ctrl, Key.ctrl_l and Key.ctrl_r for specific ones
-    return key == Key.ctrl or key == Key.ctrl_l or key == Key.ctrl_r
+    # Covers Key.ctrl for generic Ctrl, Key.ctrl_l and Key.ctrl_r for specific ones
+    return MODIFIER_BITS.get(key) == CTRL_MASK
 
   def _on_press(self, key: Any) -> None:
     """Handle key press events."""
-    # Add key regardless, needed for release tracking
-    self.current_keys.add(key)
+    bit = MODIFIER_BITS.get(key, 0)
+    self.held_modifiers |= bit
 
     # Check if a Ctrl key was pressed
-    if self._is_ctrl_key(key):
+    if bit == CTRL_MASK:
       current_time = time.time()
 
       # Check if it's a double-press of Ctrl
@@ -79,7 +101,7 @@ class KeyboardListener:
         # Ensure the previous press was also a Ctrl key
         and self._is_ctrl_key(self.last_ctrl_key)
         # Optional: Prevent trigger if another modifier is held (e.g., Shift+Ctrl double press)
-        # and not any(k in {Key.shift, Key.alt, Key.cmd} for k in self.current_keys if k != key)
+        # and not self.held_modifiers & ~CTRL_MASK
       ):
         # Toggle recording state
         if not self.is_recording:
@@ -98,13 +120,10 @@ class KeyboardListener:
         self.last_ctrl_key = key
 
     # If a non-Ctrl key is pressed, reset the double-press sequence
-    elif not self._is_ctrl_key(key):
+    else:
       self.last_ctrl_press_time = None
       self.last_ctrl_key = None
 
   def _on_release(self, key: Any) -> None:
     """Handle key release events."""
-    try:
-      self.current_keys.remove(key)
-    except KeyError:
-      pass
+    self.held_modifiers &= ~MODIFIER_BITS.get(key, 0)
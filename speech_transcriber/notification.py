@@ -1,9 +1,25 @@
 """Notification functionality for the Speech Transcriber."""
 
 import subprocess
+import uuid
 
 from speech_transcriber.config import NOTIFICATION_ENABLED
 
+try:
+  # Try to import PyObjC for native macOS notifications
+  from UserNotifications import UNMutableNotificationContent
+  from UserNotifications import UNNotificationRequest
+  from UserNotifications import UNUserNotificationCenter
+
+  HAVE_USER_NOTIFICATIONS = True
+except ImportError:
+  HAVE_USER_NOTIFICATIONS = False
+
+UN_AUTHORIZATION_OPTION_ALERT = 1 << 2  # UNAuthorizationOptionAlert
+
+# Notification center, fetched and authorized on first use
+_notification_center = None
+
 
 def show_notification(title: str, message: str) -> None:
   """Show a notification to the user on macOS.
@@ -24,7 +40,63 @@ def show_notification(title: str, message: str) -> None:
 
 def _show_macos_notification(title: str, message: str) -> None:
   """Show a notification on macOS."""
+  global HAVE_USER_NOTIFICATIONS
+
+  if HAVE_USER_NOTIFICATIONS:
+    try:
+      _post_user_notification(title, message)
+      return
+    except Exception:
+      # The notification center is unavailable outside an app bundle; use
+      # osascript from now on rather than failing on every notification
+      HAVE_USER_NOTIFICATIONS = False
+
+  _show_osascript_notification(title, message)
+
+
+def _show_osascript_notification(title: str, message: str) -> None:
+  """Show a notification by running osascript."""
   script = f'''
   osascript -e 'display notification "{message}" with title "{title}"'
   '''
   subprocess.run(script, shell=True)
+
+
+def _post_user_notification(title: str, message: str) -> None:
+  """Post a notification through UNUserNotificationCenter, without a subprocess."""
+  global _notification_center
+
+  if _notification_center is None:
+    center = UNUserNotificationCenter.currentNotificationCenter()
+    center.requestAuthorizationWithOptions_completionHandler_(
+      UN_AUTHORIZATION_OPTION_ALERT, _on_authorization
+    )
+    _notification_center = center
+
+  content = UNMutableNotificationContent.alloc().init()
+  content.setTitle_(title)
+  content.setBody_(message)
+  request = UNNotificationRequest.requestWithIdentifier_content_trigger_(
+    str(uuid.uuid4()), content, None
+  )
+
+  def on_added(error) -> None:
+    # Posting fails asynchronously, e.g. when the user denied permission
+    if error is not None:
+      _disable_user_notifications()
+      _show_osascript_notification(title, message)
+
+  _notification_center.addNotificationRequest_withCompletionHandler_(request, on_added)
+
+
+def _on_authorization(granted: bool, error) -> None:
+  """Use osascript from now on if notifications were not authorized."""
+  if not granted or error is not None:
+    _disable_user_notifications()
+
+
+def _disable_user_notifications() -> None:
+  """Stop posting through UNUserNotificationCenter."""
+  global HAVE_USER_NOTIFICATIONS
+
+  HAVE_USER_NOTIFICATIONS = False
@@ -0,0 +1,128 @@
+"""Single-producer single-consumer byte ring buffer."""
+
+import threading
+from typing import List
+from typing import Optional
+
+
+class SPSCRing:
+  """Fixed-size byte ring shared by one writer thread and one reader thread.
+
+  The producer only advances the head and the consumer only advances the
+  tail, and each is a single integer assignment, so the data path needs no
+  lock under the GIL. An event wakes the consumer when data arrives.
+  """
+
+  def __init__(self, capacity: int):
+    """Initialize the ring buffer.
+
+    Args:
+        capacity: Size of the buffer in bytes. Must be a power of two.
+    """
+    if capacity <= 0 or capacity & (capacity - 1):
+      raise ValueError(f'Ring capacity must be a power of two, got {capacity}')
+
+    self._buffer = bytearray(capacity)
+    self._view = memoryview(self._buffer)
+    self._mask = capacity - 1
+    self._head = 0  # Total bytes ever written; only the producer updates it
+    self._tail = 0  # Total bytes ever read; only the consumer updates it
+    self._closed = False
+    self._data_ready = threading.Event()
+
+  @property
+  def capacity(self) -> int:
+    """Size of the buffer in bytes."""
+    return len(self._buffer)
+
+  @property
+  def closed(self) -> bool:
+    """Whether the producer has finished writing."""
+    return self._closed
+
+  def __len__(self) -> int:
+    """Return the number of bytes available to read."""
+    return self._head - self._tail
+
+  def reset(self) -> None:
+    """Empty the ring and reopen it. Only call while neither side is active."""
+    self._head = 0
+    self._tail = 0
+    self._closed = False
+    self._data_ready.clear()
+
+  def write(self, data: bytes) -> int:
+    """Copy data into the ring (producer side).
+
+    Args:
+        data: Bytes-like object to append.
+
+    Returns:
+        The number of bytes written, which is less than len(data) if the ring
+        did not have room for all of it.
+    """
+    head = self._head
+    count = min(len(data), self.capacity - (head - self._tail))
+    if count <= 0:
+      return 0
+
+    start = head & self._mask
+    first = min(count, self.capacity - start)
+    source = memoryview(data)
+    self._view[start : start + first] = source[:first]
+    if first < count:
+      # Wrap around to the start of the buffer
+      self._view[: count - first] = source[first:count]
+
+    # Publish the data only after it has been copied in
+    self._head = head + count
+    self._data_ready.set()
+    return count
+
+  def peek(self) -> List[memoryview]:
+    """Return views of the readable bytes without consuming them (consumer side).
+
+    Returns:
+        Zero, one or two memoryviews, in order. There are two when the
+        readable region wraps around the end of the buffer.
+    """
+    tail = self._tail
+    count = self._head - tail
+    if count == 0:
+      return []
+
+    start = tail & self._mask
+    first = min(count, self.capacity - start)
+    segments = [self._view[start : start + first]]
+    if first < count:
+      segments.append(self._view[: count - first])
+    return segments
+
+  def consume(self, count: int) -> None:
+    """Mark count bytes returned by peek() as read (consumer side)."""
+    self._tail += count
+
+  def close(self) -> None:
+    """Signal that no more data will be written and wake the consumer."""
+    self._closed = True
+    self._data_ready.set()
+
+  def wait(self, min_bytes: int = 1, timeout: Optional[float] = None) -> bool:
+    """Block until enough data is available or the ring is closed (consumer side).
+
+    Args:
+        min_bytes: Number of readable bytes to wait for.
+        timeout: Maximum number of seconds to wait, or None to wait forever.
+
+    Returns:
+        True if at least min_bytes can be read or the ring is closed. Returns
+        early, possibly False, whenever a write arrives that is still short of
+        min_bytes, so callers should check again and wait in a loop.
+    """
+    self._data_ready.clear()
+    # Re-check after clearing so a write that raced with clear() is not missed
+    if self._head - self._tail >= min_bytes or self._closed:
+      return True
+    if not self._data_ready.wait(timeout):
+      return False
+    return self._head - self._tail >= min_bytes or self._closed
@@ -2,7 +2,6 @@
 
 import os
 import subprocess
-import time
 
 try:
   # Try to import PyObjC for native macOS sound playback
@@ -12,6 +11,9 @@ try:
 except ImportError:
   HAVE_PYOBJC = False
 
+# NSSound objects by path, so each sound file is only read and decoded once
+_sound_cache = {}
+
 
 def play_sound(sound_path: str) -> bool:
   """Play a system sound on macOS.
@@ -23,18 +25,24 @@ def play_sound(sound_path: str) -> bool:
       True if the sound was played successfully, False otherwise.
   """
   try:
+    if HAVE_PYOBJC and sound_path in _sound_cache:
+      ns_sound = _sound_cache[sound_path]
+      # Restart the sound in case it is still playing from the last toggle
+      ns_sound.stop()
+      ns_sound.play()
+      return True
+
     # Check if the sound file exists
     if not os.path.exists(sound_path):
       print(f'Sound file not found: {sound_path}')
       return False
 
     if HAVE_PYOBJC:
-      # Use NSSound for native macOS sound playback
+      # Use NSSound for native macOS sound playback; play() returns immediately
       ns_sound = NSSound.alloc().initWithContentsOfFile_byReference_(sound_path, True)
       if ns_sound:
+        _sound_cache[sound_path] = ns_sound
         ns_sound.play()
-        # Wait for the sound to start playing
-        time.sleep(0.1)
         return True
       return False
     else:
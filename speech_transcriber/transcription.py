@@ -2,17 +2,47 @@
 
 from abc import ABC
 from abc import abstractmethod
-import base64
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+import json
 import os
+import sys
+import threading
+from typing import Iterator
+from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 
-from openai import OpenAI
+import httpx
 
 from speech_transcriber.audio_compression import AudioCompressor
+from speech_transcriber.chunker import merge_transcripts
+from speech_transcriber.chunker import split_wav
+from speech_transcriber.transcription_cache import TranscriptionCache
 from speech_transcriber.transcription_config import TranscriptionConfig
 from speech_transcriber.utils import Logger
+from speech_transcriber.utils import call_with_retries
 from speech_transcriber.utils import report_file_size
+from speech_transcriber.vad import has_speech
+
+# HTTP statuses for failures that may succeed if the request is sent again
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def is_transient_error(error: Exception) -> bool:
+  """Check if an API error is temporary, such as a rate limit or dropped connection."""
+  if isinstance(error, (httpx.TransportError, ConnectionError)):
+    return True
+  # The openai SDK is only imported once an OpenAI transcriber is created, and
+  # its errors cannot occur before then
+  openai = sys.modules.get('openai')
+  if openai is not None and isinstance(error, openai.APIConnectionError):
+    return True
+  # OpenAI errors carry status_code, Google API errors carry code
+  status = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+  return status in RETRYABLE_STATUS_CODES
 
 
 class BaseTranscriber(ABC):
@@ -27,17 +57,76 @@ class BaseTranscriber(ABC):
     self.config = config or TranscriptionConfig.from_env()
 
   @abstractmethod
-  def transcribe(self, audio_file_path: str) -> Optional[str]:
+  def transcribe(
+    self, audio_file_path: str, file_size_bytes: Optional[int] = None
+  ) -> Optional[str]:
     """Transcribe the audio file.
 
     Args:
         audio_file_path: Path to the audio file to transcribe
+        file_size_bytes: Size of the file, if the caller already knows it
 
     Returns:
         The transcribed text, or None if transcription failed
     """
     pass
 
+  @staticmethod
+  def _get_file_size(
+    audio_file_path: str, file_size_bytes: Optional[int]
+  ) -> Optional[int]:
+    """Return the file's size, reading it from disk only if it is not known yet."""
+    if file_size_bytes is not None:
+      return file_size_bytes
+
+    file_info = TranscriptionConfig.get_file_info(audio_file_path)
+    if file_info is None:
+      Logger.error(f'Audio file not found at {audio_file_path}')
+      return None
+    return file_info[0]
+
+  def transcribe_stream(self, audio_file_path: str) -> Iterator[str]:
+    """Transcribe the audio file, yielding text as soon as it is available.
+
+    Services that cannot stream yield the whole transcript at once.
+
+    Args:
+        audio_file_path: Path to the audio file to transcribe
+
+    Yields:
+        Consecutive pieces of the transcribed text
+    """
+    text = self.transcribe(audio_file_path)
+    if text:
+      yield text
+
+  def transcribe_batch(self, audio_file_paths: Sequence[str]) -> List[Optional[str]]:
+    """Transcribe several short audio files with as few requests as possible.
+
+    Services that cannot combine files in one request send them concurrently.
+
+    Args:
+        audio_file_paths: Paths to the audio files to transcribe
+
+    Returns:
+        The transcribed text for each file in the same order, with None for
+        files that could not be transcribed
+    """
+    if not audio_file_paths:
+      return []
+
+    max_workers = min(self.config.max_concurrent, len(audio_file_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+      return list(executor.map(self.transcribe, audio_file_paths))
+
+  def warmup(self) -> None:
+    """Open a connection to the transcription service ahead of the first request.
+
+    Called while the user is still recording so that DNS, TCP and TLS setup
+    are already done by the time the audio is ready to upload.
+    """
+    pass
+
   def cleanup(self) -> None:
     """Clean up resources used by the transcriber.
 
@@ -49,11 +138,31 @@ class BaseTranscriber(ABC):
 class OpenAITranscriber(BaseTranscriber):
   """Transcribes audio files using OpenAI's GPT-4o API."""
 
-  def __init__(self, config: Optional[TranscriptionConfig] = None):
+  # Seconds an idle pooled connection is kept open. The app warms the connection
+  # up again more often than this while recording, so it is still open at upload.
+  KEEPALIVE_EXPIRY = 120.0
+  # Fail fast when the API is unreachable, but allow long uploads to finish
+  CONNECT_TIMEOUT = 5.0
+  REQUEST_TIMEOUT = 600.0
+  # Models that return the transcript only once it is complete
+  NON_STREAMING_MODELS = frozenset({'whisper-1'})
+
+  # Connection pool shared by every OpenAITranscriber in the process, so a new
+  # transcriber reuses connections that are already open
+  _shared_http_client: Optional[httpx.Client] = None
+  _shared_http_client_lock = threading.Lock()
+
+  def __init__(
+    self,
+    config: Optional[TranscriptionConfig] = None,
+    http_client: Optional[httpx.Client] = None,
+  ):
     """Initialize the OpenAI transcriber.
 
     Args:
         config: Configuration object. If None, config will be loaded from environment.
+        http_client: HTTP client to send requests through. If None, the
+            process-wide pooled client from get_shared_http_client() is used.
     """
     super().__init__(config)
 
@@ -62,41 +171,74 @@ class OpenAITranscriber(BaseTranscriber):
       Logger.error('OpenAI API key is not set')
       raise ValueError('OpenAI API key is not set')
 
-    self.client = OpenAI(api_key=self.config.openai_api_key)
+    # Imported here so that Gemini users do not pay for loading the openai SDK
+    from openai import OpenAI
+
+    self.http_client = http_client or self.get_shared_http_client()
+    self.client = OpenAI(
+      api_key=self.config.openai_api_key,
+      http_client=self.http_client,
+      timeout=httpx.Timeout(self.REQUEST_TIMEOUT, connect=self.CONNECT_TIMEOUT),
+      # transcribe() retries itself, since the file must be rewound first
+      max_retries=0,
+    )
+
+  @classmethod
+  def get_shared_http_client(cls) -> httpx.Client:
+    """Return the process-wide HTTP client, creating it on first use."""
+    with cls._shared_http_client_lock:
+      if cls._shared_http_client is None or cls._shared_http_client.is_closed:
+        cls._shared_http_client = cls._create_http_client()
+      return cls._shared_http_client
+
+  @classmethod
+  def _create_http_client(cls) -> httpx.Client:
+    """Create a keep-alive HTTP client, using HTTP/2 when h2 is installed."""
+    return httpx.Client(
+      http2=importlib.util.find_spec('h2') is not None,
+      limits=httpx.Limits(keepalive_expiry=cls.KEEPALIVE_EXPIRY),
+    )
 
-  def transcribe(self, audio_file_path: str) -> Optional[str]:
+  def transcribe(
+    self, audio_file_path: str, file_size_bytes: Optional[int] = None
+  ) -> Optional[str]:
     """Transcribe the audio file using the GPT-4o API.
 
     Args:
         audio_file_path: Path to the audio file to transcribe
+        file_size_bytes: Size of the file, if the caller already knows it
 
     Returns:
         The transcribed text, or None if transcription failed
     """
-    # Check if the file exists
-    file_info = TranscriptionConfig.get_file_info(audio_file_path)
-    if file_info is None:
-      Logger.error(f'Audio file not found at {audio_file_path}')
+    file_size_bytes = self._get_file_size(audio_file_path, file_size_bytes)
+    if file_size_bytes is None:
       return None
-
-    # Get file size and log it
-    file_size_bytes, _, _ = file_info
     report_file_size(file_size_bytes, 'GPT-4o API')
 
     try:
       with open(audio_file_path, 'rb') as audio_file:
-        # Prepare the request parameters
+        # Pass the open file rather than its contents so httpx streams the
+        # multipart body from disk in chunks instead of buffering it all
         params = {
           'model': self.config.openai_model,
-          'file': audio_file,
+          'file': (
+            os.path.basename(audio_file_path),
+            audio_file,
+            TranscriptionConfig.get_mime_type(audio_file_path),
+          ),
         }
 
         # Add language if specified
         if self.config.language:
           params['language'] = self.config.language
 
-        # Make the API request using the client format
-        response = self.client.audio.transcriptions.create(**params)
+        def send_request():
+          # A failed attempt may have read part of the file already
+          audio_file.seek(0)
+          return self.client.audio.transcriptions.create(**params)
+
+        response = call_with_retries(send_request, is_transient_error)
 
         # Extract and return the transcribed text
         return response.text
@@ -105,15 +247,65 @@ class OpenAITranscriber(BaseTranscriber):
       Logger.error('Error during OpenAI transcription', e)
       return None
 
+  def transcribe_stream(self, audio_file_path: str) -> Iterator[str]:
+    """Transcribe the audio file, yielding text deltas as the API produces them.
+
+    Unlike transcribe(), the request is not retried and errors are raised,
+    since part of the transcript may already have been yielded.
+
+    Args:
+        audio_file_path: Path to the audio file to transcribe
+
+    Yields:
+        Consecutive pieces of the transcribed text
+
+    Raises:
+        Exception: If the file cannot be read or the request fails
+    """
+    if self.config.openai_model in self.NON_STREAMING_MODELS:
+      yield from super().transcribe_stream(audio_file_path)
+      return
+
+    with open(audio_file_path, 'rb') as audio_file:
+      params = {
+        'model': self.config.openai_model,
+        'file': (
+          os.path.basename(audio_file_path),
+          audio_file,
+          TranscriptionConfig.get_mime_type(audio_file_path),
+        ),
+        'stream': True,
+      }
+      if self.config.language:
+        params['language'] = self.config.language
+
+      for event in self.client.audio.transcriptions.create(**params):
+        if event.type == 'transcript.text.delta':
+          yield event.delta
+
+  def warmup(self) -> None:
+    """Open a pooled connection to the OpenAI API with a cheap request."""
+    self.client.models.list()
+
   def cleanup(self) -> None:
-    """Clean up resources used by the OpenAI transcriber."""
-    # Nothing special to clean up for OpenAI client
+    """Clean up resources used by the OpenAI transcriber.
+
+    The HTTP client is left open, since it is either the caller's or shared
+    with other transcribers, and its connections are reused by them.
+    """
     pass
 
 
 class GeminiTranscriber(BaseTranscriber):
   """Transcribes audio files using Google's Gemini API."""
 
+  # Files up to this size are sent inline; larger ones go through the Files API,
+  # which uploads the raw bytes instead of a base64 copy a third larger
+  INLINE_LIMIT_BYTES = 4 * 1024 * 1024
+
+  # Lowest temperature for the most literal transcription
+  GENERATION_CONFIG = {'temperature': 0.0, 'top_p': 1.0, 'top_k': 32}
+
   def __init__(self, config: Optional[TranscriptionConfig] = None):
     """Initialize the Gemini transcriber.
 
@@ -143,8 +335,19 @@ class GeminiTranscriber(BaseTranscriber):
       if not self.config.gemini_api_key:
         raise ValueError('GEMINI_API_KEY is not set')
 
-      self.genai.configure(api_key=self.config.gemini_api_key)
+      # Each transcription is a single request, so plain REST over HTTPS avoids
+      # starting gRPC channels and the timeouts seen when they shut down
+      self.genai.configure(api_key=self.config.gemini_api_key, transport='rest')
       self.model = self.config.gemini_model
+      self._generative_model = None  # Created on first use by _get_model()
+
+      # The prompt only depends on the language, so build it once
+      language_part = f' in {self.config.language}' if self.config.language else ''
+      self._prompt = (
+        f'Please transcribe the following audio file accurately{language_part}. '
+        f'Provide only the transcribed text without any explanations or '
+        f'additional commentary.'
+      )
       Logger.info(f'Initialized Gemini transcriber with model: {self.model}')
 
     except ImportError:
@@ -157,68 +360,49 @@ class GeminiTranscriber(BaseTranscriber):
       Logger.error(f'Error initializing Gemini transcriber: {e}')
       raise
 
-  def transcribe(self, audio_file_path: str) -> Optional[str]:
+  def transcribe(
+    self, audio_file_path: str, file_size_bytes: Optional[int] = None
+  ) -> Optional[str]:
     """Transcribe the audio file using the Gemini API.
 
     Args:
         audio_file_path: Path to the audio file to transcribe
+        file_size_bytes: Size of the file, if the caller already knows it
 
     Returns:
         The transcribed text, or None if transcription failed
     """
-    # Check if the file exists
-    file_info = TranscriptionConfig.get_file_info(audio_file_path)
-    if file_info is None:
-      Logger.error(f'Audio file not found at {audio_file_path}')
+    file_size_bytes = self._get_file_size(audio_file_path, file_size_bytes)
+    if file_size_bytes is None:
       return None
-
-    # Get file size and log it
-    file_size_bytes, _, _ = file_info
     report_file_size(file_size_bytes, 'Gemini API')
 
+    uploaded_file = None
     try:
-      # Read the audio file
-      with open(audio_file_path, 'rb') as audio_file:
-        audio_data = audio_file.read()
-
       # Determine the MIME type based on the file extension
       mime_type = TranscriptionConfig.get_mime_type(audio_file_path)
 
-      # Get a generative model
-      model = self.genai.GenerativeModel(self.model)
+      if file_size_bytes > self.INLINE_LIMIT_BYTES:
+        uploaded_file = self.genai.upload_file(
+          path=audio_file_path, mime_type=mime_type
+        )
+        audio_part = uploaded_file
+      else:
+        # For small files a separate upload round trip costs more than base64
+        audio_part = self._inline_audio_part(audio_file_path)
 
-      # Create a clear transcription prompt
-      language_part = f' in {self.config.language}' if self.config.language else ''
-      prompt = (
-        f'Please transcribe the following audio file accurately{language_part}. '
-        f'Provide only the transcribed text without any explanations or '
-        f'additional commentary.'
-      )
+      model = self._get_model()
 
       # Create multimodal content
-      content = [
-        {
-          'parts': [
-            {'text': prompt},
-            {
-              'inline_data': {
-                'mime_type': mime_type,
-                'data': base64.b64encode(audio_data).decode('utf-8'),
-              }
-            },
-          ]
-        }
-      ]
-
-      # Set generation config for better transcription results
-      generation_config = {
-        'temperature': 0.0,  # Use lowest temperature for accurate transcription
-        'top_p': 1.0,
-        'top_k': 32,
-      }
+      content = [{'parts': [{'text': self._prompt}, audio_part]}]
 
       # Generate content with the audio file
-      response = model.generate_content(content, generation_config=generation_config)
+      response = call_with_retries(
+        lambda: model.generate_content(
+          content, generation_config=self.GENERATION_CONFIG
+        ),
+        is_transient_error,
+      )
 
       # Extract the transcription from the response
       if hasattr(response, 'text'):
@@ -230,36 +414,135 @@ class GeminiTranscriber(BaseTranscriber):
     except Exception as e:
       Logger.error('Error during Gemini transcription', e)
       return None
+    finally:
+      if uploaded_file is not None:
+        self._delete_uploaded_file(uploaded_file)
 
-  def cleanup(self) -> None:
-    """Clean up resources used by the Gemini transcriber.
+  def transcribe_batch(self, audio_file_paths: Sequence[str]) -> List[Optional[str]]:
+    """Transcribe several short audio files in a single Gemini request.
+
+    Each file is sent inline after a label, and the model is asked for a JSON
+    array with one transcript per file, saving a round trip per extra file.
+    Falls back to one request per file if the files are too large to send
+    inline together or the response cannot be matched up with them.
 
-    This is important to prevent gRPC shutdown timeout errors.
+    Args:
+        audio_file_paths: Paths to the audio files to transcribe
+
+    Returns:
+        The transcribed text for each file in the same order, with None for
+        files that could not be transcribed
     """
+    file_infos = [TranscriptionConfig.get_file_info(p) for p in audio_file_paths]
+    if (
+      len(audio_file_paths) < 2
+      or None in file_infos
+      or sum(info[0] for info in file_infos) > self.INLINE_LIMIT_BYTES
+    ):
+      return super().transcribe_batch(audio_file_paths)
+
+    language_part = f' in {self.config.language}' if self.config.language else ''
+    parts = [
+      {
+        'text': (
+          f'Transcribe each of the following {len(audio_file_paths)} audio files '
+          f'accurately{language_part}. Respond with a JSON array containing one '
+          f'string per file, in order, holding only the transcribed text.'
+        )
+      }
+    ]
+    for index, path in enumerate(audio_file_paths, start=1):
+      parts.append({'text': f'FILE {index}:'})
+      parts.append(self._inline_audio_part(path))
+
+    try:
+      model = self._get_model()
+      generation_config = {
+        **self.GENERATION_CONFIG,
+        'response_mime_type': 'application/json',
+      }
+      response = call_with_retries(
+        lambda: model.generate_content(
+          [{'parts': parts}], generation_config=generation_config
+        ),
+        is_transient_error,
+      )
+      texts = json.loads(response.text)
+    except Exception as e:
+      Logger.error('Error during Gemini batch transcription', e)
+      return [None] * len(audio_file_paths)
+
+    if not isinstance(texts, list) or len(texts) != len(audio_file_paths):
+      Logger.warn('Gemini batch response did not match the files, retrying singly')
+      return super().transcribe_batch(audio_file_paths)
+    return [str(text).strip() for text in texts]
+
+  @staticmethod
+  def _inline_audio_part(audio_file_path: str) -> dict:
+    """Return a content part carrying the audio file as inline data."""
+    with open(audio_file_path, 'rb') as audio_file:
+      audio_data = audio_file.read()
+
+    # The bytes are already in memory, so identify the format from them rather
+    # than trusting the file extension
+    mime_type = TranscriptionConfig.detect_mime_type(audio_data[:12])
+    if mime_type is None:
+      mime_type = TranscriptionConfig.get_mime_type(audio_file_path)
+
+    return {
+      'inline_data': {
+        'mime_type': mime_type,
+        # Pass the raw bytes: the SDK base64-encodes them once for the request
+        # body, while a base64 string would be decoded back to bytes first
+        'data': audio_data,
+      }
+    }
+
+  def _get_model(self):
+    """Return the generative model, creating it on first use and reusing it after."""
+    if self._generative_model is None:
+      self._generative_model = self.genai.GenerativeModel(self.model)
+    return self._generative_model
+
+  def _delete_uploaded_file(self, uploaded_file) -> None:
+    """Delete an audio file from the Files API once it has been transcribed."""
     try:
-      # Clean up any active gRPC channels in the genai library
-      if hasattr(self, 'genai'):
-        Logger.info('Cleaning up Gemini gRPC resources')
-
-        # Minimal cleanup approach that should avoid dependency issues
-        # Reset the configuration only - this should help release resources
-        if hasattr(self.genai, 'configure'):
-          try:
-            # Set API key to None to help release resources
-            self.genai.configure(api_key=None)
-          except Exception as e:
-            Logger.error(f'Error resetting Gemini configuration: {e}')
+      self.genai.delete_file(uploaded_file.name)
     except Exception as e:
-      Logger.error(f'Error during Gemini cleanup: {e}')
+      Logger.warn(f'Could not delete uploaded audio file {uploaded_file.name}: {e}')
+
+  def warmup(self) -> None:
+    """Build the model and open the API channel with a cheap metadata request."""
+    self._get_model()
+    self.genai.get_model(f'models/{self.model}')
+
+  def cleanup(self) -> None:
+    """Clean up resources used by the Gemini transcriber.
+
+    The client talks REST over plain HTTPS, so there are no gRPC channels to
+    shut down. Only the cached model is released.
+    """
+    self._generative_model = None
 
 
 class Transcriber:
   """Factory class that provides transcription services with appropriate handling."""
 
+  # Largest upload each service accepts, in MB, with a little headroom
+  SIZE_LIMITS_MB = {'gemini': 19, 'openai': 24}
+  # With compress_uploads, WAV files larger than this are compressed even when
+  # they are within the service's limit, since upload time dominates latency
+  COMPRESS_UPLOADS_ABOVE_MB = 1.0
+  # WAV files still over the service's limit after compression, e.g. because
+  # ffmpeg is missing, are split into chunks of this size and sent in parallel
+  CHUNK_SIZE_MB = 18
+
   def __init__(
     self,
     config: Optional[TranscriptionConfig] = None,
     service: Optional[str] = None,
+    http_client: Optional[httpx.Client] = None,
+    cache: Optional[TranscriptionCache] = None,
   ):
     """Initialize the transcriber with the appropriate service.
 
@@ -267,8 +550,14 @@ class Transcriber:
         config: Configuration object. If None, config will be loaded from environment.
         service: Transcription service to use. Overrides
             config.transcription_service if provided.
+        http_client: Shared HTTP client for services that accept one.
+        cache: Cache of earlier transcripts. If None, a new in-memory cache is used.
     """
     self.config = config or TranscriptionConfig.from_env()
+    self.http_client = http_client
+    self.cache = cache if cache is not None else TranscriptionCache()
+    self._executor: Optional[ThreadPoolExecutor] = None  # For transcribe_async()
+    self._compressor: Optional[AudioCompressor] = None  # Created when first needed
     self._override_service(service)
     self.transcriber = self._create_transcriber()
 
@@ -284,20 +573,24 @@ class Transcriber:
       return GeminiTranscriber(self.config)
     elif self.config.transcription_service == 'openai' and self.config.openai_api_key:
       Logger.info('Using OpenAI GPT-4o API for transcription')
-      return OpenAITranscriber(self.config)
+      return OpenAITranscriber(self.config, http_client=self.http_client)
     else:
       # Default to OpenAI if no valid configuration is found
       Logger.warn(
         f"Invalid transcription service '{self.config.transcription_service}' "
         'or missing API key. Defaulting to OpenAI.'
       )
-      return OpenAITranscriber(self.config)
+      return OpenAITranscriber(self.config, http_client=self.http_client)
 
-  def transcribe(self, audio_file_path: str) -> Optional[str]:
+  def transcribe(
+    self, audio_file_path: str, duration: Optional[float] = None
+  ) -> Optional[str]:
     """Transcribe the audio file using the selected transcription service.
 
     Args:
         audio_file_path: Path to the audio file to transcribe
+        duration: Length of the recording in seconds, if known. Used to pick
+            a bitrate if the file has to be compressed.
 
     Returns:
         The transcribed text, or None if transcription failed
@@ -307,14 +600,30 @@ class Transcriber:
     if not file_info:
       return None
 
+    # Return the earlier transcript if this exact audio has been sent before
+    cache_key, cached_text = self._check_cache(audio_file_path)
+    if cached_text is not None:
+      return cached_text
+
+    # Nothing to transcribe, so save the request and its cost
+    if self._is_silent(audio_file_path):
+      return ''
+
     # Check if compression is needed
-    audio_path = self._handle_file_size(audio_file_path, file_info)
+    audio_path = self._handle_file_size(audio_file_path, file_info, duration)
     if not audio_path:
       return None
 
     # Perform transcription
     try:
-      return self.transcriber.transcribe(audio_path)
+      file_size_bytes = self._get_upload_size(audio_file_path, audio_path, file_info)
+      if self._needs_chunking(audio_path, file_size_bytes):
+        text = self._transcribe_in_chunks(audio_path)
+      else:
+        text = self.transcriber.transcribe(audio_path, file_size_bytes)
+      if text and cache_key is not None:
+        self.cache.put(cache_key, text)
+      return text
     except Exception as e:
       Logger.error(
         f'Error transcribing audio with {self.config.transcription_service}: {e}'
@@ -325,6 +634,210 @@ class Transcriber:
       if audio_path != audio_file_path:
         self._cleanup_temp_file(audio_path)
 
+  async def transcribe_async(
+    self, audio_file_path: str, duration: Optional[float] = None
+  ) -> Optional[str]:
+    """Transcribe the audio file without blocking the running event loop.
+
+    Requests run on a thread pool kept for the life of the transcriber, so
+    repeated calls reuse its threads instead of starting new ones.
+
+    Args:
+        audio_file_path: Path to the audio file to transcribe
+        duration: Length of the recording in seconds, if known. Used to pick
+            a bitrate if the file has to be compressed.
+
+    Returns:
+        The transcribed text, or None if transcription failed
+    """
+    if self._executor is None:
+      self._executor = ThreadPoolExecutor(
+        max_workers=self.config.max_concurrent, thread_name_prefix='transcribe'
+      )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+      self._executor, self.transcribe, audio_file_path, duration
+    )
+
+  def transcribe_stream(
+    self, audio_file_path: str, duration: Optional[float] = None
+  ) -> Iterator[str]:
+    """Transcribe the audio file, yielding text as the service produces it.
+
+    Lets callers show the start of a long transcript before the rest is
+    ready. Like transcribe(), a cached transcript is yielded whole and a
+    recording without speech yields nothing. Failures are logged and end the
+    iteration early, and only a transcript streamed in full is cached.
+
+    Args:
+        audio_file_path: Path to the audio file to transcribe
+        duration: Length of the recording in seconds, if known. Used to pick
+            a bitrate if the file has to be compressed.
+
+    Yields:
+        Consecutive pieces of the transcribed text
+    """
+    file_info = self._validate_file(audio_file_path)
+    if not file_info:
+      return
+
+    cache_key, cached_text = self._check_cache(audio_file_path)
+    if cached_text is not None:
+      yield cached_text
+      return
+
+    if self._is_silent(audio_file_path):
+      return
+
+    audio_path = self._handle_file_size(audio_file_path, file_info, duration)
+    if not audio_path:
+      return
+
+    try:
+      file_size_bytes = self._get_upload_size(audio_file_path, audio_path, file_info)
+      if self._needs_chunking(audio_path, file_size_bytes):
+        text = self._transcribe_in_chunks(audio_path)
+        if text:
+          yield text
+      else:
+        pieces = []
+        for piece in self.transcriber.transcribe_stream(audio_path):
+          pieces.append(piece)
+          yield piece
+        text = ''.join(pieces)
+      if text and cache_key is not None:
+        self.cache.put(cache_key, text)
+    except Exception as e:
+      Logger.error(
+        f'Error transcribing audio with {self.config.transcription_service}: {e}'
+      )
+    finally:
+      if audio_path != audio_file_path:
+        self._cleanup_temp_file(audio_path)
+
+  def transcribe_batch(self, audio_file_paths: Sequence[str]) -> List[Optional[str]]:
+    """Transcribe several short audio files, combining requests where supported.
+
+    Unlike transcribe_many(), the files are sent as they are, without
+    compression or caching, so this suits short clips such as voice notes.
+
+    Args:
+        audio_file_paths: Paths to the audio files to transcribe
+
+    Returns:
+        The transcribed text for each file in the same order, with None for
+        files that could not be transcribed
+    """
+    try:
+      return self.transcriber.transcribe_batch(audio_file_paths)
+    except Exception as e:
+      Logger.error(
+        f'Error transcribing audio with {self.config.transcription_service}: {e}'
+      )
+      return [None] * len(audio_file_paths)
+
+  def transcribe_many(
+    self, audio_file_paths: Sequence[str], max_concurrent: Optional[int] = None
+  ) -> List[Optional[str]]:
+    """Transcribe several audio files concurrently.
+
+    Each request spends almost all of its time waiting on the network, so
+    sending them in parallel finishes in roughly the time of the slowest one.
+
+    Args:
+        audio_file_paths: Paths to the audio files to transcribe
+        max_concurrent: Maximum number of requests in flight at once. Defaults
+            to config.max_concurrent.
+
+    Returns:
+        The transcribed text for each file in the same order, with None for
+        files that could not be transcribed
+    """
+    if not audio_file_paths:
+      return []
+
+    max_concurrent = max_concurrent or self.config.max_concurrent
+    max_workers = min(max_concurrent, len(audio_file_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+      return list(executor.map(self.transcribe, audio_file_paths))
+
+  @staticmethod
+  def _get_upload_size(audio_file_path: str, audio_path: str, file_info: Tuple) -> int:
+    """Return the size of the file to upload, reusing file_info if it is unchanged."""
+    if audio_path == audio_file_path:
+      return file_info[0]
+    return os.path.getsize(audio_path)
+
+  def _needs_chunking(self, audio_path: str, file_size_bytes: int) -> bool:
+    """Check if the file is a WAV file too large to send in one request."""
+    if not audio_path.lower().endswith('.wav'):
+      return False
+    return self._exceeds_size_limit(file_size_bytes / (1024 * 1024))
+
+  def _transcribe_in_chunks(self, audio_path: str) -> Optional[str]:
+    """Transcribe a long WAV file as overlapping chunks sent concurrently."""
+    chunk_paths = split_wav(audio_path, int(self.CHUNK_SIZE_MB * 1024 * 1024))
+    Logger.info(f'Transcribing audio file in {len(chunk_paths)} chunks')
+
+    try:
+      max_workers = min(self.config.max_concurrent, len(chunk_paths))
+      with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        texts = list(executor.map(self.transcriber.transcribe, chunk_paths))
+    finally:
+      for chunk_path in chunk_paths:
+        self._cleanup_temp_file(chunk_path)
+
+    if any(text is None for text in texts):
+      Logger.error('Transcription of one or more chunks failed')
+      return None
+    return merge_transcripts(texts)
+
+  def warmup(self) -> None:
+    """Warm up the connection to the selected transcription service.
+
+    Failures are logged and otherwise ignored, since warming up is only an
+    optimization and the real request will surface any actual problem.
+    """
+    try:
+      self.transcriber.warmup()
+    except Exception as e:
+      Logger.warn(f'Could not warm up {self.config.transcription_service}: {e}')
+
+  def _check_cache(self, audio_file_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return the cache key for the file and its cached transcript, if any.
+
+    Hashing reads the whole file, so both are None unless the cache is enabled.
+    """
+    if not self.config.cache_transcripts:
+      return None, None
+
+    cache_key = self._get_cache_key(audio_file_path)
+    cached_text = self.cache.get(cache_key) if cache_key is not None else None
+    if cached_text is not None:
+      Logger.info('Using cached transcription')
+    return cache_key, cached_text
+
+  def _is_silent(self, audio_file_path: str) -> bool:
+    """Check whether skip_silence applies because the recording has no speech."""
+    if self.config.skip_silence and not has_speech(audio_file_path):
+      Logger.info('No speech detected in the recording, skipping transcription')
+      return True
+    return False
+
+  def _get_cache_key(self, audio_file_path: str) -> Optional[str]:
+    """Return the cache key for the audio file, or None if it cannot be hashed."""
+    service = self.config.transcription_service
+    model = (
+      self.config.gemini_model if service == 'gemini' else self.config.openai_model
+    )
+    try:
+      return TranscriptionCache.make_key(
+        audio_file_path, service, model, self.config.language or ''
+      )
+    except OSError as e:
+      Logger.warn(f'Could not hash audio file for the transcription cache: {e}')
+      return None
+
   def _validate_file(self, file_path: str) -> Optional[Tuple]:
     """Validate that the file exists and return its info."""
     file_info = TranscriptionConfig.get_file_info(file_path)
@@ -333,41 +846,80 @@ class Transcriber:
       return None
     return file_info
 
-  def _handle_file_size(self, audio_file_path: str, file_info: Tuple) -> Optional[str]:
+  def _handle_file_size(
+    self, audio_file_path: str, file_info: Tuple, duration: Optional[float] = None
+  ) -> Optional[str]:
     """Compress the file if it exceeds size limits."""
     file_size_bytes, _, _ = file_info
     file_size_mb = file_size_bytes / (1024 * 1024)
 
     # Check size limits based on service
     if self._exceeds_size_limit(file_size_mb):
-      return self._compress_audio_file(audio_file_path, file_size_mb)
+      Logger.info(
+        f'Audio file size ({file_size_mb:.2f} MB) exceeds API limit. Compressing...'
+      )
+      return self._compress_audio_file(audio_file_path, file_size_mb, duration)
+
+    # Shrink uncompressed recordings to cut upload time. This is optional, so
+    # without ffmpeg the file is sent as it is rather than reported as an error.
+    if (
+      self.config.compress_uploads
+      and file_size_mb > self.COMPRESS_UPLOADS_ABOVE_MB
+      and audio_file_path.lower().endswith('.wav')
+      and self._get_compressor().ffmpeg_available
+    ):
+      Logger.info(f'Compressing audio file ({file_size_mb:.2f} MB) for upload...')
+      return self._compress_audio_file(
+        audio_file_path,
+        file_size_mb,
+        duration,
+        skip_below_mb=self.COMPRESS_UPLOADS_ABOVE_MB,
+      )
 
     return audio_file_path
 
   def _exceeds_size_limit(self, file_size_mb: float) -> bool:
     """Check if the file size exceeds the service limit."""
-    if self.config.transcription_service == 'gemini' and file_size_mb > 19:
-      return True
-    if self.config.transcription_service == 'openai' and file_size_mb > 24:
-      return True
-    return False
+    limit_mb = self.SIZE_LIMITS_MB.get(self.config.transcription_service)
+    return limit_mb is not None and file_size_mb > limit_mb
+
+  def _get_compressor(self) -> AudioCompressor:
+    """Return the compressor, creating it on first use.
+
+    One compressor is reused so ffmpeg is only looked up, and reported missing,
+    once.
+    """
+    if self._compressor is None:
+      self._compressor = AudioCompressor()
+    return self._compressor
 
   def _compress_audio_file(
-    self, audio_file_path: str, file_size_mb: float
+    self,
+    audio_file_path: str,
+    file_size_mb: float,
+    duration: Optional[float] = None,
+    skip_below_mb: Optional[float] = None,
   ) -> Optional[str]:
     """Compress the audio file to meet size requirements."""
-    max_size = 19 if self.config.transcription_service == 'gemini' else 24
-    Logger.info(
-      f'Audio file size ({file_size_mb:.2f} MB) exceeds API limit. Compressing...'
+    # Unknown services fall back to OpenAI, as in _create_transcriber()
+    max_size = self.SIZE_LIMITS_MB.get(
+      self.config.transcription_service, self.SIZE_LIMITS_MB['openai']
     )
 
     try:
-      compressor = AudioCompressor()
-      compressed_file = compressor.compress_audio(audio_file_path, max_size_mb=max_size)
+      compressed_file = self._get_compressor().compress_audio(
+        audio_file_path,
+        max_size_mb=max_size,
+        duration=duration,
+        skip_below_mb=skip_below_mb,
+      )
 
-      if compressed_file and os.path.exists(compressed_file):
-        compressed_size = os.path.getsize(compressed_file) / (1024 * 1024)
-        Logger.info(f'Using compressed audio file: {compressed_size:.2f} MB')
+      # One stat both confirms the output exists and reads its size
+      compressed_info = compressed_file and TranscriptionConfig.get_file_info(
+        compressed_file
+      )
+      if compressed_info:
+        Logger.info(f'Using compressed audio file: {compressed_info[2]:.2f} MB')
         return compressed_file
       else:
         Logger.error('Compression failed, using original file')
@@ -378,13 +930,17 @@ class Transcriber:
 
   def _cleanup_temp_file(self, file_path: str) -> None:
     """Clean up a temporary file."""
-    if os.path.exists(file_path):
-      try:
-        os.unlink(file_path)
-      except Exception as e:
-        Logger.error(f'Error removing temporary compressed file: {e}')
+    try:
+      os.unlink(file_path)
+    except FileNotFoundError:
+      pass
+    except Exception as e:
+      Logger.error(f'Error removing temporary compressed file: {e}')
 
   def cleanup(self) -> None:
     """Clean up resources used by the transcriber."""
+    if self._executor is not None:
+      self._executor.shutdown(wait=False, cancel_futures=True)
+      self._executor = None
     if hasattr(self, 'transcriber'):
       self.transcriber.cleanup()
@@ -0,0 +1,68 @@
+"""Cache of transcription results keyed by audio content."""
+
+import collections
+import hashlib
+import mmap
+import threading
+from typing import Optional
+
+
+class TranscriptionCache:
+  """Least-recently-used cache of transcripts for audio already transcribed.
+
+  Entries are keyed by a hash of the audio bytes together with the settings
+  that affect the result, so re-submitting the same audio returns the earlier
+  transcript without another API request.
+  """
+
+  def __init__(self, max_entries: int = 64):
+    """Initialize the cache.
+
+    Args:
+        max_entries: Number of transcripts to keep before evicting the least
+            recently used one.
+    """
+    self._max_entries = max_entries
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  @staticmethod
+  def make_key(audio_file_path: str, *settings: str) -> str:
+    """Build the cache key for an audio file.
+
+    Args:
+        audio_file_path: Path to the audio file
+        *settings: Values that change the transcript, e.g. service and model
+
+    Returns:
+        The key to look the transcript up by
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    digest = hashlib.sha256()
+    with open(audio_file_path, 'rb') as audio_file:
+      # Hash straight from a read-only mapping instead of copying the file
+      try:
+        with mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ) as audio_map:
+          digest.update(audio_map)
+      except ValueError:
+        pass  # mmap cannot map an empty file, whose digest needs no update
+
+    return ':'.join((digest.hexdigest(), *settings))
+
+  def get(self, key: str) -> Optional[str]:
+    """Return the transcript stored under key, or None if there is none."""
+    with self._lock:
+      text = self._entries.get(key)
+      if text is not None:
+        self._entries.move_to_end(key)
+      return text
+
+  def put(self, key: str, text: str) -> None:
+    """Store a transcript under key, evicting the oldest entry if full."""
+    with self._lock:
+      self._entries[key] = text
+      self._entries.move_to_end(key)
+      if len(self._entries) > self._max_entries:
+        self._entries.popitem(last=False)
@@ -1,8 +1,31 @@
 """Configuration data structures for transcription services."""
 
 from dataclasses import dataclass
+import os
 from typing import Optional
 
+# MIME types of the audio formats the services accept, by file extension
+MIME_TYPES = {
+  '.wav': 'audio/wav',
+  '.mp3': 'audio/mp3',
+  '.aac': 'audio/aac',
+  '.ogg': 'audio/ogg',
+  '.flac': 'audio/flac',
+  '.aiff': 'audio/aiff',
+}
+
+# Leading bytes of each audio format, checked in order, with their MIME types
+MAGIC_MIME_TYPES = (
+  (b'OggS', 'audio/ogg'),
+  (b'fLaC', 'audio/flac'),
+  (b'ID3', 'audio/mp3'),
+  (b'\xff\xfb', 'audio/mp3'),
+  (b'\xff\xf3', 'audio/mp3'),
+  (b'\xff\xf2', 'audio/mp3'),
+  (b'\xff\xf1', 'audio/aac'),
+  (b'\xff\xf9', 'audio/aac'),
+)
+
 
 @dataclass
 class TranscriptionConfig:
@@ -27,6 +50,12 @@ class TranscriptionConfig:
   gemini_model: str
   language: str
 
+  # Upload configuration
+  compress_uploads: bool = True
+  max_concurrent: int = 5
+  skip_silence: bool = True
+  cache_transcripts: bool = False
+
   # Utility for getting file info
   @staticmethod
   def get_file_info(file_path: str) -> Optional[tuple[int, float, float]]:
@@ -39,12 +68,12 @@ class TranscriptionConfig:
         Tuple of (file_size_bytes, file_size_kb, file_size_mb) or None if
             file doesn't exist
     """
-    import os
-
-    if not os.path.exists(file_path):
+    # A single stat both checks that the file exists and reads its size
+    try:
+      file_size_bytes = os.stat(file_path).st_size
+    except OSError:
       return None
 
-    file_size_bytes = os.path.getsize(file_path)
     file_size_kb = file_size_bytes / 1024
     file_size_mb = file_size_kb / 1024
 
@@ -58,25 +87,30 @@ class TranscriptionConfig:
         audio_file_path: Path to the audio file
 
     Returns:
-        MIME type string
+        MIME type string, defaulting to WAV for unknown extensions
+    """
+    extension = os.path.splitext(audio_file_path)[1].lower()
+    return MIME_TYPES.get(extension, 'audio/wav')
+
+  @staticmethod
+  def detect_mime_type(head: bytes) -> Optional[str]:
+    """Determine the MIME type from the first bytes of an audio file.
+
+    Args:
+        head: At least the first 12 bytes of the file
+
+    Returns:
+        MIME type string, or None if the format is not recognized
     """
-    # Default to WAV
-    mime_type = 'audio/wav'
-
-    # Check file extension
-    path_lower = audio_file_path.lower()
-    if path_lower.endswith('.mp3'):
-      mime_type = 'audio/mp3'
-    elif path_lower.endswith('.aac'):
-      mime_type = 'audio/aac'
-    elif path_lower.endswith('.ogg'):
-      mime_type = 'audio/ogg'
-    elif path_lower.endswith('.flac'):
-      mime_type = 'audio/flac'
-    elif path_lower.endswith('.aiff'):
-      mime_type = 'audio/aiff'
-
-    return mime_type
+    # RIFF and IFF containers name their format after the chunk size
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+      return 'audio/wav'
+    if head[:4] == b'FORM' and head[8:12] in (b'AIFF', b'AIFC'):
+      return 'audio/aiff'
+    for magic, mime_type in MAGIC_MIME_TYPES:
+      if head.startswith(magic):
+        return mime_type
+    return None
 
   @classmethod
   def from_env(cls):
@@ -85,16 +119,20 @@ class TranscriptionConfig:
     Returns:
         TranscriptionConfig instance
     """
+    from speech_transcriber.config import CACHE_TRANSCRIPTS
     from speech_transcriber.config import CHANNELS
     from speech_transcriber.config import CHUNK_SIZE
+    from speech_transcriber.config import COMPRESS_UPLOADS
     from speech_transcriber.config import FORMAT
     from speech_transcriber.config import GEMINI_API_KEY
     from speech_transcriber.config import GEMINI_MODEL
     from speech_transcriber.config import LANGUAGE
+    from speech_transcriber.config import MAX_CONCURRENT_TRANSCRIPTIONS
     from speech_transcriber.config import MAX_RECORDING_TIME
     from speech_transcriber.config import OPENAI_API_KEY
     from speech_transcriber.config import OPENAI_MODEL
     from speech_transcriber.config import SAMPLE_RATE
+    from speech_transcriber.config import SKIP_SILENCE
     from speech_transcriber.config import TRANSCRIPTION_SERVICE
 
     return cls(
@@ -109,4 +147,8 @@ class TranscriptionConfig:
       openai_model=OPENAI_MODEL,
       gemini_model=GEMINI_MODEL,
       language=LANGUAGE,
+      compress_uploads=COMPRESS_UPLOADS,
+      max_concurrent=MAX_CONCURRENT_TRANSCRIPTIONS,
+      skip_silence=SKIP_SILENCE,
+      cache_transcripts=CACHE_TRANSCRIPTS,
     )
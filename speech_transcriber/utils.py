@@ -1,7 +1,13 @@
 """Utility functions for the speech transcriber application."""
 
 import logging
+import random
+import time
+from typing import Callable
 from typing import Optional
+from typing import TypeVar
+
+T = TypeVar('T')
 
 # Configure the basic logger
 logging.basicConfig(
@@ -14,6 +20,10 @@ logging.basicConfig(
 logging.getLogger('openai').setLevel(logging.WARNING)
 logging.getLogger('google.generativeai').setLevel(logging.WARNING)
 
+# Log through the root logger directly rather than the logging.info() helpers,
+# which look the root logger up and check its handlers on every call
+_root_logger = logging.getLogger()
+
 
 class Logger:
   """Simple logger to wrap print statements and make them configurable."""
@@ -29,7 +39,7 @@ class Logger:
         message: The message to log
     """
     if cls.enabled:
-      logging.info(message)
+      _root_logger.info(message)
 
   @classmethod
   def error(cls, message: str, exc: Optional[Exception] = None) -> None:
@@ -41,9 +51,9 @@ class Logger:
     """
     if cls.enabled:
       if exc:
-        logging.error(f'{message}: {exc}')
+        _root_logger.error(f'{message}: {exc}')
       else:
-        logging.error(message)
+        _root_logger.error(message)
 
   @classmethod
   def warn(cls, message: str) -> None:
@@ -53,7 +63,7 @@ class Logger:
         message: The warning message to log
     """
     if cls.enabled:
-      logging.warning(message)
+      _root_logger.warning(message)
 
   @classmethod
   def set_enabled(cls, enabled: bool) -> None:
@@ -80,3 +90,40 @@ def report_file_size(file_size_bytes: int, service_name: str) -> None:
     Logger.info(f'Uploading audio file ({file_size_mb:.2f} MB) to {service_name}...')
   else:
     Logger.info(f'Uploading audio file ({file_size_kb:.2f} KB) to {service_name}...')
+
+
+def call_with_retries(
+  func: Callable[[], T],
+  is_transient: Callable[[Exception], bool],
+  attempts: int = 4,
+  initial_delay: float = 0.5,
+  max_delay: float = 8.0,
+) -> T:
+  """Call func, retrying transient failures with exponential backoff and jitter.
+
+  Args:
+      func: Function to call with no arguments
+      is_transient: Returns whether an exception raised by func is worth retrying
+      attempts: Maximum number of calls, including the first
+      initial_delay: Seconds to wait before the first retry
+      max_delay: Longest wait between retries, in seconds
+
+  Returns:
+      The result of the first successful call
+
+  Raises:
+      Exception: The error from the last call, or the first error that is not
+          transient
+  """
+  for attempt in range(attempts):
+    try:
+      return func()
+    except Exception as e:
+      if attempt == attempts - 1 or not is_transient(e):
+        raise
+      # Jitter keeps clients that failed together from retrying in lockstep
+      delay = min(max_delay, initial_delay * 2**attempt) + random.uniform(
+        0, initial_delay
+      )
+      Logger.warn(f'Transient error ({e}), retrying in {delay:.1f}s')
+      time.sleep(delay)
@@ -0,0 +1,121 @@
+"""Voice activity detection for trimming silence from recordings."""
+
+import collections
+import wave
+
+try:
+  # webrtcvad is optional; without it recordings are kept untrimmed
+  import webrtcvad
+
+  HAVE_WEBRTCVAD = True
+except ImportError:
+  HAVE_WEBRTCVAD = False
+
+
+class SilenceTrimmer:
+  """Drops long stretches of silence from a stream of 16-bit mono PCM.
+
+  Audio is classified in 20 ms frames. Speech frames are kept along with a
+  short lead-in before them and a hangover after them, so word onsets and
+  trailing syllables survive while pauses longer than the hangover are cut.
+  """
+
+  SUPPORTED_RATES = (8000, 16000, 32000, 48000)  # Sample rates webrtcvad accepts
+  FRAME_MS = 20  # webrtcvad accepts 10, 20 or 30 ms frames
+  LEAD_IN_MS = 300  # Silence kept before speech resumes
+  HANGOVER_MS = 500  # Silence kept after speech stops
+
+  def __init__(self, sample_rate: int, sample_width: int = 2, aggressiveness: int = 2):
+    """Initialize the trimmer.
+
+    Args:
+        sample_rate: Sample rate of the audio in Hz (8000, 16000, 32000 or 48000).
+        sample_width: Bytes per sample.
+        aggressiveness: webrtcvad aggressiveness from 0 (least) to 3 (most).
+    """
+    self._vad = webrtcvad.Vad(aggressiveness)
+    self._sample_rate = sample_rate
+    self._frame_bytes = sample_rate * self.FRAME_MS // 1000 * sample_width
+    self._hangover_frames = self.HANGOVER_MS // self.FRAME_MS
+    self._lead_in = collections.deque(maxlen=self.LEAD_IN_MS // self.FRAME_MS)
+    self._pending = bytearray()  # Trailing partial frame from the last chunk
+    # Start as if the hangover has expired so leading silence is dropped
+    self._silent_frames = self._hangover_frames
+    self.voiced_bytes = 0  # Bytes classified as speech so far
+
+  def process(self, data: bytes) -> bytes:
+    """Classify a chunk of audio and return the part of it to keep.
+
+    Args:
+        data: Raw PCM bytes of any length.
+
+    Returns:
+        The bytes to write, which may include buffered lead-in from earlier chunks.
+    """
+    self._pending += data
+    usable = len(self._pending) - len(self._pending) % self._frame_bytes
+    kept = bytearray()
+
+    for offset in range(0, usable, self._frame_bytes):
+      frame = bytes(self._pending[offset : offset + self._frame_bytes])
+
+      if self._vad.is_speech(frame, self._sample_rate):
+        kept += b''.join(self._lead_in)
+        self._lead_in.clear()
+        kept += frame
+        self._silent_frames = 0
+        self.voiced_bytes += self._frame_bytes
+      elif self._silent_frames < self._hangover_frames:
+        kept += frame
+        self._silent_frames += 1
+      else:
+        self._lead_in.append(frame)
+
+    del self._pending[:usable]
+    return bytes(kept)
+
+
+# Voiced audio a recording needs before it is treated as containing speech
+MIN_SPEECH_MS = 200
+
+
+def has_speech(audio_file_path: str, aggressiveness: int = 2) -> bool:
+  """Check whether a WAV recording contains any speech.
+
+  Reading stops as soon as enough voiced frames are found, so a recording
+  that starts with speech is decided after a fraction of a second of audio.
+
+  Args:
+      audio_file_path: Path to the WAV file to check
+      aggressiveness: webrtcvad aggressiveness from 0 (least) to 3 (most).
+
+  Returns:
+      False only if the file is 16-bit mono PCM at a rate webrtcvad supports
+      and no speech was found in it. Files that cannot be checked count as
+      speech, so they are still transcribed.
+  """
+  if not HAVE_WEBRTCVAD:
+    return True
+
+  try:
+    with wave.open(audio_file_path, 'rb') as wav:
+      sample_rate = wav.getframerate()
+      if (
+        wav.getnchannels() != 1
+        or wav.getsampwidth() != 2
+        or sample_rate not in SilenceTrimmer.SUPPORTED_RATES
+      ):
+        return True
+
+      vad = webrtcvad.Vad(aggressiveness)
+      frame_samples = sample_rate * SilenceTrimmer.FRAME_MS // 1000
+      frames_needed = MIN_SPEECH_MS // SilenceTrimmer.FRAME_MS
+      while frames_needed > 0:
+        frame = wav.readframes(frame_samples)
+        if len(frame) < frame_samples * 2:
+          return False
+        if vad.is_speech(frame, sample_rate):
+          frames_needed -= 1
+      return True
+  except (OSError, EOFError, wave.Error):
+    return True
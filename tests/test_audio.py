@@ -1,19 +1,22 @@
 """Tests for the audio recorder module."""
 
+import math
 import os
 import tempfile
 import unittest
 from unittest.mock import MagicMock
-from unittest.mock import call
 from unittest.mock import patch
+import wave
 
 import pyaudio
 
 from speech_transcriber.audio import AudioRecorder
 from speech_transcriber.config import CHANNELS
 from speech_transcriber.config import CHUNK_SIZE
+from speech_transcriber.config import FRAMES_PER_BUFFER
 from speech_transcriber.config import MAX_RECORDING_TIME
 from speech_transcriber.config import SAMPLE_RATE
+from speech_transcriber.ringbuffer import SPSCRing
 
 
 class TestAudioRecorder(unittest.TestCase):
@@ -23,13 +26,39 @@ class TestAudioRecorder(unittest.TestCase):
     """Set up test fixtures."""
     # Create a mock PyAudio instance
     self.mock_pyaudio = MagicMock()
+    self.mock_pyaudio.get_sample_size.return_value = 2  # 2 bytes for paInt16
+    self.mock_pyaudio.get_default_input_device_info.return_value = {'index': 1}
+
+    # Mock the PyAudio device enumeration
+    mock_info = MagicMock()
+    mock_info.get.return_value = 2  # Return 2 devices
+    self.mock_pyaudio.get_host_api_info_by_index.return_value = mock_info
+
+    # Create a mock device info that returns proper values for maxInputChannels
+    mock_device_info = MagicMock()
+    mock_device_info.get.return_value = 2  # 2 input channels
+    self.mock_pyaudio.get_device_info_by_host_api_device_index.return_value = (
+      mock_device_info
+    )
+
+    # Create a mock audio stream that the recorder pre-opens
+    self.mock_stream = MagicMock()
+    self.mock_stream.is_stopped.return_value = True
+    self.mock_pyaudio.open.return_value = self.mock_stream
 
     # Patch PyAudio to return our mock
     with patch('pyaudio.PyAudio', return_value=self.mock_pyaudio):
       self.recorder = AudioRecorder()
 
+    # Directory for WAV files the recorder writes to disk
+    self.temp_dir = tempfile.TemporaryDirectory()
+
   def tearDown(self):
     """Clean up after tests."""
+    self.recorder._stop_writer_thread()
+    self.recorder._close_wave_file()
+    self.temp_dir.cleanup()
+
     # Clean up any temporary files
     if hasattr(self.recorder, 'temp_file') and self.recorder.temp_file:
       try:
@@ -38,158 +67,283 @@ class TestAudioRecorder(unittest.TestCase):
       except (AttributeError, OSError):
         pass
 
+  def _make_temp_file(self, name: str = 'test_audio.wav') -> MagicMock:
+    """Create a mock temporary file whose name points into the test directory."""
+    mock_file = MagicMock()
+    mock_file.name = os.path.join(self.temp_dir.name, name)
+    return mock_file
+
   @patch('tempfile.NamedTemporaryFile')
-  @patch('threading.Thread')
-  def test_start_recording(self, mock_thread, mock_temp_file):
+  def test_start_recording(self, mock_temp_file):
     """Test starting audio recording."""
-    # Create a mock audio stream
-    mock_stream = MagicMock()
-    self.mock_pyaudio.open.return_value = mock_stream
-
-    # Mock the PyAudio device enumeration
-    mock_info = MagicMock()
-    mock_info.get.return_value = 2  # Return 2 devices
-    self.mock_pyaudio.get_host_api_info_by_index.return_value = mock_info
-
-    # Create a mock device info that returns proper values for maxInputChannels
-    mock_device_info = MagicMock()
-    mock_device_info.get.return_value = 2  # 2 input channels
-    self.mock_pyaudio.get_device_info_by_host_api_device_index.return_value = (
-      mock_device_info
-    )
-
-    # Mock default device info
-    mock_default_device = {'index': 1}
-    self.mock_pyaudio.get_default_input_device_info.return_value = mock_default_device
-
     # Create a mock temporary file
-    mock_file = MagicMock()
-    mock_file.name = '/tmp/test_audio.wav'
+    mock_file = self._make_temp_file()
     mock_temp_file.return_value = mock_file
 
-    # Create a mock thread
-    mock_thread_instance = MagicMock()
-    mock_thread.return_value = mock_thread_instance
+    ring = self.recorder._ring
 
     # Start recording
     self.recorder.start_recording()
 
+    # Verify that the ring allocated with the recorder is reused and a writer runs
+    self.assertIs(self.recorder._ring, ring)
+    self.assertEqual(len(ring), 0)
+    self.assertTrue(self.recorder._writer_thread.is_alive())
+
     # Verify that a temporary file was created
     mock_temp_file.assert_called_once_with(suffix='.wav', delete=False)
 
-    # Verify that the audio stream was opened with the correct parameters
+    # Verify that the WAV header was written up front with the correct parameters
+    self.assertIsNotNone(self.recorder._wave_fd)
+    with open(mock_file.name, 'rb') as f:
+      self.assertEqual(f.read(), self.recorder._build_wave_header(0))
+
+    # Verify that the audio stream was pre-opened paused and is now started
     self.mock_pyaudio.open.assert_called_once_with(
       format=pyaudio.paInt16,
       channels=CHANNELS,
       rate=SAMPLE_RATE,
       input=True,
-      frames_per_buffer=CHUNK_SIZE,
+      frames_per_buffer=FRAMES_PER_BUFFER,
       input_device_index=1,
+      stream_callback=self.recorder._pa_callback,
+      start=False,
+    )
+    self.mock_stream.start_stream.assert_called_once()
+
+    # Verify that the device was asked whether it can capture at SAMPLE_RATE
+    self.mock_pyaudio.is_format_supported.assert_called_once_with(
+      SAMPLE_RATE,
+      input_device=1,
+      input_channels=CHANNELS,
+      input_format=pyaudio.paInt16,
     )
 
-    # Verify that a recording thread was created and started
-    mock_thread.assert_called_once_with(target=self.recorder._record)
-    mock_thread_instance.start.assert_called_once()
+    # Verify that devices were enumerated only once, when the recorder was created
+    self.mock_pyaudio.get_host_api_info_by_index.assert_called_once()
+    self.mock_pyaudio.get_sample_size.assert_called_once_with(pyaudio.paInt16)
 
     # Verify that the recorder state was updated
     self.assertTrue(self.recorder.is_recording)
-    self.assertEqual(self.recorder.frames, [])
+    self.assertEqual(self.recorder._frame_count, 0)
     self.assertEqual(self.recorder.temp_file, mock_file)
-    self.assertEqual(self.recorder.stream, mock_stream)
+    self.assertEqual(self.recorder.stream, self.mock_stream)
 
     # Verify that starting again doesn't create a new recording
     self.mock_pyaudio.reset_mock()
-    mock_thread.reset_mock()
+    self.mock_stream.reset_mock()
     mock_temp_file.reset_mock()
 
     self.recorder.start_recording()
 
     self.mock_pyaudio.open.assert_not_called()
-    mock_thread.assert_not_called()
+    self.mock_stream.start_stream.assert_not_called()
     mock_temp_file.assert_not_called()
 
-  def test_record(self):
-    """Test the recording loop."""
-    # Create a mock stream
-    mock_stream = MagicMock()
-    mock_stream.read.return_value = b'test_audio_data'
-    self.recorder.stream = mock_stream
+  @patch('tempfile.NamedTemporaryFile')
+  def test_start_recording_opens_stream_lazily(self, mock_temp_file):
+    """Test that the stream is opened on record if pre-opening it failed."""
+    # Simulate the stream failing to open when the recorder was created
+    self.mock_pyaudio.open.side_effect = OSError('Device busy')
+    with patch('pyaudio.PyAudio', return_value=self.mock_pyaudio):
+      recorder = AudioRecorder()
+    self.assertIsNone(recorder.stream)
+
+    # Once the device is available, starting a recording opens the stream
+    self.mock_pyaudio.open.side_effect = None
+    mock_temp_file.return_value = self._make_temp_file()
+
+    recorder.start_recording()
+    recorder._stop_writer_thread()
+    recorder._close_wave_file()
+
+    self.assertEqual(recorder.stream, self.mock_stream)
+    self.mock_stream.start_stream.assert_called_once()
+
+  def test_sample_rate_fallback(self):
+    """Test that an unsupported SAMPLE_RATE falls back to 48 kHz."""
+
+    def is_format_supported(rate, **kwargs):
+      if rate != 48000:
+        raise ValueError('Invalid rate')
+      return True
+
+    self.mock_pyaudio.is_format_supported.side_effect = is_format_supported
+
+    with patch('pyaudio.PyAudio', return_value=self.mock_pyaudio):
+      recorder = AudioRecorder()
+
+    self.assertEqual(recorder._sample_rate, 48000)
+    self.mock_pyaudio.get_device_info_by_index.assert_not_called()
+    self.assertEqual(self.mock_pyaudio.open.call_args.kwargs['rate'], 48000)
+
+  def test_sample_rate_device_default(self):
+    """Test that the device default rate is used if no preferred rate works."""
+    self.mock_pyaudio.is_format_supported.side_effect = ValueError('Invalid rate')
+    self.mock_pyaudio.get_device_info_by_index.return_value = {
+      'defaultSampleRate': 44100.0
+    }
+
+    with patch('pyaudio.PyAudio', return_value=self.mock_pyaudio):
+      recorder = AudioRecorder()
+
+    self.assertEqual(recorder._sample_rate, 44100)
+    expected_chunks = math.ceil(MAX_RECORDING_TIME * 44100 / FRAMES_PER_BUFFER)
+    self.assertEqual(recorder._max_chunks, expected_chunks)
+    self.mock_pyaudio.get_device_info_by_index.assert_called_once_with(1)
+    self.assertEqual(self.mock_pyaudio.open.call_args.kwargs['rate'], 44100)
+
+  @patch('tempfile.NamedTemporaryFile')
+  def test_no_input_device(self, mock_temp_file):
+    """Test that the recorder starts without a microphone and retries on record."""
+    self.mock_pyaudio.get_default_input_device_info.side_effect = OSError('No device')
+    self.mock_pyaudio.get_host_api_info_by_index.return_value.get.return_value = 0
+    self.mock_pyaudio.is_format_supported.side_effect = ValueError('Invalid device')
+    self.mock_pyaudio.get_device_info_by_index.side_effect = OSError('Invalid device')
+    self.mock_pyaudio.open.side_effect = OSError('Invalid device')
+
+    with patch('pyaudio.PyAudio', return_value=self.mock_pyaudio):
+      recorder = AudioRecorder()
+
+    self.assertEqual(recorder._sample_rate, SAMPLE_RATE)
+    self.assertIsNone(recorder.stream)
+
+    # Once a microphone is plugged in, starting a recording picks it up
+    self.mock_pyaudio.get_default_input_device_info.side_effect = None
+    self.mock_pyaudio.is_format_supported.side_effect = None
+    self.mock_pyaudio.open.side_effect = None
+    mock_temp_file.return_value = self._make_temp_file()
+
+    recorder.start_recording()
+    recorder._stop_writer_thread()
+    recorder._close_wave_file()
+
+    self.assertEqual(recorder._input_device_index, 1)
+    self.assertEqual(self.mock_pyaudio.open.call_args.kwargs['input_device_index'], 1)
+    self.mock_stream.start_stream.assert_called_once()
+
+  def test_refresh_devices(self):
+    """Test that refreshing devices restarts PortAudio and reopens the stream."""
+    new_pyaudio = MagicMock()
+    new_pyaudio.get_default_input_device_info.return_value = {'index': 3}
+    new_pyaudio.get_host_api_info_by_index.return_value.get.return_value = 0
+
+    with patch('pyaudio.PyAudio', return_value=new_pyaudio):
+      self.recorder.refresh_devices()
 
+    self.mock_stream.close.assert_called_once()
+    self.mock_pyaudio.terminate.assert_called_once()
+    self.assertIs(self.recorder.audio, new_pyaudio)
+    self.assertEqual(self.recorder._input_device_index, 3)
+    self.assertEqual(self.recorder.stream, new_pyaudio.open.return_value)
+    self.assertEqual(new_pyaudio.open.call_args.kwargs['input_device_index'], 3)
+
+  def test_refresh_devices_while_recording(self):
+    """Test that devices are not refreshed in the middle of a recording."""
+    self.recorder.is_recording = True
+
+    with patch('pyaudio.PyAudio') as mock_pyaudio_class:
+      self.recorder.refresh_devices()
+
+    mock_pyaudio_class.assert_not_called()
+    self.mock_stream.close.assert_not_called()
+
+  def test_pa_callback(self):
+    """Test that the stream callback copies chunks into the ring."""
     # Set up the recorder state
     self.recorder.is_recording = True
-    self.recorder.frames = []
-
-    # Instead of calling _record directly, we'll simulate what it does
-    # This avoids the infinite loop and time.time issues
-
-    # Simulate reading from the stream a few times
-    for _ in range(2):
-      data = self.recorder.stream.read(CHUNK_SIZE, exception_on_overflow=False)
-      self.recorder.frames.append(data)
-
-    # Verify that audio data was read from the stream
-    self.assertEqual(mock_stream.read.call_count, 2)
-    mock_stream.read.assert_has_calls(
-      [
-        call(CHUNK_SIZE, exception_on_overflow=False),
-        call(CHUNK_SIZE, exception_on_overflow=False),
-      ]
+    self.recorder._frame_count = 0
+    self.recorder._dropped_bytes = 0
+    self.recorder._ring = SPSCRing(32)
+
+    # Simulate PortAudio delivering two chunks
+    results = [
+      self.recorder._pa_callback(b'test_audio_data', CHUNK_SIZE, {}, 0)
+      for _ in range(2)
+    ]
+
+    # Verify that the stream is asked to keep going
+    self.assertEqual(results, [(None, pyaudio.paContinue)] * 2)
+
+    # Verify that both chunks are waiting in the ring for the writer thread
+    self.assertEqual(b''.join(self.recorder._ring.peek()), b'test_audio_data' * 2)
+    self.assertEqual(self.recorder._frame_count, 2)
+
+    # Verify that a chunk that does not fit is truncated and counted as dropped
+    self.recorder._pa_callback(b'test_audio_data', CHUNK_SIZE, {}, 0)
+
+    self.assertEqual(len(self.recorder._ring), 32)
+    self.assertEqual(self.recorder._dropped_bytes, 13)
+    self.assertEqual(self.recorder._frame_count, 3)
+
+  def test_pa_callback_trims_silence(self):
+    """Test that the stream callback buffers only what the silence trimmer keeps."""
+    self.recorder.is_recording = True
+    self.recorder._frame_count = 0
+    self.recorder._trimmer = MagicMock()
+    self.recorder._trimmer.process.return_value = b'speech'
+
+    result = self.recorder._pa_callback(b'test_audio_data', CHUNK_SIZE, {}, 0)
+
+    self.assertEqual(result, (None, pyaudio.paContinue))
+    self.recorder._trimmer.process.assert_called_once_with(b'test_audio_data')
+    self.assertEqual(b''.join(self.recorder._ring.peek()), b'speech')
+    self.assertEqual(self.recorder._frame_count, 1)
+
+  def test_pa_callback_counts_overflows(self):
+    """Test that chunks PortAudio flags as overflowed are counted but kept."""
+    self.recorder.is_recording = True
+    self.recorder._frame_count = 0
+    self.recorder._overflow_count = 0
+
+    self.recorder._pa_callback(b'test_audio_data', CHUNK_SIZE, {}, 0)
+    result = self.recorder._pa_callback(
+      b'test_audio_data', CHUNK_SIZE, {}, pyaudio.paInputOverflow
     )
 
-    # Verify that the frames were collected
-    self.assertEqual(len(self.recorder.frames), 2)
-    self.assertEqual(self.recorder.frames, [b'test_audio_data', b'test_audio_data'])
+    self.assertEqual(result, (None, pyaudio.paContinue))
+    self.assertEqual(self.recorder._overflow_count, 1)
+    self.assertEqual(b''.join(self.recorder._ring.peek()), b'test_audio_data' * 2)
 
-  def test_record_max_time(self):
-    """Test that recording stops after the maximum time."""
-    # Create a mock stream
-    mock_stream = MagicMock()
-    mock_stream.read.return_value = b'test_audio_data'
-    self.recorder.stream = mock_stream
+  def test_pa_callback_not_recording(self):
+    """Test that the stream callback completes the stream once recording stops."""
+    self.recorder.is_recording = False
+    self.recorder._frame_count = 0
 
-    # Set up the recorder state
+    result = self.recorder._pa_callback(b'test_audio_data', CHUNK_SIZE, {}, 0)
+
+    self.assertEqual(result, (None, pyaudio.paComplete))
+    self.assertEqual(self.recorder._frame_count, 0)
+
+  def test_pa_callback_max_time(self):
+    """Test that recording stops after the maximum time."""
+    # Set up the recorder state one chunk short of the limit
     self.recorder.is_recording = True
-    self.recorder.frames = []
     self.recorder._max_time_reached = False
+    self.recorder._frame_count = self.recorder._max_chunks - 1
 
-    # Patch time.time to simulate elapsed time exceeding MAX_RECORDING_TIME
-    with patch('time.time') as mock_time:
-      # First call in _record for start_time, next calls for the time check
-      # Make sure we exceed MAX_RECORDING_TIME on the second check
-      mock_time.side_effect = [0, MAX_RECORDING_TIME + 1]
+    result = self.recorder._pa_callback(b'test_audio_data', CHUNK_SIZE, {}, 0)
 
-      # Run the _record method which contains the loop
-      # The loop should break after the first iteration due to our time mock
-      self.recorder._record()
-
-      # Verify that recording was stopped and max time flag was set
-      self.assertFalse(self.recorder.is_recording)
-      self.assertTrue(self.recorder._max_time_reached)
+    # Verify that the stream was completed and max time flag was set
+    self.assertEqual(result, (None, pyaudio.paComplete))
+    self.assertFalse(self.recorder.is_recording)
+    self.assertTrue(self.recorder._max_time_reached)
 
-  @patch('wave.open')
-  def test_stop_recording(self, mock_wave_open):
+  def test_stop_recording(self):
     """Test stopping audio recording."""
     # Create mock objects
     mock_stream = MagicMock()
-    mock_thread = MagicMock()
-    mock_wave_file = MagicMock()
 
-    # Set up the recorder state
+    # Set up the recorder state with two chunks captured while the writer runs
+    self.recorder.temp_file = self._make_temp_file()
+    temp_file_name = self.recorder.temp_file.name
+    self.recorder._open_wave_file()
+    self.recorder._start_writer_thread()
     self.recorder.is_recording = True
     self.recorder.stream = mock_stream
-    self.recorder.recording_thread = mock_thread
-    self.recorder.frames = [b'test_audio_data', b'more_test_data']
-
-    # Create a temporary file for testing
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-      self.recorder.temp_file = temp_file
-      temp_file_name = temp_file.name
-
-    # Set up the wave.open mock
-    mock_wave_open.return_value.__enter__.return_value = mock_wave_file
-
-    # Set up the sample size mock
-    self.mock_pyaudio.get_sample_size.return_value = 2  # 2 bytes for paInt16
+    self.recorder._frame_count = 2
+    self.recorder._ring.write(b'\x01\x00' * CHUNK_SIZE)
+    self.recorder._ring.write(b'\x02\x00' * CHUNK_SIZE)
 
     # Stop recording
     file_path, duration = self.recorder.stop_recording()
@@ -197,29 +351,66 @@ class TestAudioRecorder(unittest.TestCase):
     # Verify that the recording state was updated
     self.assertFalse(self.recorder.is_recording)
 
-    # Verify that the thread was joined
-    mock_thread.join.assert_called_once()
-
-    # Verify that the stream was stopped and closed
+    # Verify that the stream was stopped but kept open for the next recording
     mock_stream.stop_stream.assert_called_once()
-    mock_stream.close.assert_called_once()
-
-    # Verify that the wave file was created with the correct parameters
-    mock_wave_open.assert_called_once_with(temp_file_name, 'wb')
-    mock_wave_file.setnchannels.assert_called_once_with(CHANNELS)
-    mock_wave_file.setsampwidth.assert_called_once_with(2)
-    mock_wave_file.setframerate.assert_called_once_with(SAMPLE_RATE)
-    mock_wave_file.writeframes.assert_called_once_with(b'test_audio_datamore_test_data')
+    mock_stream.close.assert_not_called()
+
+    # Verify that the writer drained the ring and the header sizes were patched
+    self.assertIsNone(self.recorder._writer_thread)
+    self.assertIsNone(self.recorder._wave_fd)
+    with wave.open(temp_file_name, 'rb') as wf:
+      self.assertEqual(wf.getnchannels(), CHANNELS)
+      self.assertEqual(wf.getsampwidth(), 2)
+      self.assertEqual(wf.getframerate(), SAMPLE_RATE)
+      self.assertEqual(wf.getnframes(), 2 * CHUNK_SIZE)
+      expected_frames = b'\x01\x00' * CHUNK_SIZE + b'\x02\x00' * CHUNK_SIZE
+      self.assertEqual(wf.readframes(2 * CHUNK_SIZE), expected_frames)
 
     # Verify that the correct file path and duration were returned
     self.assertEqual(file_path, temp_file_name)
-    # Duration calculation: 2 frames * CHUNK_SIZE / SAMPLE_RATE
+    # Duration calculation: 2 chunks * CHUNK_SIZE / SAMPLE_RATE
     expected_duration = 2 * CHUNK_SIZE / SAMPLE_RATE
     self.assertEqual(duration, expected_duration)
 
-    # Clean up the temporary file
-    if os.path.exists(temp_file_name):
-      os.unlink(temp_file_name)
+  @patch('speech_transcriber.audio.AudioCompressor')
+  def test_stop_recording_encodes_long_recordings(self, mock_compressor_class):
+    """Test that a long recording is piped to an Opus encoder while it is written."""
+    mock_compressor = mock_compressor_class.return_value
+    mock_compressor.ffmpeg_available = True
+    mock_compressor.finish_stream.return_value = True
+    mock_encoder = mock_compressor.compress_stream.return_value
+    encoded = []
+    mock_encoder.stdin.write.side_effect = lambda data: encoded.append(bytes(data))
+
+    # Write every chunk as it arrives and start encoding after the first one
+    self.recorder.WRITE_BATCH_SIZE = 1
+    self.recorder.STREAM_ENCODE_THRESHOLD = 2 * CHUNK_SIZE
+    self.recorder._initialize_recording()
+    self.recorder.temp_file = self._make_temp_file()
+    temp_file_name = self.recorder.temp_file.name
+    self.recorder._track_file(temp_file_name)
+    self.recorder._open_wave_file()
+    self.recorder.stream = MagicMock()
+
+    first_chunk = b'\x01\x00' * CHUNK_SIZE
+    second_chunk = b'\x02\x00' * CHUNK_SIZE
+    self.recorder._ring.write(first_chunk)
+    self.recorder._start_writer_thread()
+    while self.recorder._encoder is None:
+      self.recorder._writer_thread.join(0.01)
+    self.recorder._ring.write(second_chunk)
+
+    file_path, duration = self.recorder.stop_recording()
+
+    # Verify that audio written before and after the encoder started was encoded
+    self.assertEqual(b''.join(encoded), first_chunk + second_chunk)
+    mock_compressor.finish_stream.assert_called_once_with(mock_encoder, file_path)
+
+    # Verify that the Opus file is returned and the WAV is deleted
+    self.assertTrue(file_path.endswith('.ogg'))
+    self.assertFalse(os.path.exists(temp_file_name))
+    self.assertEqual(duration, 2 * CHUNK_SIZE / SAMPLE_RATE)
+    self.recorder.release_file(file_path)
 
   def test_stop_recording_not_recording(self):
     """Test stopping when not recording."""
@@ -241,10 +432,10 @@ class TestAudioRecorder(unittest.TestCase):
     # Set up the recorder state
     self.recorder.stream = mock_stream
 
-    # Create a temporary file for testing
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-      self.recorder.temp_file = temp_file
-      temp_file_name = temp_file.name
+    # Create a temporary recording that was never released
+    self.recorder._setup_temp_file()
+    self.recorder.temp_file.close()
+    temp_file_name = self.recorder.temp_file.name
 
     # Clean up
     self.recorder.cleanup()
@@ -258,32 +449,36 @@ class TestAudioRecorder(unittest.TestCase):
     # Verify that the temporary file was deleted
     self.assertFalse(os.path.exists(temp_file_name))
 
-  @patch('wave.open')
-  def test_stop_recording_with_none_temp_file(self, mock_wave_open):
+  def test_release_file(self):
+    """Test that a released recording is deleted and not deleted again on cleanup."""
+    self.recorder._setup_temp_file()
+    self.recorder.temp_file.close()
+    temp_file_name = self.recorder.temp_file.name
+
+    self.recorder.release_file(temp_file_name)
+
+    self.assertFalse(os.path.exists(temp_file_name))
+    self.assertEqual(self.recorder._file_finalizers, {})
+
+    # Releasing an unknown or already released path is a no-op
+    self.recorder.release_file(temp_file_name)
+    self.recorder.release_file('/nonexistent/recording.wav')
+
+  def test_stop_recording_with_none_temp_file(self):
     """Test that stop_recording handles None temp_file gracefully."""
     # Create mock objects
     mock_stream = MagicMock()
-    mock_thread = MagicMock()
-    mock_wave_file = MagicMock()
 
     # Set up the recorder state
     self.recorder.is_recording = True
     self.recorder.stream = mock_stream
-    self.recorder.recording_thread = mock_thread
-    self.recorder.frames = [b'test_audio_data']
+    self.recorder._wave_fd = None  # The file was never opened
     self.recorder.temp_file = None  # Explicitly set temp_file to None
 
-    # Set up the wave.open mock
-    mock_wave_open.return_value.__enter__.return_value = mock_wave_file
-
-    # Set up the sample size mock
-    self.mock_pyaudio.get_sample_size.return_value = 2  # 2 bytes for paInt16
-
     # Create a mock for tempfile.NamedTemporaryFile
     with patch('tempfile.NamedTemporaryFile') as mock_temp_file:
       # Setup the mock to return a mock file
-      mock_file = MagicMock()
-      mock_file.name = '/tmp/test_recovered_audio.wav'
+      mock_file = self._make_temp_file('test_recovered_audio.wav')
       mock_temp_file.return_value = mock_file
 
       # Stop recording
@@ -295,29 +490,18 @@ class TestAudioRecorder(unittest.TestCase):
       # Verify that the recorder's temp_file was set to the mock file
       self.assertEqual(self.recorder.temp_file, mock_file)
 
-      # Verify that the wave file was created with the correct parameters
-      mock_wave_open.assert_called_once_with('/tmp/test_recovered_audio.wav', 'wb')
+      # Verify that an empty wave file was created and finalized
+      self.assertIsNone(self.recorder._wave_fd)
+      with wave.open(mock_file.name, 'rb') as wf:
+        self.assertEqual(wf.getnframes(), 0)
 
       # Verify that the correct file path was returned
-      self.assertEqual(file_path, '/tmp/test_recovered_audio.wav')
+      self.assertEqual(file_path, mock_file.name)
 
   def test_start_recording_failure_handling(self):
     """Test that start_recording failures are handled gracefully."""
-    # Mock the PyAudio device enumeration
-    mock_info = MagicMock()
-    mock_info.get.return_value = 2  # Return 2 devices
-    self.mock_pyaudio.get_host_api_info_by_index.return_value = mock_info
-
-    # Create a mock device info that returns proper values for maxInputChannels
-    mock_device_info = MagicMock()
-    mock_device_info.get.return_value = 2  # 2 input channels
-    self.mock_pyaudio.get_device_info_by_host_api_device_index.return_value = (
-      mock_device_info
-    )
-
-    # Configure the mock PyAudio to simulate failure when opening the stream
-    self.mock_pyaudio.get_default_input_device_info.return_value = {'index': 1}
-    self.mock_pyaudio.open.side_effect = OSError('Failed to open audio stream')
+    # Configure the mock stream to simulate failure when starting it
+    self.mock_stream.start_stream.side_effect = OSError('Failed to start audio stream')
 
     # Start recording - this should raise an OSError
     with self.assertRaises(OSError):
@@ -330,29 +514,21 @@ class TestAudioRecorder(unittest.TestCase):
     result = self.recorder.stop_recording()
     self.assertEqual(result, ('', 0.0))
 
-  @patch('wave.open')
-  def test_stop_recording_after_partial_initialization(self, mock_wave_open):
+  def test_stop_recording_after_partial_initialization(self):
     """Test stopping recording after start_recording partially initializes the recorder."""
-    # Mock wave file
-    mock_wave_file = MagicMock()
-    mock_wave_open.return_value.__enter__.return_value = mock_wave_file
-
     # Create a stream with the necessary methods
     mock_stream = MagicMock()
 
     # Set up a scenario where start_recording partially completed
     self.recorder.is_recording = True  # This would be set early in start_recording
-    self.recorder.frames = []  # This would be initialized
+    self.recorder._frame_count = 0  # This would be initialized
     self.recorder.stream = mock_stream  # Assume stream was created
-    self.recorder.recording_thread = None  # But thread wasn't created
-    self.recorder.temp_file = None  # And temp_file wasn't created
-    self.mock_pyaudio.get_sample_size.return_value = 2  # Set up sample size
+    self.recorder.temp_file = None  # But temp_file wasn't created
 
     # Create a mock for tempfile.NamedTemporaryFile
     with patch('tempfile.NamedTemporaryFile') as mock_temp_file:
       # Setup the mock to return a mock file
-      mock_file = MagicMock()
-      mock_file.name = '/tmp/recovery_file.wav'
+      mock_file = self._make_temp_file('recovery_file.wav')
       mock_temp_file.return_value = mock_file
 
       # Now try to stop the recording
@@ -362,16 +538,14 @@ class TestAudioRecorder(unittest.TestCase):
       mock_temp_file.assert_called_once()
       self.assertEqual(self.recorder.temp_file, mock_file)
 
-      # Verify the stream was properly closed
+      # Verify the stream was stopped and kept for reuse
       mock_stream.stop_stream.assert_called_once()
-      mock_stream.close.assert_called_once()
-
-      # Verify the stream was set to None
-      self.assertIsNone(self.recorder.stream)
+      mock_stream.close.assert_not_called()
+      self.assertEqual(self.recorder.stream, mock_stream)
 
       # Verify we get valid output
-      self.assertEqual(file_path, '/tmp/recovery_file.wav')
-      self.assertEqual(duration, 0.0)  # No frames, so duration should be 0
+      self.assertEqual(file_path, mock_file.name)
+      self.assertEqual(duration, 0.0)  # No chunks, so duration should be 0
 
 
 if __name__ == '__main__':
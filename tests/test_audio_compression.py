@@ -7,6 +7,7 @@ from unittest.mock import MagicMock
 from unittest.mock import patch
 
 from speech_transcriber.audio_compression import AudioCompressor
+from speech_transcriber.audio_compression import _find_ffmpeg
 
 
 class TestAudioCompressor(unittest.TestCase):
@@ -21,6 +22,8 @@ class TestAudioCompressor(unittest.TestCase):
 
     # File size in MB for testing
     self.file_size_mb = 0.01  # Small file for testing
+    # Limit just below the test file's size, so compression is not skipped
+    self.max_size_mb = 0.01
 
     # Create the audio compressor
     self.compressor = AudioCompressor()
@@ -36,16 +39,22 @@ class TestAudioCompressor(unittest.TestCase):
   def test_check_ffmpeg_available_success(self, mock_which):
     """Test ffmpeg availability check when ffmpeg is installed."""
     mock_which.return_value = '/usr/bin/ffmpeg'  # Mock ffmpeg being installed
+    _find_ffmpeg.cache_clear()
+    self.addCleanup(_find_ffmpeg.cache_clear)
 
     compressor = AudioCompressor()
+    AudioCompressor()
 
     self.assertTrue(compressor.ffmpeg_available)
+    # The PATH search is done once and shared by later compressors
     mock_which.assert_called_once_with('ffmpeg')
 
   @patch('shutil.which')
   def test_check_ffmpeg_available_failure(self, mock_which):
     """Test ffmpeg availability check when ffmpeg is not installed."""
     mock_which.return_value = None  # Mock ffmpeg not being installed
+    _find_ffmpeg.cache_clear()
+    self.addCleanup(_find_ffmpeg.cache_clear)
 
     compressor = AudioCompressor()
 
@@ -53,24 +62,22 @@ class TestAudioCompressor(unittest.TestCase):
     mock_which.assert_called_once_with('ffmpeg')
 
   def test_calculate_bitrate(self):
-    """Test the bitrate calculation algorithm."""
-    # Test with a small file
-    small_file_bitrate = self.compressor._calculate_bitrate(
-      self.test_audio_file.name, 19
+    """Test that the bitrate is only lowered for recordings too long to fit."""
+    # Without a duration, or when the limit is not a concern, use the speech bitrate
+    self.assertEqual(
+      self.compressor._calculate_bitrate(None, 19), AudioCompressor.SPEECH_BITRATE
+    )
+    self.assertEqual(
+      self.compressor._calculate_bitrate(600, 19), AudioCompressor.SPEECH_BITRATE
     )
-    self.assertGreaterEqual(
-      small_file_bitrate, 16
-    )  # Should be at least the minimum bitrate
-
-    # Test with different target sizes
-    larger_bitrate = self.compressor._calculate_bitrate(self.test_audio_file.name, 50)
-    smaller_bitrate = self.compressor._calculate_bitrate(self.test_audio_file.name, 5)
 
-    self.assertGreaterEqual(larger_bitrate, smaller_bitrate)
+    # Three hours at 19MB fits at 14 kbps
+    self.assertEqual(self.compressor._calculate_bitrate(10800, 19), 14)
 
-    # Test maximum bitrate clamping
-    max_bitrate = self.compressor._calculate_bitrate(self.test_audio_file.name, 1000)
-    self.assertLessEqual(max_bitrate, 128)  # Should be capped at maximum bitrate
+    # Ten hours at 19MB needs about 4 kbps, below what libopus supports
+    self.assertEqual(
+      self.compressor._calculate_bitrate(36000, 19), AudioCompressor.MIN_BITRATE
+    )
 
   @patch('subprocess.run')
   def test_run_ffmpeg(self, mock_run):
@@ -78,7 +85,7 @@ class TestAudioCompressor(unittest.TestCase):
     mock_result = MagicMock()
     mock_run.return_value = mock_result
 
-    output_file = '/tmp/test_output.mp3'
+    output_file = '/tmp/test_output.ogg'
     result = self.compressor._run_ffmpeg(self.test_audio_file.name, output_file, 64)
 
     # Verify ffmpeg was called with correct parameters
@@ -88,36 +95,26 @@ class TestAudioCompressor(unittest.TestCase):
     self.assertEqual(call_args[0], 'ffmpeg')
     self.assertEqual(call_args[1], '-i')
     self.assertEqual(call_args[2], self.test_audio_file.name)
-    self.assertEqual(call_args[3], '-b:a')
-    self.assertEqual(call_args[4], '64k')
-    self.assertEqual(call_args[5], '-ac')
-    self.assertEqual(call_args[6], '1')  # Mono
-    self.assertEqual(call_args[7], '-y')  # Overwrite
-    self.assertEqual(call_args[8], output_file)
+    self.assertEqual(call_args[3:7], ['-c:a', 'libopus', '-b:a', '64k'])
+    self.assertEqual(call_args[call_args.index('-ac') + 1], '1')  # Mono
+    self.assertEqual(call_args[call_args.index('-ar') + 1], '16000')
+    self.assertIn('-vn', call_args)
+    self.assertEqual(call_args[call_args.index('-f') + 1], 'ogg')
+    self.assertEqual(call_args[-2], '-y')  # Overwrite
+    self.assertEqual(call_args[-1], output_file)
 
     # Verify the result is returned properly
     self.assertEqual(result, mock_result)
 
   @patch('subprocess.run')
-  @patch('os.path.getsize')
-  @patch('os.path.exists')
-  def test_compress_audio_success(self, mock_exists, mock_getsize, mock_run):
+  def test_compress_audio_success(self, mock_run):
     """Test successful audio compression."""
     # Set up the mocks
     self.compressor.ffmpeg_available = True
     mock_run.return_value = MagicMock()
 
     # Create a mock temporary file path
-    temp_file_path = '/tmp/test_compressed.mp3'
-
-    # Mock file existence checks
-    mock_exists.return_value = True
-
-    # Mock file sizes - setup both calls with concrete values
-    mock_getsize.side_effect = [
-      1024 * 1024,  # 1MB for input file (first call)
-      512 * 1024,  # 0.5MB for output file (second call)
-    ]
+    temp_file_path = '/tmp/test_compressed.ogg'
 
     # Mock the subprocess call
     def run_side_effect(*args, **kwargs):
@@ -135,19 +132,36 @@ class TestAudioCompressor(unittest.TestCase):
       mock_temp_file.return_value = mock_file
 
       # Direct mocking of the internal verification to ensure success
-      with (
-        patch.object(os.path, 'exists', return_value=True),
-        patch.object(os.path, 'getsize', return_value=512 * 1024),
-      ):
+      input_file = self.test_audio_file.name
+
+      def stat(path):
+        # 25MB input, 0.5MB output
+        size = 25 * 1024 * 1024 if path == input_file else 512 * 1024
+        return MagicMock(st_size=size)
+
+      with patch('os.stat', side_effect=stat) as mock_stat:
         # Call the method to test
         result = self.compressor.compress_audio(self.test_audio_file.name, 19)
 
         # Verify the result
         self.assertEqual(result, temp_file_path)
 
+      # Verify each file was checked with a single stat call
+      self.assertEqual(mock_stat.call_count, 2)
+
     # Verify ffmpeg was called with the right arguments
     mock_run.assert_called_once()
 
+  @patch('subprocess.run')
+  def test_compress_audio_already_small_enough(self, mock_run):
+    """Test that a file already under the limit is returned without encoding."""
+    self.compressor.ffmpeg_available = True
+
+    result = self.compressor.compress_audio(self.test_audio_file.name, 19)
+
+    self.assertEqual(result, self.test_audio_file.name)
+    mock_run.assert_not_called()
+
   @patch('subprocess.run')
   def test_compress_audio_ffmpeg_not_available(self, mock_run):
     """Test compression when ffmpeg is not available."""
@@ -175,47 +189,47 @@ class TestAudioCompressor(unittest.TestCase):
     mock_run.assert_not_called()
 
   @patch('subprocess.run')
-  @patch('os.path.exists')
-  def test_compress_audio_empty_output(self, mock_exists, mock_run):
+  @patch('os.stat')
+  def test_compress_audio_empty_output(self, mock_stat, mock_run):
     """Test compression when output file is empty or doesn't exist."""
     # Set up the mocks
     self.compressor.ffmpeg_available = True
     mock_run.return_value = MagicMock()
 
     # Mock the output file doesn't exist after compression
-    mock_exists.side_effect = [True, False]  # Input exists, output doesn't
+    mock_stat.side_effect = [MagicMock(st_size=1024 * 1024), FileNotFoundError]
 
     # Call the compression method
     with patch('tempfile.NamedTemporaryFile') as mock_temp_file:
       mock_file = MagicMock()
-      mock_file.name = '/tmp/test_compressed.mp3'
+      mock_file.name = '/tmp/test_compressed.ogg'
       mock_temp_file.return_value = mock_file
 
-      result = self.compressor.compress_audio(self.test_audio_file.name, 19)
+      result = self.compressor.compress_audio(
+        self.test_audio_file.name, self.max_size_mb
+      )
 
       # Verify that None is returned for failed compression
       self.assertIsNone(result)
 
   @patch('subprocess.run')
-  @patch('os.path.exists')
-  def test_compress_audio_exception_handling(self, mock_exists, mock_run):
+  def test_compress_audio_exception_handling(self, mock_run):
     """Test exception handling during compression."""
     # Set up the mocks
     self.compressor.ffmpeg_available = True
     mock_run.side_effect = Exception('Test exception')
 
-    # Mock file existence checks - input file exists, output doesn't
-    mock_exists.side_effect = lambda path: path == self.test_audio_file.name
-
     # Call the compression method
     with patch('tempfile.NamedTemporaryFile') as mock_temp_file:
       mock_file = MagicMock()
-      mock_file.name = '/tmp/test_compressed.mp3'
+      mock_file.name = '/tmp/test_compressed.ogg'
       mock_temp_file.return_value = mock_file
 
       # Create a patch for the error handler to verify it's called
       with patch.object(self.compressor, '_handle_compression_error') as mock_handler:
-        result = self.compressor.compress_audio(self.test_audio_file.name, 19)
+        result = self.compressor.compress_audio(
+          self.test_audio_file.name, self.max_size_mb
+        )
 
         # Verify error handler was called
         mock_handler.assert_called_once()
@@ -223,6 +237,45 @@ class TestAudioCompressor(unittest.TestCase):
         # Verify that None is returned for failed compression
         self.assertIsNone(result)
 
+  @patch('subprocess.Popen')
+  def test_compress_stream(self, mock_popen):
+    """Test that streaming compression reads raw PCM from ffmpeg's stdin."""
+    self.compressor.ffmpeg_available = True
+
+    process = self.compressor.compress_stream('/tmp/test_output.ogg', 16000, 1)
+
+    self.assertEqual(process, mock_popen.return_value)
+    call_args = mock_popen.call_args[0][0]
+    self.assertEqual(
+      call_args[:9],
+      ['ffmpeg', '-f', 's16le', '-ar', '16000', '-ac', '1', '-i', 'pipe:0'],
+    )
+    self.assertIn('libopus', call_args)
+    self.assertIn(f'{AudioCompressor.SPEECH_BITRATE}k', call_args)
+    self.assertEqual(call_args[-1], '/tmp/test_output.ogg')
+
+  @patch('subprocess.Popen')
+  def test_compress_stream_ffmpeg_not_available(self, mock_popen):
+    """Test that streaming compression fails without ffmpeg."""
+    self.compressor.ffmpeg_available = False
+
+    with self.assertRaises(OSError):
+      self.compressor.compress_stream('/tmp/test_output.ogg', 16000, 1)
+
+    mock_popen.assert_not_called()
+
+  def test_finish_stream(self):
+    """Test that finishing a stream closes its input and checks the output."""
+    process = MagicMock()
+    process.wait.return_value = 0
+
+    self.assertTrue(self.compressor.finish_stream(process, self.test_audio_file.name))
+    process.stdin.close.assert_called_once()
+
+    # A non-zero exit status is a failure even if output was written
+    process.wait.return_value = 1
+    self.assertFalse(self.compressor.finish_stream(process, self.test_audio_file.name))
+
 
 if __name__ == '__main__':
   unittest.main()
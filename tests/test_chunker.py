@@ -0,0 +1,97 @@
+"""Tests for the audio chunking module."""
+
+import os
+import tempfile
+import unittest
+import wave
+
+from speech_transcriber.chunker import merge_transcripts
+from speech_transcriber.chunker import split_wav
+
+SAMPLE_RATE = 100  # Low rate keeps the test files small
+
+
+class TestSplitWav(unittest.TestCase):
+  """Test cases for the split_wav function."""
+
+  def setUp(self):
+    """Set up test fixtures."""
+    # Ten seconds of 16-bit mono audio whose samples count up from zero
+    self.frames = b''.join(i.to_bytes(2, 'little') for i in range(10 * SAMPLE_RATE))
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+      self.audio_path = temp_file.name
+    self.addCleanup(os.unlink, self.audio_path)
+
+    with wave.open(self.audio_path, 'wb') as wav:
+      wav.setnchannels(1)
+      wav.setsampwidth(2)
+      wav.setframerate(SAMPLE_RATE)
+      wav.writeframes(self.frames)
+
+  def _read_chunks(self, chunk_paths):
+    """Return the frames of each chunk and delete the chunk files."""
+    chunks = []
+    for chunk_path in chunk_paths:
+      with wave.open(chunk_path, 'rb') as chunk:
+        self.assertEqual(chunk.getframerate(), SAMPLE_RATE)
+        chunks.append(chunk.readframes(chunk.getnframes()))
+      os.unlink(chunk_path)
+    return chunks
+
+  def test_split_with_overlap(self):
+    """Test that chunks fit the size limit and share the overlap."""
+    # Four seconds of audio per chunk, one of them shared with the next chunk
+    max_chunk_bytes = 44 + 4 * SAMPLE_RATE * 2
+
+    chunk_paths = split_wav(self.audio_path, max_chunk_bytes, overlap_seconds=1.0)
+
+    for chunk_path in chunk_paths:
+      self.assertLessEqual(os.path.getsize(chunk_path), max_chunk_bytes)
+    step = 3 * SAMPLE_RATE * 2
+    self.assertEqual(
+      self._read_chunks(chunk_paths),
+      [
+        self.frames[:800],
+        self.frames[step : step + 800],
+        self.frames[2 * step :],
+      ],
+    )
+
+  def test_short_file_single_chunk(self):
+    """Test that a file within the limit becomes a single chunk."""
+    chunk_paths = split_wav(self.audio_path, 1024 * 1024)
+
+    self.assertEqual(self._read_chunks(chunk_paths), [self.frames])
+
+  def test_chunk_smaller_than_overlap(self):
+    """Test that a limit too small to make progress is rejected."""
+    with self.assertRaises(ValueError):
+      split_wav(self.audio_path, 44 + SAMPLE_RATE, overlap_seconds=1.0)
+
+
+class TestMergeTranscripts(unittest.TestCase):
+  """Test cases for the merge_transcripts function."""
+
+  def test_overlap_removed(self):
+    """Test that words repeated across a chunk boundary appear once."""
+    result = merge_transcripts(
+      ['The quick brown fox jumps', 'fox jumps over the lazy dog.']
+    )
+
+    self.assertEqual(result, 'The quick brown fox jumps over the lazy dog.')
+
+  def test_overlap_ignores_case_and_punctuation(self):
+    """Test that the overlap is found despite differing punctuation."""
+    result = merge_transcripts(['We went home.', 'Home, and then slept'])
+
+    self.assertEqual(result, 'We went home. and then slept')
+
+  def test_no_overlap(self):
+    """Test that transcripts without shared words are joined with a space."""
+    result = merge_transcripts(['Hello there', ' General ', ''])
+
+    self.assertEqual(result, 'Hello there General')
+
+
+if __name__ == '__main__':
+  unittest.main()
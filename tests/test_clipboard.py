@@ -9,6 +9,7 @@ from speech_transcriber.clipboard import copy_to_clipboard, paste_from_clipboard
 class TestClipboard(unittest.TestCase):
     """Test cases for the clipboard module."""
 
+    @patch("speech_transcriber.clipboard.HAVE_PYOBJC", False)
     def test_copy_to_clipboard_success(self):
         """Test that text is successfully copied to the clipboard."""
         test_text = "This is a test text for clipboard"
@@ -23,6 +24,7 @@ class TestClipboard(unittest.TestCase):
             # Verify that the function returned True (success)
             self.assertTrue(result)
 
+    @patch("speech_transcriber.clipboard.HAVE_PYOBJC", False)
     def test_copy_to_clipboard_failure(self):
         """Test handling of clipboard copy failures."""
         test_text = "This is a test text for clipboard"
@@ -36,6 +38,7 @@ class TestClipboard(unittest.TestCase):
                 # Verify that the function returned False (failure)
                 self.assertFalse(result)
 
+    @patch("speech_transcriber.clipboard.HAVE_PYOBJC", False)
     def test_paste_from_clipboard_success(self):
         """Test that text is successfully pasted from the clipboard."""
         expected_text = "This is a test text from clipboard"
@@ -47,6 +50,7 @@ class TestClipboard(unittest.TestCase):
             # Verify that the function returned the expected text
             self.assertEqual(result, expected_text)
 
+    @patch("speech_transcriber.clipboard.HAVE_PYOBJC", False)
     def test_paste_from_clipboard_failure(self):
         """Test handling of clipboard paste failures."""
         # Mock pyperclip.paste to raise an exception
@@ -59,5 +63,36 @@ class TestClipboard(unittest.TestCase):
                 self.assertEqual(result, "")
 
 
+    @patch("speech_transcriber.clipboard.HAVE_PYOBJC", True)
+    @patch("speech_transcriber.clipboard.NSPasteboardTypeString", "public.utf8-plain-text", create=True)
+    @patch("speech_transcriber.clipboard.NSPasteboard", create=True)
+    def test_copy_to_clipboard_pasteboard(self, mock_nspasteboard):
+        """Test that text is written to the pasteboard directly when PyObjC is available."""
+        pasteboard = mock_nspasteboard.generalPasteboard.return_value
+        pasteboard.setString_forType_.return_value = True
+
+        with patch("pyperclip.copy") as mock_copy:
+            result = copy_to_clipboard("Test text")
+
+        # Verify that the pasteboard was replaced without using pyperclip
+        pasteboard.clearContents.assert_called_once()
+        pasteboard.setString_forType_.assert_called_once_with(
+            "Test text", "public.utf8-plain-text"
+        )
+        mock_copy.assert_not_called()
+        self.assertTrue(result)
+
+    @patch("speech_transcriber.clipboard.HAVE_PYOBJC", True)
+    @patch("speech_transcriber.clipboard.NSPasteboardTypeString", "public.utf8-plain-text", create=True)
+    @patch("speech_transcriber.clipboard.NSPasteboard", create=True)
+    def test_paste_from_clipboard_pasteboard(self, mock_nspasteboard):
+        """Test that text is read from the pasteboard directly when PyObjC is available."""
+        pasteboard = mock_nspasteboard.generalPasteboard.return_value
+        pasteboard.stringForType_.return_value = None  # Pasteboard holds no text
+
+        self.assertEqual(paste_from_clipboard(), "")
+        pasteboard.stringForType_.assert_called_once_with("public.utf8-plain-text")
+
+
 if __name__ == "__main__":
     unittest.main()
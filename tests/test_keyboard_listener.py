@@ -8,6 +8,8 @@ from unittest.mock import patch
 from pynput.keyboard import Key
 from pynput.keyboard import KeyCode
 
+from speech_transcriber.keyboard_listener import CTRL_MASK
+from speech_transcriber.keyboard_listener import SHIFT_MASK
 from speech_transcriber.keyboard_listener import KeyboardListener
 
 
@@ -72,7 +74,7 @@ class TestKeyboardListener(unittest.TestCase):
     self.listener.is_recording = True
     self.listener.last_ctrl_press_time = time.time()
     self.listener.last_ctrl_key = Key.ctrl_l
-    self.listener.current_keys.add(Key.ctrl_l)
+    self.listener.held_modifiers = CTRL_MASK
 
     # Stop the listener
     self.listener.stop()
@@ -84,7 +86,7 @@ class TestKeyboardListener(unittest.TestCase):
     # Verify Ctrl state is reset
     self.assertIsNone(self.listener.last_ctrl_press_time)
     self.assertIsNone(self.listener.last_ctrl_key)
-    self.assertEqual(self.listener.current_keys, set())  # Check current_keys is cleared
+    self.assertEqual(self.listener.held_modifiers, 0)  # Check modifiers are cleared
 
     # Stopping again should not cause an error
     self.listener.stop()
@@ -200,20 +202,22 @@ class TestKeyboardListener(unittest.TestCase):
     self.mock_activate.assert_not_called()
 
   def test_release_key(self):
-    """Test releasing a key removes it from current_keys."""
+    """Test that pressing and releasing modifiers updates held_modifiers."""
     self.listener._on_press(Key.ctrl_l)
+    self.listener._on_press(Key.shift)
     self.listener._on_press(KeyCode.from_char('a'))
-    self.assertEqual(self.listener.current_keys, {Key.ctrl_l, KeyCode.from_char('a')})
+    self.assertEqual(self.listener.held_modifiers, CTRL_MASK | SHIFT_MASK)
 
     self.listener._on_release(Key.ctrl_l)
-    self.assertEqual(self.listener.current_keys, {KeyCode.from_char('a')})
-
-    # Releasing a key not pressed should not error
-    self.listener._on_release(Key.shift)
-    self.assertEqual(self.listener.current_keys, {KeyCode.from_char('a')})
+    self.assertEqual(self.listener.held_modifiers, SHIFT_MASK)
 
+    # Releasing a key that is not a modifier or not pressed should not error
     self.listener._on_release(KeyCode.from_char('a'))
-    self.assertEqual(self.listener.current_keys, set())
+    self.listener._on_release(Key.cmd)
+    self.assertEqual(self.listener.held_modifiers, SHIFT_MASK)
+
+    self.listener._on_release(Key.shift)
+    self.assertEqual(self.listener.held_modifiers, 0)
 
 
 if __name__ == '__main__':
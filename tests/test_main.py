@@ -1,6 +1,8 @@
 """Tests for the main application module."""
 
+import os
 import signal
+import threading
 import unittest
 from unittest.mock import MagicMock
 from unittest.mock import call
@@ -41,15 +43,26 @@ class TestSpeechTranscriber(unittest.TestCase):
     self.assertEqual(kwargs['on_activate'], self.app.start_recording)
     self.assertEqual(kwargs['on_deactivate'], self.app.stop_recording_and_transcribe)
 
+  def _drain_io_pool(self):
+    """Wait for queued transcriptions and the notifications they trigger to run."""
+    self.app._transcribe_pool.shutdown(wait=True)
+    self.app._io_pool.shutdown(wait=True)
+
   @patch('speech_transcriber.__main__.OPENAI_API_KEY', 'test_api_key')
   @patch('signal.signal')
   def test_start(self, mock_signal):
     """Test starting the application."""
-    # Mock time.sleep to avoid blocking
-    with patch('time.sleep', side_effect=KeyboardInterrupt):
+    warmed_up = threading.Event()
+    self.mock_transcriber.warmup.side_effect = warmed_up.set
+
+    # Mock the stop event wait to avoid blocking
+    with patch.object(self.app._stop_event, 'wait', side_effect=KeyboardInterrupt):
       # Start the application
       self.app.start()
 
+      # Verify that the transcription service is warmed up in the background
+      self.assertTrue(warmed_up.wait(timeout=1))
+
       # Verify that the signal handlers were set up
       mock_signal.assert_has_calls(
         [
@@ -63,25 +76,32 @@ class TestSpeechTranscriber(unittest.TestCase):
 
   @patch('speech_transcriber.__main__.OPENAI_API_KEY', '')
   @patch('sys.exit')
-  @patch('time.sleep', side_effect=KeyboardInterrupt)
-  def test_start_no_api_key(self, mock_sleep, mock_exit):
+  def test_start_no_api_key(self, mock_exit):
     """Test starting the application without an API key."""
     # Start the application
-    self.app.start()
+    with patch.object(self.app._stop_event, 'wait', side_effect=KeyboardInterrupt):
+      self.app.start()
 
     # Verify that the application exited with the correct error code
     mock_exit.assert_any_call(1)
 
   def test_stop(self):
     """Test stopping the application."""
+    # Record whether stderr points at /dev/null while the transcriber cleans up
+    stderr_silenced = []
+    self.mock_transcriber.cleanup.side_effect = lambda: stderr_silenced.append(
+      os.path.samestat(os.fstat(2), os.stat(os.devnull))
+    )
+
     # Set up the application state
     self.app.running = True
 
     # Stop the application
     self.app.stop()
 
-    # Verify that the application state was updated
+    # Verify that the application state was updated and the main loop released
     self.assertFalse(self.app.running)
+    self.assertTrue(self.app._stop_event.is_set())
 
     # Verify that the keyboard listener was stopped
     self.mock_keyboard_listener.stop.assert_called_once()
@@ -89,6 +109,10 @@ class TestSpeechTranscriber(unittest.TestCase):
     # Verify that the audio recorder was cleaned up
     self.mock_audio_recorder.cleanup.assert_called_once()
 
+    # Verify that the transcriber was cleaned up with stderr silenced, then restored
+    self.assertEqual(stderr_silenced, [True])
+    self.assertFalse(os.path.samestat(os.fstat(2), os.stat(os.devnull)))
+
   @patch('sys.exit')
   def test_handle_signal(self, mock_exit):
     """Test handling termination signals."""
@@ -110,8 +134,12 @@ class TestSpeechTranscriber(unittest.TestCase):
   @patch('speech_transcriber.__main__.show_notification')
   def test_start_recording(self, mock_show_notification):
     """Test starting recording."""
+    warmed_up = threading.Event()
+    self.mock_transcriber.warmup.side_effect = warmed_up.set
+
     # Start recording
     self.app.start_recording()
+    self._drain_io_pool()
 
     # Verify that a notification was shown
     mock_show_notification.assert_called_once_with(
@@ -121,6 +149,28 @@ class TestSpeechTranscriber(unittest.TestCase):
     # Verify that recording was started
     self.mock_audio_recorder.start_recording.assert_called_once()
 
+    # Verify that the transcription service is warmed up in the background
+    self.assertTrue(warmed_up.wait(timeout=1))
+    self.app._recording_stopped.set()
+
+  def test_connection_kept_warm_while_recording(self):
+    """Test that the connection is warmed up again until the recording stops."""
+    recording_stopped = threading.Event()
+    warmups = []
+
+    def warmup():
+      warmups.append(1)
+      if len(warmups) == 3:
+        recording_stopped.set()
+
+    self.mock_transcriber.warmup.side_effect = warmup
+
+    with patch.object(SpeechTranscriber, 'WARMUP_INTERVAL', 0.01):
+      self.app._keep_connection_warm(recording_stopped)
+
+    # Verify that warmups repeat and stop once the recording has stopped
+    self.assertEqual(self.mock_transcriber.warmup.call_count, 3)
+
   @patch('speech_transcriber.__main__.show_notification')
   @patch('speech_transcriber.__main__.copy_to_clipboard')
   def test_stop_recording_and_transcribe_success(
@@ -137,6 +187,7 @@ class TestSpeechTranscriber(unittest.TestCase):
 
     # Stop recording and transcribe
     self.app.stop_recording_and_transcribe()
+    self._drain_io_pool()
 
     # Verify that recording was stopped
     self.mock_audio_recorder.stop_recording.assert_called_once()
@@ -150,11 +201,14 @@ class TestSpeechTranscriber(unittest.TestCase):
     )
 
     # Verify that the audio was transcribed
-    self.mock_transcriber.transcribe.assert_called_once_with('/tmp/test_audio.wav')
+    self.mock_transcriber.transcribe.assert_called_once_with('/tmp/test_audio.wav', 5.0)
 
     # Verify that the transcribed text was copied to the clipboard
     mock_copy.assert_called_once_with('This is a test transcription')
 
+    # Verify that the recording was released once transcribed
+    self.mock_audio_recorder.release_file.assert_called_once_with('/tmp/test_audio.wav')
+
   @patch('speech_transcriber.__main__.show_notification')
   def test_stop_recording_and_transcribe_short_recording(self, mock_show_notification):
     """Test stopping recording with a recording that's too short."""
@@ -166,6 +220,7 @@ class TestSpeechTranscriber(unittest.TestCase):
 
     # Stop recording and transcribe
     self.app.stop_recording_and_transcribe()
+    self._drain_io_pool()
 
     # Verify that recording was stopped
     self.mock_audio_recorder.stop_recording.assert_called_once()
@@ -195,6 +250,7 @@ class TestSpeechTranscriber(unittest.TestCase):
 
     # Stop recording and transcribe
     self.app.stop_recording_and_transcribe()
+    self._drain_io_pool()
 
     # Verify that recording was stopped
     self.mock_audio_recorder.stop_recording.assert_called_once()
@@ -208,7 +264,26 @@ class TestSpeechTranscriber(unittest.TestCase):
     )
 
     # Verify that the audio was transcribed
-    self.mock_transcriber.transcribe.assert_called_once_with('/tmp/test_audio.wav')
+    self.mock_transcriber.transcribe.assert_called_once_with('/tmp/test_audio.wav', 5.0)
+
+  @patch('speech_transcriber.__main__.show_notification')
+  def test_stop_recording_and_transcribe_no_speech(self, mock_show_notification):
+    """Test stopping recording when the recording had no speech in it."""
+    self.mock_audio_recorder.stop_recording.return_value = (
+      '/tmp/test_audio.wav',
+      5.0,
+    )
+    self.mock_transcriber.transcribe.return_value = ''
+
+    self.app.stop_recording_and_transcribe()
+    self._drain_io_pool()
+
+    mock_show_notification.assert_has_calls(
+      [
+        call('Speech Transcriber', 'Transcribing...'),
+        call('Speech Transcriber', 'No speech detected.'),
+      ]
+    )
 
   @patch('speech_transcriber.__main__.show_notification')
   @patch('speech_transcriber.__main__.copy_to_clipboard')
@@ -226,6 +301,7 @@ class TestSpeechTranscriber(unittest.TestCase):
 
     # Stop recording and transcribe
     self.app.stop_recording_and_transcribe()
+    self._drain_io_pool()
 
     # Verify that recording was stopped
     self.mock_audio_recorder.stop_recording.assert_called_once()
@@ -239,12 +315,13 @@ class TestSpeechTranscriber(unittest.TestCase):
     )
 
     # Verify that the audio was transcribed
-    self.mock_transcriber.transcribe.assert_called_once_with('/tmp/test_audio.wav')
+    self.mock_transcriber.transcribe.assert_called_once_with('/tmp/test_audio.wav', 5.0)
 
     # Verify that the transcribed text was copied to the clipboard
     mock_copy.assert_called_once_with('This is a test transcription')
 
   @patch('speech_transcriber.__main__.SpeechTranscriber')
+  @patch('sys.argv', ['speech_transcriber'])
   def test_main(self, mock_speech_transcriber):
     """Test the main entry point."""
     # Create a mock application instance
@@ -1,8 +1,10 @@
 """Tests for the notification module."""
 
 import unittest
+from unittest.mock import ANY
 from unittest.mock import patch
 
+from speech_transcriber import notification
 from speech_transcriber.notification import _show_macos_notification, show_notification
 
 
@@ -44,6 +46,7 @@ class TestNotification(unittest.TestCase):
             mock_print.assert_any_call("Error showing notification: Test error")
             mock_print.assert_any_call("Test Title: Test Message")
 
+    @patch("speech_transcriber.notification.HAVE_USER_NOTIFICATIONS", False)
     @patch("subprocess.run")
     def test_show_macos_notification(self, mock_run):
         """Test the macOS notification function."""
@@ -56,6 +59,75 @@ class TestNotification(unittest.TestCase):
         self.assertIn("Test Title", args)
         self.assertIn("Test Message", args)
 
+    @patch("speech_transcriber.notification.HAVE_USER_NOTIFICATIONS", True)
+    @patch("speech_transcriber.notification._notification_center", None)
+    @patch("speech_transcriber.notification.UNNotificationRequest", create=True)
+    @patch("speech_transcriber.notification.UNMutableNotificationContent", create=True)
+    @patch("speech_transcriber.notification.UNUserNotificationCenter", create=True)
+    @patch("subprocess.run")
+    def test_show_macos_notification_native(
+        self, mock_run, mock_center_class, mock_content_class, mock_request_class
+    ):
+        """Test that notifications are posted natively when PyObjC is available."""
+        _show_macos_notification("Test Title", "Test Message")
+
+        # Verify that the notification was posted without spawning osascript
+        content = mock_content_class.alloc.return_value.init.return_value
+        content.setTitle_.assert_called_once_with("Test Title")
+        content.setBody_.assert_called_once_with("Test Message")
+        center = mock_center_class.currentNotificationCenter.return_value
+        center.addNotificationRequest_withCompletionHandler_.assert_called_once_with(
+            mock_request_class.requestWithIdentifier_content_trigger_.return_value, ANY
+        )
+        mock_run.assert_not_called()
+
+    @patch("speech_transcriber.notification.HAVE_USER_NOTIFICATIONS", True)
+    @patch("speech_transcriber.notification._notification_center", None)
+    @patch("speech_transcriber.notification.UNNotificationRequest", create=True)
+    @patch("speech_transcriber.notification.UNMutableNotificationContent", create=True)
+    @patch("speech_transcriber.notification.UNUserNotificationCenter", create=True)
+    @patch("subprocess.run")
+    def test_show_macos_notification_native_denied(
+        self, mock_run, mock_center_class, mock_content_class, mock_request_class
+    ):
+        """Test falling back to osascript when the user denies permission."""
+        center = mock_center_class.currentNotificationCenter.return_value
+        # The completion handlers report the denial after the calls return
+        center.requestAuthorizationWithOptions_completionHandler_.side_effect = (
+            lambda options, handler: handler(False, None)
+        )
+        center.addNotificationRequest_withCompletionHandler_.side_effect = (
+            lambda request, handler: handler(Exception("Not allowed"))
+        )
+
+        _show_macos_notification("Test Title", "Test Message")
+
+        # Verify that the notification was shown with osascript instead
+        mock_run.assert_called_once()
+        self.assertIn("osascript", mock_run.call_args[0][0])
+        self.assertIn("Test Title", mock_run.call_args[0][0])
+        self.assertFalse(notification.HAVE_USER_NOTIFICATIONS)
+
+        # Verify that later notifications go straight to osascript
+        _show_macos_notification("Second Title", "Second Message")
+
+        self.assertEqual(mock_run.call_count, 2)
+        center.addNotificationRequest_withCompletionHandler_.assert_called_once()
+
+    @patch("speech_transcriber.notification.HAVE_USER_NOTIFICATIONS", True)
+    @patch("speech_transcriber.notification._notification_center", None)
+    @patch("speech_transcriber.notification.UNUserNotificationCenter", create=True)
+    @patch("subprocess.run")
+    def test_show_macos_notification_native_fallback(self, mock_run, mock_center_class):
+        """Test falling back to osascript when the notification center fails."""
+        mock_center_class.currentNotificationCenter.side_effect = Exception("No bundle")
+
+        _show_macos_notification("Test Title", "Test Message")
+
+        # Verify that osascript was used
+        mock_run.assert_called_once()
+        self.assertIn("osascript", mock_run.call_args[0][0])
+
 
 if __name__ == "__main__":
     unittest.main()
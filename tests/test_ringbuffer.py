@@ -0,0 +1,83 @@
+"""Tests for the ring buffer module."""
+
+import threading
+import unittest
+
+from speech_transcriber.ringbuffer import SPSCRing
+
+
+class TestSPSCRing(unittest.TestCase):
+  """Test cases for the SPSCRing class."""
+
+  def setUp(self):
+    """Set up test fixtures."""
+    self.ring = SPSCRing(16)
+
+  def test_capacity_must_be_power_of_two(self):
+    """Test that a capacity that is not a power of two is rejected."""
+    with self.assertRaises(ValueError):
+      SPSCRing(12)
+
+  def test_write_and_consume(self):
+    """Test that written bytes are read back in order."""
+    self.assertEqual(self.ring.write(b'hello'), 5)
+    self.assertEqual(len(self.ring), 5)
+    self.assertEqual(b''.join(self.ring.peek()), b'hello')
+
+    self.ring.consume(5)
+
+    self.assertEqual(len(self.ring), 0)
+    self.assertEqual(self.ring.peek(), [])
+
+  def test_write_when_full(self):
+    """Test that writes are truncated to the free space."""
+    self.assertEqual(self.ring.write(b'x' * 20), 16)
+    self.assertEqual(self.ring.write(b'y'), 0)
+    self.assertEqual(len(self.ring), 16)
+
+  def test_wraparound(self):
+    """Test that data spanning the end of the buffer is returned in two views."""
+    self.ring.write(b'a' * 12)
+    self.ring.consume(12)
+
+    self.ring.write(b'0123456789')
+    segments = self.ring.peek()
+
+    self.assertEqual(len(segments), 2)
+    self.assertEqual(bytes(segments[0]), b'0123')
+    self.assertEqual(bytes(segments[1]), b'456789')
+
+  def test_reset(self):
+    """Test that reset empties and reopens the ring."""
+    self.ring.write(b'data')
+    self.ring.close()
+
+    self.ring.reset()
+
+    self.assertEqual(len(self.ring), 0)
+    self.assertFalse(self.ring.closed)
+
+  def test_wait(self):
+    """Test that wait returns once data arrives or the ring is closed."""
+    self.assertFalse(self.ring.wait(timeout=0.01))
+
+    threading.Timer(0.01, self.ring.write, args=(b'data',)).start()
+    self.assertTrue(self.ring.wait(timeout=1))
+
+    self.ring.consume(len(self.ring))
+    self.ring.close()
+    self.assertTrue(self.ring.wait(timeout=0))
+
+  def test_wait_min_bytes(self):
+    """Test that wait reports whether enough data has arrived for a batch."""
+    self.ring.write(b'data')
+
+    self.assertFalse(self.ring.wait(8, timeout=0.01))
+    self.assertTrue(self.ring.wait(4, timeout=0))
+
+    self.ring.close()
+    self.assertTrue(self.ring.wait(8, timeout=0))
+
+
+if __name__ == '__main__':
+  unittest.main()
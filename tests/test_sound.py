@@ -3,12 +3,17 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+from speech_transcriber import sound
 from speech_transcriber.sound import play_sound, play_start_sound, play_stop_sound
 
 
 class TestSound(unittest.TestCase):
     """Test cases for the sound module."""
 
+    def setUp(self):
+        """Set up test fixtures."""
+        sound._sound_cache.clear()
+
     @patch("os.path.exists")
     @patch("speech_transcriber.sound.HAVE_PYOBJC", True)
     @patch("speech_transcriber.sound.NSSound")
@@ -31,6 +36,25 @@ class TestSound(unittest.TestCase):
         mock_sound.play.assert_called_once()
         self.assertTrue(result)
 
+    @patch("os.path.exists")
+    @patch("speech_transcriber.sound.HAVE_PYOBJC", True)
+    @patch("speech_transcriber.sound.NSSound", create=True)
+    def test_play_sound_reuses_nssound(self, mock_nssound, mock_exists):
+        """Test that a sound is only loaded once and restarted on later plays."""
+        mock_exists.return_value = True
+        mock_sound = MagicMock()
+        mock_nssound.alloc.return_value.initWithContentsOfFile_byReference_.return_value = mock_sound
+
+        test_sound_path = "/System/Library/Sounds/Hero.aiff"
+        self.assertTrue(play_sound(test_sound_path))
+        self.assertTrue(play_sound(test_sound_path))
+
+        # Verify the file was loaded once and the cached sound played twice
+        mock_nssound.alloc.assert_called_once()
+        mock_exists.assert_called_once_with(test_sound_path)
+        mock_sound.stop.assert_called_once()
+        self.assertEqual(mock_sound.play.call_count, 2)
+
     @patch("os.path.exists")
     @patch("speech_transcriber.sound.HAVE_PYOBJC", False)
     @patch("subprocess.run")
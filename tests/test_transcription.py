@@ -1,9 +1,16 @@
 """Tests for the transcription module."""
 
+import asyncio
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import httpx
+
+from speech_transcriber.transcription import GeminiTranscriber
+from speech_transcriber.transcription import OpenAITranscriber
 from speech_transcriber.transcription import Transcriber
 from speech_transcriber.transcription_config import TranscriptionConfig
 from speech_transcriber.utils import Logger
@@ -25,6 +32,9 @@ class TestTranscription(unittest.TestCase):
     self.config.openai_model = 'gpt-4o-transcribe'
     self.config.gemini_model = 'gemini-pro-vision'
     self.config.language = 'en'
+    self.config.compress_uploads = False
+    self.config.skip_silence = False
+    self.config.cache_transcripts = False
 
     # Create a mock transcriber
     self.mock_transcriber = MagicMock()
@@ -54,7 +64,7 @@ class TestTranscription(unittest.TestCase):
 
       # Verify the result
       self.assertEqual(result, 'Test transcription')
-      self.mock_transcriber.transcribe.assert_called_once_with('test.wav')
+      self.mock_transcriber.transcribe.assert_called_once_with('test.wav', 1024 * 1024)
 
   @patch('os.path.exists')
   def test_transcribe_file_not_found(self, mock_exists):
@@ -91,7 +101,544 @@ class TestTranscription(unittest.TestCase):
 
       # Verify the result
       self.assertIsNone(result)
-      self.mock_transcriber.transcribe.assert_called_once_with('test.wav')
+      self.mock_transcriber.transcribe.assert_called_once_with('test.wav', 1024 * 1024)
+
+  def test_transcribe_uses_cache(self):
+    """Test that the same audio is only sent to the service once."""
+    self.config.cache_transcripts = True
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+      temp_file.write(b'RIFF audio bytes')
+    self.addCleanup(os.unlink, temp_file.name)
+
+    first = self.transcription_service.transcribe(temp_file.name)
+    second = self.transcription_service.transcribe(temp_file.name)
+
+    self.assertEqual(first, 'Test transcription')
+    self.assertEqual(second, 'Test transcription')
+    self.mock_transcriber.transcribe.assert_called_once_with(temp_file.name, 16)
+
+  def test_transcribe_cache_disabled(self):
+    """Test that audio is not hashed when the cache is disabled."""
+    file_info = (16, 16 / 1024, 16 / 1024 / 1024)
+    with (
+      patch.object(TranscriptionConfig, 'get_file_info', return_value=file_info),
+      patch.object(self.transcription_service, '_get_cache_key') as mock_get_key,
+    ):
+      self.transcription_service.transcribe('test.wav')
+      self.transcription_service.transcribe('test.wav')
+
+    mock_get_key.assert_not_called()
+    self.assertEqual(self.mock_transcriber.transcribe.call_count, 2)
+
+  @patch('speech_transcriber.transcription.has_speech', return_value=False)
+  def test_transcribe_skips_silence(self, mock_has_speech):
+    """Test that recordings without speech are not sent to the service."""
+    self.config.skip_silence = True
+
+    with (
+      patch.object(
+        TranscriptionConfig,
+        'get_file_info',
+        return_value=(16, 16 / 1024, 16 / 1024 / 1024),
+      ),
+      patch.object(self.transcription_service, '_get_cache_key', return_value=None),
+    ):
+      result = self.transcription_service.transcribe('test.wav')
+
+    self.assertEqual(result, '')
+    mock_has_speech.assert_called_once_with('test.wav')
+    self.mock_transcriber.transcribe.assert_not_called()
+
+  def test_transcribe_many(self):
+    """Test that several files are transcribed and returned in input order."""
+    self.config.max_concurrent = 2
+    paths = ['first.wav', 'second.wav', 'third.wav']
+    results = {'first.wav': 'one', 'second.wav': None, 'third.wav': 'three'}
+
+    with patch.object(
+      self.transcription_service, 'transcribe', side_effect=results.get
+    ) as mock_transcribe:
+      result = self.transcription_service.transcribe_many(paths)
+
+    self.assertEqual(result, ['one', None, 'three'])
+    self.assertEqual(mock_transcribe.call_count, 3)
+    self.assertEqual(self.transcription_service.transcribe_many([]), [])
+
+  @patch('speech_transcriber.transcription.merge_transcripts')
+  @patch('speech_transcriber.transcription.split_wav')
+  def test_transcribe_in_chunks(self, mock_split_wav, mock_merge):
+    """Test that WAV files over the service limit are sent as chunks."""
+    self.config.max_concurrent = 2
+    mock_split_wav.return_value = ['chunk1.wav', 'chunk2.wav']
+    mock_merge.return_value = 'Merged transcription'
+
+    with (
+      patch.object(
+        self.transcription_service, '_exceeds_size_limit', return_value=True
+      ),
+      patch.object(
+        self.transcription_service, '_handle_file_size', return_value='long.wav'
+      ),
+      patch.object(self.transcription_service, '_cleanup_temp_file') as mock_cleanup,
+      patch.object(
+        TranscriptionConfig,
+        'get_file_info',
+        return_value=(1, 1 / 1024, 1 / 1024 / 1024),
+      ),
+      patch('os.path.getsize', return_value=30 * 1024 * 1024),
+    ):
+      result = self.transcription_service.transcribe('long.wav')
+
+    self.assertEqual(result, 'Merged transcription')
+    mock_split_wav.assert_called_once_with('long.wav', 18 * 1024 * 1024)
+    mock_merge.assert_called_once_with(['Test transcription', 'Test transcription'])
+    self.assertEqual(
+      sorted(c.args[0] for c in self.mock_transcriber.transcribe.call_args_list),
+      ['chunk1.wav', 'chunk2.wav'],
+    )
+    mock_cleanup.assert_any_call('chunk1.wav')
+    mock_cleanup.assert_any_call('chunk2.wav')
+
+  def test_transcribe_async(self):
+    """Test that async transcription runs on a reused worker thread."""
+    with patch.object(
+      self.transcription_service, 'transcribe', return_value='Test transcription'
+    ) as mock_transcribe:
+
+      async def transcribe_twice():
+        return [
+          await self.transcription_service.transcribe_async('test.wav', 5.0),
+          await self.transcription_service.transcribe_async('test.wav'),
+        ]
+
+      self.config.max_concurrent = 2
+      result = asyncio.run(transcribe_twice())
+
+    self.assertEqual(result, ['Test transcription', 'Test transcription'])
+    mock_transcribe.assert_any_call('test.wav', 5.0)
+    executor = self.transcription_service._executor
+    self.assertIsNotNone(executor)
+
+    self.transcription_service.cleanup()
+    self.assertIsNone(self.transcription_service._executor)
+    self.assertTrue(executor._shutdown)
+
+  def test_transcribe_stream(self):
+    """Test that streamed text is passed through from the service."""
+    self.mock_transcriber.transcribe_stream.return_value = iter(['Test ', 'text'])
+
+    with (
+      patch.object(
+        TranscriptionConfig,
+        'get_file_info',
+        return_value=(16, 16 / 1024, 16 / 1024 / 1024),
+      ),
+      patch('os.path.getsize', return_value=16),
+    ):
+      chunks = list(self.transcription_service.transcribe_stream('test.wav'))
+
+    self.assertEqual(chunks, ['Test ', 'text'])
+    self.mock_transcriber.transcribe_stream.assert_called_once_with('test.wav')
+
+  def test_transcribe_stream_uses_cache(self):
+    """Test that a streamed transcript is cached and yielded whole next time."""
+    self.config.cache_transcripts = True
+    self.mock_transcriber.transcribe_stream.return_value = iter(['Test ', 'text'])
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+      temp_file.write(b'RIFF audio bytes')
+    self.addCleanup(os.unlink, temp_file.name)
+
+    first = list(self.transcription_service.transcribe_stream(temp_file.name))
+    second = list(self.transcription_service.transcribe_stream(temp_file.name))
+
+    self.assertEqual(first, ['Test ', 'text'])
+    self.assertEqual(second, ['Test text'])
+    self.mock_transcriber.transcribe_stream.assert_called_once_with(temp_file.name)
+
+  @patch('speech_transcriber.transcription.has_speech', return_value=False)
+  def test_transcribe_stream_skips_silence(self, mock_has_speech):
+    """Test that recordings without speech are not streamed from the service."""
+    self.config.skip_silence = True
+
+    with patch.object(
+      TranscriptionConfig,
+      'get_file_info',
+      return_value=(16, 16 / 1024, 16 / 1024 / 1024),
+    ):
+      chunks = list(self.transcription_service.transcribe_stream('test.wav'))
+
+    self.assertEqual(chunks, [])
+    mock_has_speech.assert_called_once_with('test.wav')
+    self.mock_transcriber.transcribe_stream.assert_not_called()
+
+  def test_get_file_info(self):
+    """Test that file info is read with one stat and missing files give None."""
+    audio_path = self._make_audio_file(2048)
+
+    with patch('os.stat', wraps=os.stat) as mock_stat:
+      file_info = TranscriptionConfig.get_file_info(audio_path)
+
+    self.assertEqual(file_info, (2048, 2.0, 2 / 1024))
+    mock_stat.assert_called_once_with(audio_path)
+    self.assertIsNone(TranscriptionConfig.get_file_info(audio_path + '.missing'))
+
+  def test_get_mime_type(self):
+    """Test that MIME types are looked up by case-insensitive extension."""
+    self.assertEqual(TranscriptionConfig.get_mime_type('a/b.OGG'), 'audio/ogg')
+    self.assertEqual(TranscriptionConfig.get_mime_type('b.mp3'), 'audio/mp3')
+    self.assertEqual(TranscriptionConfig.get_mime_type('mp3'), 'audio/wav')
+    self.assertEqual(TranscriptionConfig.get_mime_type('b.unknown'), 'audio/wav')
+
+  def test_detect_mime_type(self):
+    """Test that audio formats are recognized from their leading bytes."""
+    detect = TranscriptionConfig.detect_mime_type
+    self.assertEqual(detect(b'RIFF\x24\x00\x00\x00WAVEfmt '), 'audio/wav')
+    self.assertEqual(detect(b'FORM\x00\x00\x00\x00AIFFCOMM'), 'audio/aiff')
+    self.assertEqual(detect(b'OggS\x00\x02'), 'audio/ogg')
+    self.assertEqual(detect(b'ID3\x04\x00'), 'audio/mp3')
+    self.assertEqual(detect(b'\xff\xfb\x90\x00'), 'audio/mp3')
+    self.assertIsNone(detect(b'RIFF\x24\x00\x00\x00AVI LIST'))
+    self.assertIsNone(detect(b''))
+
+  def test_warmup(self):
+    """Test that warmup is forwarded to the selected service."""
+    self.transcription_service.warmup()
+
+    self.mock_transcriber.warmup.assert_called_once()
+
+  def test_warmup_error(self):
+    """Test that warmup failures are swallowed."""
+    self.mock_transcriber.warmup.side_effect = Exception('Network down')
+
+    # Should not raise an exception
+    self.transcription_service.warmup()
+
+    self.mock_transcriber.warmup.assert_called_once()
+
+  @patch('openai.OpenAI')
+  def test_openai_shared_http_client(self, mock_openai):
+    """Test that an injected HTTP client is used but not closed by cleanup."""
+    http_client = MagicMock()
+
+    transcriber = OpenAITranscriber(self.config, http_client=http_client)
+
+    self.assertIs(mock_openai.call_args.kwargs['http_client'], http_client)
+    transcriber.cleanup()
+    http_client.close.assert_not_called()
+
+  @patch('openai.OpenAI')
+  @patch('speech_transcriber.transcription.httpx.Client')
+  def test_openai_default_http_client_shared(self, mock_client, mock_openai):
+    """Test that transcribers without a client share one pooled client."""
+    mock_client.return_value.is_closed = False
+    self.addCleanup(setattr, OpenAITranscriber, '_shared_http_client', None)
+    OpenAITranscriber._shared_http_client = None
+
+    first = OpenAITranscriber(self.config)
+    second = OpenAITranscriber(self.config)
+
+    mock_client.assert_called_once()
+    self.assertIs(first.http_client, mock_client.return_value)
+    self.assertIs(second.http_client, mock_client.return_value)
+    self.assertIs(mock_openai.call_args.kwargs['http_client'], mock_client.return_value)
+
+    # Cleaning up one transcriber leaves the pool open for the other
+    first.cleanup()
+    mock_client.return_value.close.assert_not_called()
+
+  @patch('openai.OpenAI')
+  def test_openai_transcribe_streams_file(self, mock_openai):
+    """Test that the open audio file is passed to the API rather than its bytes."""
+    with tempfile.NamedTemporaryFile(suffix='.ogg', delete=False) as temp_file:
+      temp_file.write(b'OggS audio bytes')
+    self.addCleanup(os.unlink, temp_file.name)
+    mock_create = mock_openai.return_value.audio.transcriptions.create
+    mock_create.return_value.text = 'Test transcription'
+
+    transcriber = OpenAITranscriber(self.config, http_client=MagicMock())
+    result = transcriber.transcribe(temp_file.name)
+
+    self.assertEqual(result, 'Test transcription')
+    name, audio_file, mime_type = mock_create.call_args.kwargs['file']
+    self.assertEqual(name, os.path.basename(temp_file.name))
+    self.assertEqual(audio_file.name, temp_file.name)
+    self.assertEqual(mime_type, 'audio/ogg')
+
+  @patch('speech_transcriber.utils.time.sleep')
+  @patch('openai.OpenAI')
+  def test_openai_transcribe_retries_transient_error(self, mock_openai, mock_sleep):
+    """Test that a dropped connection is retried with the file rewound."""
+    audio_path = self._make_audio_file(16)
+    positions = []
+
+    def create(**params):
+      audio_file = params['file'][1]
+      positions.append(audio_file.tell())
+      audio_file.read()
+      if len(positions) == 1:
+        raise httpx.ConnectError('Connection reset')
+      return MagicMock(text='Test transcription')
+
+    mock_openai.return_value.audio.transcriptions.create.side_effect = create
+
+    transcriber = OpenAITranscriber(self.config, http_client=MagicMock())
+    result = transcriber.transcribe(audio_path)
+
+    self.assertEqual(result, 'Test transcription')
+    self.assertEqual(positions, [0, 0])
+    mock_sleep.assert_called_once()
+    self.assertEqual(mock_openai.call_args.kwargs['max_retries'], 0)
+
+  @patch('speech_transcriber.utils.time.sleep')
+  @patch('openai.OpenAI')
+  def test_openai_transcribe_client_error_not_retried(self, mock_openai, mock_sleep):
+    """Test that errors such as a rejected API key fail without retrying."""
+    audio_path = self._make_audio_file(16)
+    error = Exception('Unauthorized')
+    error.status_code = 401
+    mock_create = mock_openai.return_value.audio.transcriptions.create
+    mock_create.side_effect = error
+
+    transcriber = OpenAITranscriber(self.config, http_client=MagicMock())
+    result = transcriber.transcribe(audio_path)
+
+    self.assertIsNone(result)
+    mock_create.assert_called_once()
+    mock_sleep.assert_not_called()
+
+  @patch('speech_transcriber.utils.time.sleep')
+  def test_gemini_transcribe_gives_up_after_retries(self, mock_sleep):
+    """Test that Gemini requests are retried a limited number of times."""
+    transcriber = self._make_gemini_transcriber()
+    audio_path = self._make_audio_file(16)
+    error = Exception('Service unavailable')
+    error.code = 503
+    model = transcriber.genai.GenerativeModel.return_value
+    model.generate_content.side_effect = error
+
+    result = transcriber.transcribe(audio_path)
+
+    self.assertIsNone(result)
+    self.assertEqual(model.generate_content.call_count, 4)
+    self.assertEqual(mock_sleep.call_count, 3)
+
+  @patch('openai.OpenAI')
+  def test_openai_transcribe_known_size(self, mock_openai):
+    """Test that a file size passed in by the caller is not looked up again."""
+    audio_path = self._make_audio_file(16)
+    mock_create = mock_openai.return_value.audio.transcriptions.create
+    mock_create.return_value.text = 'Test transcription'
+
+    transcriber = OpenAITranscriber(self.config, http_client=MagicMock())
+    with patch.object(TranscriptionConfig, 'get_file_info') as mock_get_file_info:
+      result = transcriber.transcribe(audio_path, 16)
+
+    self.assertEqual(result, 'Test transcription')
+    mock_get_file_info.assert_not_called()
+
+  @patch('openai.OpenAI')
+  def test_openai_transcribe_stream(self, mock_openai):
+    """Test that text deltas are yielded as the API streams them."""
+    audio_path = self._make_audio_file(16)
+    mock_create = mock_openai.return_value.audio.transcriptions.create
+    mock_create.return_value = iter(
+      [
+        MagicMock(type='transcript.text.delta', delta='Test '),
+        MagicMock(type='transcript.text.delta', delta='transcription'),
+        MagicMock(type='transcript.text.done', text='Test transcription'),
+      ]
+    )
+
+    transcriber = OpenAITranscriber(self.config, http_client=MagicMock())
+    chunks = list(transcriber.transcribe_stream(audio_path))
+
+    self.assertEqual(chunks, ['Test ', 'transcription'])
+    self.assertTrue(mock_create.call_args.kwargs['stream'])
+
+  @patch('openai.OpenAI')
+  def test_openai_transcribe_stream_unsupported_model(self, mock_openai):
+    """Test that models without streaming return the whole transcript at once."""
+    self.config.openai_model = 'whisper-1'
+    audio_path = self._make_audio_file(16)
+    mock_create = mock_openai.return_value.audio.transcriptions.create
+    mock_create.return_value.text = 'Test transcription'
+
+    transcriber = OpenAITranscriber(self.config, http_client=MagicMock())
+    chunks = list(transcriber.transcribe_stream(audio_path))
+
+    self.assertEqual(chunks, ['Test transcription'])
+    self.assertNotIn('stream', mock_create.call_args.kwargs)
+
+  def _make_gemini_transcriber(self) -> GeminiTranscriber:
+    """Create a GeminiTranscriber whose genai module is a mock."""
+    transcriber = GeminiTranscriber(self.config)
+    transcriber.genai = MagicMock()
+    model = transcriber.genai.GenerativeModel.return_value
+    model.generate_content.return_value.text = ' Test transcription '
+    return transcriber
+
+  def _make_audio_file(self, size: int) -> str:
+    """Create a temporary WAV file of the given size."""
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+      temp_file.write(b'\0' * size)
+    self.addCleanup(os.unlink, temp_file.name)
+    return temp_file.name
+
+  def test_gemini_uses_rest_transport(self):
+    """Test that the Gemini client is configured to use REST rather than gRPC."""
+    with patch('google.generativeai.configure') as mock_configure:
+      GeminiTranscriber(self.config)
+
+    mock_configure.assert_called_once_with(api_key='test_gemini_key', transport='rest')
+
+  def test_gemini_transcribe_inline(self):
+    """Test that small files are sent inline without a separate upload."""
+    transcriber = self._make_gemini_transcriber()
+    audio_path = self._make_audio_file(16)
+
+    result = transcriber.transcribe(audio_path)
+
+    self.assertEqual(result, 'Test transcription')
+    transcriber.genai.upload_file.assert_not_called()
+    model = transcriber.genai.GenerativeModel.return_value
+    audio_part = model.generate_content.call_args[0][0][0]['parts'][1]
+    self.assertEqual(audio_part['inline_data']['mime_type'], 'audio/wav')
+    self.assertEqual(audio_part['inline_data']['data'], b'\0' * 16)
+
+  def test_gemini_inline_mime_type_from_content(self):
+    """Test that inline audio is labelled by its content, not its extension."""
+    transcriber = self._make_gemini_transcriber()
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+      temp_file.write(b'OggS audio bytes')
+    self.addCleanup(os.unlink, temp_file.name)
+
+    transcriber.transcribe(temp_file.name)
+
+    model = transcriber.genai.GenerativeModel.return_value
+    audio_part = model.generate_content.call_args[0][0][0]['parts'][1]
+    self.assertEqual(audio_part['inline_data']['mime_type'], 'audio/ogg')
+
+  def test_gemini_transcribe_uploads_large_files(self):
+    """Test that large files go through the Files API and are deleted afterwards."""
+    transcriber = self._make_gemini_transcriber()
+    transcriber.INLINE_LIMIT_BYTES = 8
+    audio_path = self._make_audio_file(16)
+    uploaded_file = transcriber.genai.upload_file.return_value
+
+    result = transcriber.transcribe(audio_path)
+
+    self.assertEqual(result, 'Test transcription')
+    transcriber.genai.upload_file.assert_called_once_with(
+      path=audio_path, mime_type='audio/wav'
+    )
+    model = transcriber.genai.GenerativeModel.return_value
+    self.assertIs(model.generate_content.call_args[0][0][0]['parts'][1], uploaded_file)
+    transcriber.genai.delete_file.assert_called_once_with(uploaded_file.name)
+
+  def test_gemini_model_reused(self):
+    """Test that warmup builds the model once and transcriptions reuse it."""
+    transcriber = self._make_gemini_transcriber()
+    audio_path = self._make_audio_file(16)
+
+    transcriber.warmup()
+    transcriber.transcribe(audio_path)
+    transcriber.transcribe(audio_path)
+
+    transcriber.genai.GenerativeModel.assert_called_once_with(transcriber.model)
+    transcriber.genai.get_model.assert_called_once_with(f'models/{transcriber.model}')
+
+    transcriber.cleanup()
+    self.assertIsNone(transcriber._generative_model)
+
+  def test_gemini_transcribe_batch(self):
+    """Test that several small files are transcribed in one request."""
+    transcriber = self._make_gemini_transcriber()
+    paths = [self._make_audio_file(16), self._make_audio_file(8)]
+    model = transcriber.genai.GenerativeModel.return_value
+    model.generate_content.return_value.text = '[" first ", "second"]'
+
+    result = transcriber.transcribe_batch(paths)
+
+    self.assertEqual(result, ['first', 'second'])
+    model.generate_content.assert_called_once()
+    parts = model.generate_content.call_args[0][0][0]['parts']
+    self.assertEqual([part.get('text') for part in parts[1::2]], ['FILE 1:', 'FILE 2:'])
+    self.assertEqual(parts[2]['inline_data']['data'], b'\0' * 16)
+    generation_config = model.generate_content.call_args.kwargs['generation_config']
+    self.assertEqual(generation_config['response_mime_type'], 'application/json')
+
+  def test_gemini_transcribe_batch_mismatch_falls_back(self):
+    """Test that a response not matching the files falls back to single requests."""
+    transcriber = self._make_gemini_transcriber()
+    self.config.max_concurrent = 1
+    paths = [self._make_audio_file(16), self._make_audio_file(8)]
+    model = transcriber.genai.GenerativeModel.return_value
+    model.generate_content.return_value.text = '["only one"]'
+
+    result = transcriber.transcribe_batch(paths)
+
+    self.assertEqual(result, ['["only one"]', '["only one"]'])
+    self.assertEqual(model.generate_content.call_count, 3)
+
+  def test_transcribe_batch(self):
+    """Test that batches are passed to the selected service."""
+    self.mock_transcriber.transcribe_batch.return_value = ['one', 'two']
+
+    result = self.transcription_service.transcribe_batch(['a.wav', 'b.wav'])
+
+    self.assertEqual(result, ['one', 'two'])
+    self.mock_transcriber.transcribe_batch.assert_called_once_with(['a.wav', 'b.wav'])
+
+  @patch('speech_transcriber.transcription.AudioCompressor')
+  def test_handle_file_size_compress_uploads(self, mock_compressor_class):
+    """Test that WAV files within the limit are compressed when enabled."""
+    self.config.compress_uploads = True
+    mock_compress_audio = mock_compressor_class.return_value.compress_audio
+    mock_compress_audio.return_value = None  # Fall back to the original file
+
+    file_info = (5 * 1024 * 1024, 5 * 1024, 5.0)
+    result = self.transcription_service._handle_file_size('test.wav', file_info, 60.0)
+
+    self.assertEqual(result, 'test.wav')
+    mock_compress_audio.assert_called_once_with(
+      'test.wav',
+      max_size_mb=24,
+      duration=60.0,
+      skip_below_mb=Transcriber.COMPRESS_UPLOADS_ABOVE_MB,
+    )
+
+    # Already compressed files are uploaded as they are
+    mock_compress_audio.reset_mock()
+    result = self.transcription_service._handle_file_size('test.ogg', file_info)
+    self.assertEqual(result, 'test.ogg')
+    mock_compress_audio.assert_not_called()
+
+  @patch('speech_transcriber.transcription.AudioCompressor')
+  def test_handle_file_size_compress_uploads_without_ffmpeg(
+    self, mock_compressor_class
+  ):
+    """Test that optional compression is skipped quietly when ffmpeg is missing."""
+    self.config.compress_uploads = True
+    mock_compressor_class.return_value.ffmpeg_available = False
+
+    file_info = (5 * 1024 * 1024, 5 * 1024, 5.0)
+    with patch('speech_transcriber.transcription.Logger') as mock_logger:
+      result = self.transcription_service._handle_file_size('test.wav', file_info)
+
+    self.assertEqual(result, 'test.wav')
+    mock_compressor_class.return_value.compress_audio.assert_not_called()
+    mock_logger.error.assert_not_called()
+
+  @patch('speech_transcriber.transcription.AudioCompressor')
+  def test_compressor_reused(self, mock_compressor_class):
+    """Test that one compressor is created and reused for every file."""
+    mock_compressor_class.return_value.compress_audio.return_value = None
+
+    self.transcription_service._compress_audio_file('first.wav', 30)
+    self.transcription_service._compress_audio_file('second.wav', 30)
+
+    mock_compressor_class.assert_called_once_with()
+    self.assertEqual(mock_compressor_class.return_value.compress_audio.call_count, 2)
 
   @patch('os.path.exists')
   @patch('os.path.getsize')
@@ -119,17 +666,14 @@ class TestTranscription(unittest.TestCase):
     # Test with a file under the limit
     self.assertFalse(self.transcription_service._exceeds_size_limit(23))
 
-  @patch('os.path.exists')
-  @patch('os.path.getsize')
-  @patch('speech_transcriber.audio_compression.AudioCompressor')
-  def test_compress_audio_file_success(
-    self, mock_compressor_class, mock_getsize, mock_exists
-  ):
+  @patch.object(
+    TranscriptionConfig,
+    'get_file_info',
+    return_value=(15 * 1024 * 1024, 15 * 1024, 15.0),  # Compressed to 15MB
+  )
+  @patch('speech_transcriber.transcription.AudioCompressor')
+  def test_compress_audio_file_success(self, mock_compressor_class, mock_get_file_info):
     """Test successful audio compression."""
-    # Set up mocks
-    mock_exists.return_value = True
-    mock_getsize.side_effect = [25 * 1024 * 1024, 15 * 1024 * 1024]  # 25MB -> 15MB
-
     # Mock the compressor instance
     mock_compressor = MagicMock()
     mock_compressor.compress_audio.return_value = '/tmp/compressed.mp3'
@@ -142,19 +686,14 @@ class TestTranscription(unittest.TestCase):
 
       # Verify the result
       self.assertEqual(result, '/tmp/compressed.mp3')
-      mock_compressor.compress_audio.assert_called_once_with('test.wav', max_size_mb=24)
+      mock_compressor.compress_audio.assert_called_once_with(
+        'test.wav', max_size_mb=24, duration=None, skip_below_mb=None
+      )
+      mock_get_file_info.assert_called_once_with('/tmp/compressed.mp3')
 
-  @patch('os.path.exists')
-  @patch('os.path.getsize')
-  @patch('speech_transcriber.audio_compression.AudioCompressor')
-  def test_compress_audio_file_failure(
-    self, mock_compressor_class, mock_getsize, mock_exists
-  ):
+  @patch('speech_transcriber.transcription.AudioCompressor')
+  def test_compress_audio_file_failure(self, mock_compressor_class):
     """Test failed audio compression."""
-    # Set up mocks
-    mock_exists.return_value = True
-    mock_getsize.return_value = 25 * 1024 * 1024  # 25MB
-
     # Mock the compressor instance
     mock_compressor = MagicMock()
     mock_compressor.compress_audio.return_value = None  # Compression failed
@@ -167,19 +706,20 @@ class TestTranscription(unittest.TestCase):
 
       # Verify the result - should return original file on failure
       self.assertEqual(result, 'test.wav')
-      mock_compressor.compress_audio.assert_called_once_with('test.wav', max_size_mb=24)
-
-  @patch('os.path.exists')
-  @patch('os.path.getsize')
-  @patch('speech_transcriber.audio_compression.AudioCompressor')
+      mock_compressor.compress_audio.assert_called_once_with(
+        'test.wav', max_size_mb=24, duration=None, skip_below_mb=None
+      )
+
+  @patch.object(
+    TranscriptionConfig,
+    'get_file_info',
+    return_value=(15 * 1024 * 1024, 15 * 1024, 15.0),  # Compressed to 15MB
+  )
+  @patch('speech_transcriber.transcription.AudioCompressor')
   def test_handle_file_size_compression_needed(
-    self, mock_compressor_class, mock_getsize, mock_exists
+    self, mock_compressor_class, mock_get_file_info
   ):
     """Test file size handling when compression is needed."""
-    # Set up mocks
-    mock_exists.return_value = True
-    mock_getsize.side_effect = [25 * 1024 * 1024, 15 * 1024 * 1024]  # 25MB -> 15MB
-
     # Mock the compressor
     mock_compressor = MagicMock()
     mock_compressor.compress_audio.return_value = '/tmp/compressed.mp3'
@@ -188,28 +728,22 @@ class TestTranscription(unittest.TestCase):
     # Override calls to the actual ffmpeg command
     with patch('subprocess.run'):
       # Mock the file info
-      file_info = (25 * 1024 * 1024, 'audio/wav', '.wav')
+      file_info = (25 * 1024 * 1024, 25 * 1024, 25.0)
 
       # Call the method
-      result = self.transcription_service._handle_file_size('test.wav', file_info)
+      result = self.transcription_service._handle_file_size('test.wav', file_info, 60.0)
 
       # Verify the result - should return compressed file
       self.assertEqual(result, '/tmp/compressed.mp3')
-      mock_compressor.compress_audio.assert_called_once()
+      mock_compressor.compress_audio.assert_called_once_with(
+        'test.wav', max_size_mb=24, duration=60.0, skip_below_mb=None
+      )
 
-  @patch('os.path.exists')
-  @patch('os.path.getsize')
-  @patch('speech_transcriber.audio_compression.AudioCompressor')
-  def test_handle_file_size_no_compression_needed(
-    self, mock_compressor_class, mock_getsize, mock_exists
-  ):
+  @patch('speech_transcriber.transcription.AudioCompressor')
+  def test_handle_file_size_no_compression_needed(self, mock_compressor_class):
     """Test file size handling when no compression is needed."""
-    # Set up mocks
-    mock_exists.return_value = True
-    mock_getsize.return_value = 10 * 1024 * 1024  # 10MB
-
     # Mock the file info
-    file_info = (10 * 1024 * 1024, 'audio/wav', '.wav')
+    file_info = (10 * 1024 * 1024, 10 * 1024, 10.0)
 
     # Call the method
     result = self.transcription_service._handle_file_size('test.wav', file_info)
@@ -0,0 +1,75 @@
+"""Tests for the transcription cache module."""
+
+import os
+import tempfile
+import unittest
+
+from speech_transcriber.transcription_cache import TranscriptionCache
+
+
+class TestTranscriptionCache(unittest.TestCase):
+  """Test cases for the TranscriptionCache class."""
+
+  def setUp(self):
+    """Set up test fixtures."""
+    self.cache = TranscriptionCache(max_entries=2)
+
+  def _make_audio_file(self, data: bytes) -> str:
+    """Create a temporary audio file containing data."""
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+      temp_file.write(data)
+    self.addCleanup(os.unlink, temp_file.name)
+    return temp_file.name
+
+  def test_make_key(self):
+    """Test that keys depend on the audio content and settings, not the path."""
+    first = self._make_audio_file(b'audio')
+    same_audio = self._make_audio_file(b'audio')
+    other_audio = self._make_audio_file(b'other audio')
+
+    key = TranscriptionCache.make_key(first, 'openai', 'gpt-4o-transcribe', 'en')
+
+    self.assertEqual(
+      key, TranscriptionCache.make_key(same_audio, 'openai', 'gpt-4o-transcribe', 'en')
+    )
+    self.assertNotEqual(
+      key, TranscriptionCache.make_key(other_audio, 'openai', 'gpt-4o-transcribe', 'en')
+    )
+    self.assertNotEqual(
+      key, TranscriptionCache.make_key(first, 'openai', 'gpt-4o-transcribe', 'de')
+    )
+
+  def test_make_key_empty_file(self):
+    """Test that an empty file can be hashed."""
+    empty = self._make_audio_file(b'')
+
+    self.assertTrue(TranscriptionCache.make_key(empty, 'openai'))
+
+  def test_make_key_missing_file(self):
+    """Test that a missing file raises OSError."""
+    with self.assertRaises(OSError):
+      TranscriptionCache.make_key('/non/existent/file.wav', 'openai')
+
+  def test_get_and_put(self):
+    """Test that stored transcripts are returned."""
+    self.assertIsNone(self.cache.get('key'))
+
+    self.cache.put('key', 'Hello world')
+
+    self.assertEqual(self.cache.get('key'), 'Hello world')
+
+  def test_eviction(self):
+    """Test that the least recently used transcript is evicted first."""
+    self.cache.put('first', 'one')
+    self.cache.put('second', 'two')
+    self.cache.get('first')  # Make 'second' the least recently used
+
+    self.cache.put('third', 'three')
+
+    self.assertEqual(self.cache.get('first'), 'one')
+    self.assertIsNone(self.cache.get('second'))
+    self.assertEqual(self.cache.get('third'), 'three')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,130 @@
+"""Tests for the voice activity detection module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+import wave
+
+from speech_transcriber.vad import MIN_SPEECH_MS
+from speech_transcriber.vad import SilenceTrimmer
+from speech_transcriber.vad import has_speech
+
+SAMPLE_RATE = 16000
+FRAME_BYTES = SAMPLE_RATE * SilenceTrimmer.FRAME_MS // 1000 * 2
+LEAD_IN_FRAMES = SilenceTrimmer.LEAD_IN_MS // SilenceTrimmer.FRAME_MS
+HANGOVER_FRAMES = SilenceTrimmer.HANGOVER_MS // SilenceTrimmer.FRAME_MS
+
+SPEECH = b'\x01' * FRAME_BYTES
+SILENCE = b'\x00' * FRAME_BYTES
+
+
+class TestSilenceTrimmer(unittest.TestCase):
+  """Test cases for the SilenceTrimmer class."""
+
+  def setUp(self):
+    """Set up test fixtures."""
+    # Classify frames of 0x01 bytes as speech and everything else as silence
+    self.mock_vad = MagicMock()
+    self.mock_vad.is_speech.side_effect = lambda frame, rate: frame[0] == 1
+
+    with patch('speech_transcriber.vad.webrtcvad', create=True) as mock_webrtcvad:
+      mock_webrtcvad.Vad.return_value = self.mock_vad
+      self.trimmer = SilenceTrimmer(SAMPLE_RATE)
+      mock_webrtcvad.Vad.assert_called_once_with(2)
+
+  def test_leading_silence_dropped(self):
+    """Test that silence before any speech is not kept."""
+    result = self.trimmer.process(SILENCE * 50)
+
+    self.assertEqual(result, b'')
+    self.assertEqual(self.trimmer.voiced_bytes, 0)
+
+  def test_speech_kept_with_lead_in(self):
+    """Test that speech is kept along with the silence just before it."""
+    self.trimmer.process(SILENCE * 50)
+
+    result = self.trimmer.process(SPEECH * 2)
+
+    self.assertEqual(result, SILENCE * LEAD_IN_FRAMES + SPEECH * 2)
+    self.assertEqual(self.trimmer.voiced_bytes, 2 * FRAME_BYTES)
+
+  def test_trailing_silence_limited_to_hangover(self):
+    """Test that only the hangover is kept after speech stops."""
+    self.trimmer.process(SPEECH)
+
+    result = self.trimmer.process(SILENCE * 50)
+
+    self.assertEqual(result, SILENCE * HANGOVER_FRAMES)
+
+  def test_partial_frames_carried_over(self):
+    """Test that chunks not aligned to frame boundaries are reassembled."""
+    half = FRAME_BYTES // 2
+
+    self.assertEqual(self.trimmer.process(SPEECH[:half]), b'')
+    self.assertEqual(self.trimmer.process(SPEECH[half:]), SPEECH)
+    self.mock_vad.is_speech.assert_called_once_with(SPEECH, SAMPLE_RATE)
+
+
+class TestHasSpeech(unittest.TestCase):
+  """Test cases for the has_speech function."""
+
+  def setUp(self):
+    """Set up test fixtures."""
+    self.mock_vad = MagicMock()
+    self.mock_vad.is_speech.side_effect = lambda frame, rate: frame[0] == 1
+
+    patcher = patch('speech_transcriber.vad.webrtcvad', create=True)
+    self.mock_webrtcvad = patcher.start()
+    self.addCleanup(patcher.stop)
+    self.mock_webrtcvad.Vad.return_value = self.mock_vad
+
+    patcher = patch('speech_transcriber.vad.HAVE_WEBRTCVAD', True)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def _make_wav(self, frames: bytes, channels: int = 1) -> str:
+    """Write frames to a temporary 16 kHz 16-bit WAV file."""
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+      path = temp_file.name
+    self.addCleanup(os.unlink, path)
+    with wave.open(path, 'wb') as wav:
+      wav.setnchannels(channels)
+      wav.setsampwidth(2)
+      wav.setframerate(SAMPLE_RATE)
+      wav.writeframes(frames)
+    return path
+
+  def test_speech_found_early(self):
+    """Test that reading stops once enough speech has been found."""
+    speech_frames = MIN_SPEECH_MS // SilenceTrimmer.FRAME_MS
+    path = self._make_wav(SILENCE * 5 + SPEECH * speech_frames + SILENCE * 50)
+
+    self.assertTrue(has_speech(path))
+    self.assertEqual(self.mock_vad.is_speech.call_count, 5 + speech_frames)
+
+  def test_silence(self):
+    """Test that a recording of silence and brief noise has no speech."""
+    path = self._make_wav(SILENCE * 50 + SPEECH + SILENCE * 50)
+
+    self.assertFalse(has_speech(path))
+
+  def test_unsupported_format_counts_as_speech(self):
+    """Test that audio webrtcvad cannot check is assumed to contain speech."""
+    path = self._make_wav(SILENCE * 50, channels=2)
+
+    self.assertTrue(has_speech(path))
+    self.mock_vad.is_speech.assert_not_called()
+
+  def test_unreadable_file_counts_as_speech(self):
+    """Test that files that are not WAV are assumed to contain speech."""
+    with tempfile.NamedTemporaryFile(suffix='.ogg', delete=False) as temp_file:
+      temp_file.write(b'OggS audio bytes')
+    self.addCleanup(os.unlink, temp_file.name)
+
+    self.assertTrue(has_speech(temp_file.name))
+
+
+if __name__ == '__main__':
+  unittest.main()